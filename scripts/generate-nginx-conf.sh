@@ -18,12 +18,14 @@ DOMAIN="${1:-$DEFAULT_DOMAIN}"
 ROOT_PATH="${2:-$DEFAULT_ROOT_PATH}"
 SECONDARY_DOMAIN="${3:-$DEFAULT_SECONDARY_DOMAIN}"
 SECONDARY_ROOT="${4:-$DEFAULT_SECONDARY_ROOT}"
+AVATAR_ROOT="${5:-$ROOT_PATH/src/backend/static/avatars/mems}"
 
 echo "生成 nginx 配置文件..."
 echo "项目路径: $ROOT_PATH"
 echo "域名: $DOMAIN"
 echo "二级域名: $SECONDARY_DOMAIN"
 echo "二级项目静态目录: $SECONDARY_ROOT"
+echo "头像目录: $AVATAR_ROOT"
 echo "配置文件: $NGINX_CONF"
 
 # 创建日志目录
@@ -61,10 +63,10 @@ http {
     include /etc/nginx/mime.types;
     default_type application/octet-stream;
     
-    # 日志格式
+    # 日志格式（末尾 \$request_time 供 benchmarks/replay_access_log.py 对照线上延迟）
     log_format main '\$remote_addr - \$remote_user [\$time_local] "\$request" '
                     '\$status \$body_bytes_sent "\$http_referer" '
-                    '"\$http_user_agent" "\$http_x_forwarded_for"';
+                    '"\$http_user_agent" "\$http_x_forwarded_for" \$request_time';
     
     # 访问日志
     access_log $ROOT_PATH/logs/access.log main;
@@ -124,6 +126,32 @@ http {
             proxy_set_header X-Forwarded-Proto \$scheme;
         }
 
+        # 头像 / 日常图片：后端（X_ACCEL_REDIRECT_ENABLED=true）只解析并校验路径，经上方 /api/ 代理返回
+        # X-Accel-Redirect，由下列 internal location 发送文件；路径需与 X_ACCEL_*_LOCATION 配置一致
+        location ^~ /_accel/avatars/ {
+            internal;
+            alias $AVATAR_ROOT/;
+            sendfile on;
+            tcp_nopush on;
+            open_file_cache max=10000 inactive=5m;
+            open_file_cache_valid 60s;
+            open_file_cache_min_uses 2;
+            open_file_cache_errors on;
+            access_log off;
+        }
+
+        location ^~ /_accel/pics/ {
+            internal;
+            alias $ROOT_PATH/src/backend/static/pics/;
+            sendfile on;
+            tcp_nopush on;
+            open_file_cache max=10000 inactive=5m;
+            open_file_cache_valid 60s;
+            open_file_cache_min_uses 2;
+            open_file_cache_errors on;
+            access_log off;
+        }
+
         # 头像文件代理
         location /avatars/ {
             proxy_pass http://localhost:8000;
@@ -145,6 +173,8 @@ http {
         # 静态资源缓存
         location ~* \.(js|css|png|jpg|jpeg|gif|ico|svg|woff|woff2|ttf|eot)\$ {
             expires 1y;
+            # 优先返回部署时生成的 .gz 同名文件（scripts/precompress_static.py）
+            gzip_static on;
             add_header Cache-Control "public, immutable";
             access_log off;
         }
@@ -179,6 +209,8 @@ http {
 
         location ~* \.(js|css|png|jpg|jpeg|gif|ico|svg|woff|woff2|ttf|eot)\$ {
             expires 1y;
+            # 优先返回部署时生成的 .gz 同名文件（scripts/precompress_static.py）
+            gzip_static on;
             add_header Cache-Control "public, immutable";
             access_log off;
         }
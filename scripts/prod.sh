@@ -49,6 +49,10 @@ if [ $? -ne 0 ]; then
     exit 1
 fi
 
+# 预压缩文本资源（生成 .br/.gz 同名文件，由后端/nginx 直接返回）
+echo "Precompressing static assets..."
+uv run python scripts/precompress_static.py static 2>/dev/null || python3 scripts/precompress_static.py static || echo "Warning: precompression skipped"
+
 echo ""
 echo "[4/6] Configuring Nginx..."
 echo "----------------------------------------"
@@ -95,11 +99,21 @@ if [ $? -ne 0 ]; then
 fi
 
 echo "Backend server started with PID: $BACKEND_PID"
-sleep 3
+# 等待后端就绪（/ready 在启动流程与密钥预热完成后返回 200，最多等待 30 秒）
+READY=0
+for _ in $(seq 1 60); do
+    if curl -f -s http://localhost:8000/ready > /dev/null; then
+        READY=1
+        break
+    fi
+    sleep 0.5
+done
 
 # 检查后端是否启动成功
-if ! curl -f -s http://localhost:8000/health > /dev/null; then
-    echo "Warning: Backend health check failed, but continuing..."
+if [ "$READY" -ne 1 ]; then
+    echo "Warning: Backend readiness check failed, but continuing..."
+    curl -s http://localhost:8000/ready || true
+    echo ""
 fi
 
 echo ""
@@ -178,6 +178,10 @@ if [ ! -f "static/index.html" ]; then
     echo "Warning: index.html not found in deployed static files"
 fi
 
+# 预压缩文本资源（生成 .br/.gz 同名文件，由后端/nginx 直接返回）
+echo "Precompressing static assets..."
+uv run python scripts/precompress_static.py static 2>/dev/null || python3 scripts/precompress_static.py static || echo "Warning: precompression skipped"
+
 echo "Static files deployed successfully"
 
 # 步骤4: 重启nginx（如果需要）
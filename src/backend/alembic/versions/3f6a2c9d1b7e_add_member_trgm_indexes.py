@@ -0,0 +1,42 @@
+"""add member trgm indexes
+
+Revision ID: 3f6a2c9d1b7e
+Revises: 1e1b0c016fe4
+Create Date: 2025-10-20 10:12:41.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a2c9d1b7e'
+down_revision: Union[str, Sequence[str], None] = '1e1b0c016fe4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_TRGM_COLUMNS = ("display_name", "group_nick", "qq_nick")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in _TRGM_COLUMNS:
+        op.create_index(
+            f"ix_members_{column}_trgm",
+            "members",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(_TRGM_COLUMNS):
+        op.drop_index(f"ix_members_{column}_trgm", table_name="members")
+    # 扩展可能被其他对象使用，降级时不删除 pg_trgm
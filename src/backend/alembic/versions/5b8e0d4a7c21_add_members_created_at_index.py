@@ -0,0 +1,29 @@
+"""add members created_at index
+
+Revision ID: 5b8e0d4a7c21
+Revises: 3f6a2c9d1b7e
+Create Date: 2025-10-20 15:03:27.904513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e0d4a7c21'
+down_revision: Union[str, Sequence[str], None] = '3f6a2c9d1b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 可绑定成员目录按 created_at DESC 排序；反连接依赖已有的 ix_users_member_id（唯一）
+    op.create_index(op.f('ix_members_created_at'), 'members', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_members_created_at'), table_name='members')
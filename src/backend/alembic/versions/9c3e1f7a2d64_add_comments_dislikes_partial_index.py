@@ -0,0 +1,35 @@
+"""add comments dislikes partial index
+
+Revision ID: 9c3e1f7a2d64
+Revises: 5b8e0d4a7c21
+Create Date: 2025-10-21 09:41:12.503127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e1f7a2d64'
+down_revision: Union[str, Sequence[str], None] = '5b8e0d4a7c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 管理端高点踩队列只关心未删除评论：部分索引按 dislikes DESC, id 排列，分页与计数都是索引范围扫描
+    op.create_index(
+        'ix_comments_dislikes_active',
+        'comments',
+        [sa.text('dislikes DESC'), 'id'],
+        unique=False,
+        postgresql_where=sa.text('NOT is_deleted'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_dislikes_active', table_name='comments')
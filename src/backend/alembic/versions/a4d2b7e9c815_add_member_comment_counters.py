@@ -0,0 +1,54 @@
+"""add member comment counters
+
+Revision ID: a4d2b7e9c815
+Revises: 9c3e1f7a2d64
+Create Date: 2025-10-21 14:22:05.716340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2b7e9c815'
+down_revision: Union[str, Sequence[str], None] = '9c3e1f7a2d64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('members', sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('members', sa.Column('last_comment_at', sa.DateTime(), nullable=True))
+
+    # 回填未删除评论的数量与最近评论时间
+    op.execute(
+        """
+        UPDATE members AS m
+        SET comment_count = s.cnt, last_comment_at = s.last_at
+        FROM (
+            SELECT member_id, count(*) AS cnt, max(created_at) AS last_at
+            FROM comments
+            WHERE NOT is_deleted
+            GROUP BY member_id
+        ) AS s
+        WHERE m.id = s.member_id
+        """
+    )
+
+    # 成员评论列表：按 member_id + is_deleted 定位，按 created_at DESC, id DESC 顺序取页
+    op.create_index(
+        'ix_comments_member_deleted_created',
+        'comments',
+        ['member_id', 'is_deleted', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_member_deleted_created', table_name='comments')
+    op.drop_column('members', 'last_comment_at')
+    op.drop_column('members', 'comment_count')
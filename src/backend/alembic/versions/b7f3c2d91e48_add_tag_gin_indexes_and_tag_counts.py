@@ -0,0 +1,120 @@
+"""add tag gin indexes and tag counts
+
+Revision ID: b7f3c2d91e48
+Revises: a4d2b7e9c815
+Create Date: 2025-10-22 10:41:37.208115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f3c2d91e48'
+down_revision: Union[str, Sequence[str], None] = 'a4d2b7e9c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 迁移内保留一份函数定义，不依赖模型代码的后续变化
+TAG_COUNTS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tag_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    old_tags jsonb := '[]'::jsonb;
+    new_tags jsonb := '[]'::jsonb;
+BEGIN
+    IF TG_OP <> 'INSERT' AND COALESCE((to_jsonb(OLD) ->> 'published')::boolean, true)
+       AND jsonb_typeof(OLD.tags) = 'array' THEN
+        old_tags := OLD.tags;
+    END IF;
+    IF TG_OP <> 'DELETE' AND COALESCE((to_jsonb(NEW) ->> 'published')::boolean, true)
+       AND jsonb_typeof(NEW.tags) = 'array' THEN
+        new_tags := NEW.tags;
+    END IF;
+    IF old_tags = new_tags THEN
+        RETURN NULL;
+    END IF;
+
+    WITH o AS (SELECT DISTINCT value AS tag FROM jsonb_array_elements_text(old_tags)),
+         n AS (SELECT DISTINCT value AS tag FROM jsonb_array_elements_text(new_tags)),
+         d AS (
+             SELECT tag, 1 AS delta FROM n WHERE tag NOT IN (SELECT tag FROM o)
+             UNION ALL
+             SELECT tag, -1 AS delta FROM o WHERE tag NOT IN (SELECT tag FROM n)
+         )
+    INSERT INTO tag_counts (scope, tag, count)
+    SELECT TG_ARGV[0], left(tag, 100), sum(delta) FROM d GROUP BY left(tag, 100)
+    ON CONFLICT (scope, tag) DO UPDATE SET count = tag_counts.count + EXCLUDED.count;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = (("daily_posts", "tags, published"), ("activities", "tags"))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tags @> '["x"]' 的包含查询走 GIN（jsonb_path_ops 体积更小，只支持 @> 即可满足需求）
+    op.create_index(
+        'ix_daily_posts_tags_gin', 'daily_posts', ['tags'], unique=False,
+        postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'ix_activities_tags_gin', 'activities', ['tags'], unique=False,
+        postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'},
+    )
+
+    op.create_table(
+        'tag_counts',
+        sa.Column('scope', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column('tag', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('scope', 'tag'),
+    )
+
+    op.execute(TAG_COUNTS_FUNCTION_SQL)
+    for table, columns in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {table}_tag_counts AFTER INSERT OR DELETE OR UPDATE OF {columns} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION tag_counts_apply('{table}')"
+        )
+
+    # 回填现有数据（日常动态只统计已发布的帖子，同一行重复的标签只计一次）
+    op.execute(
+        """
+        INSERT INTO tag_counts (scope, tag, count)
+        SELECT 'daily_posts', left(t.tag, 100), count(DISTINCT p.id)
+        FROM daily_posts AS p
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(p.tags) = 'array' THEN p.tags ELSE '[]'::jsonb END
+        ) AS t(tag)
+        WHERE p.published
+        GROUP BY left(t.tag, 100)
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO tag_counts (scope, tag, count)
+        SELECT 'activities', left(t.tag, 100), count(DISTINCT a.id)
+        FROM activities AS a
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(a.tags) = 'array' THEN a.tags ELSE '[]'::jsonb END
+        ) AS t(tag)
+        GROUP BY left(t.tag, 100)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_tag_counts ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS tag_counts_apply()")
+    op.drop_table('tag_counts')
+    op.drop_index('ix_activities_tags_gin', table_name='activities', postgresql_using='gin')
+    op.drop_index('ix_daily_posts_tags_gin', table_name='daily_posts', postgresql_using='gin')
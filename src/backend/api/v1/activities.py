@@ -3,11 +3,12 @@
 """
 import math
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from services.deps import get_session
+from services.deps import get_session, get_read_session
+from services.database.replicas import served_from_replica
 from services.auth.utils import require_admin
 from services.database.models.activity import ActivityCRUD, ActivityCreate, ActivityUpdate
 from services.database.models.member import MemberCRUD
@@ -62,15 +63,13 @@ async def build_activity_response(activity, session: AsyncSession) -> ActivityRe
 async def get_activities(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页大小"),
-    session: AsyncSession = Depends(get_session)
+    tag: Optional[str] = Query(None, max_length=100, description="按标签过滤"),
+    session: AsyncSession = Depends(get_read_session)
 ):
     """获取活动列表"""
     try:
-        # 获取活动总数
-        total = await ActivityCRUD.count_total(session)
-        
-        # 获取活动列表
-        activities, total = await ActivityCRUD.get_paginated(session, page=page, page_size=page_size)
+        # 获取活动列表与总数
+        activities, total = await ActivityCRUD.get_paginated(session, page=page, page_size=page_size, tag=tag)
 
         # 计算分页
         total_pages = math.ceil(total / page_size)
@@ -100,7 +99,7 @@ async def get_activities(
     summary="获取活动统计信息",
     description="获取活动总数、参与人次等统计信息"
 )
-async def get_activity_stats(session: AsyncSession = Depends(get_session)):
+async def get_activity_stats(request: Request, session: AsyncSession = Depends(get_read_session)):
     """获取活动统计信息（带缓存）"""
     try:
         from services.deps import get_cache_service
@@ -137,7 +136,9 @@ async def get_activity_stats(session: AsyncSession = Depends(get_session)):
             unique_participants=unique_participants
         )
 
-        # 缓存结果（使用配置的统计TTL）
+        # 缓存结果（使用配置的统计TTL；副本数据可能稍旧，不写入共享缓存）
+        if served_from_replica(request):
+            return stats_response
         try:
             cache_service = get_cache_service()
             from services.deps import get_config_service
@@ -162,7 +163,7 @@ async def get_activity_stats(session: AsyncSession = Depends(get_session)):
 )
 async def get_activity(
     activity_id: int,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """获取单个活动详情"""
     try:
@@ -19,10 +19,11 @@ from __future__ import annotations
 
 from typing import Annotated, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from services.deps import get_session, get_cache_service, get_config_service
+from services.deps import get_session, get_read_session, get_config_service
+from services.cache.response_cache import cached_json_response
 from services.auth.utils import get_current_active_user, get_current_user_optional, require_admin
 from services.database.models.user import User
 from services.database.models.activity_subsystem.base import (
@@ -67,43 +68,40 @@ def _parse_optional_naive(s: Optional[str]) -> Optional[datetime]:
 
 @router.get("", response_model=ActivityListOut)
 async def list_activities(
+    request: Request,
     status: str = Query("ongoing"),
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    cache = get_cache_service()
     settings = get_config_service().get_settings()
     ttl = min(getattr(settings, "cache_activity_ttl", 300), 10)
     cache_key = f"act:list:{status}:{page}:{size}"
 
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    items, total = await ActActivityCRUD.list(session, status=status, page=page, size=size)
-    payload: ActivityListOut = ActivityListOut(
-        items=[
-            ActivityListItem(
-                id=a.id,
-                type=a.type,
-                title=a.title,
-                description=a.description,
-                status=a.status,
-                creator_id=getattr(a, "creator_id", 0),
-            )
-            for a in items
-        ],
-        total=total,
-        page=page,
-        size=size,
-    )
-    await cache.set(cache_key, payload.model_dump(mode="json"), ttl=ttl)
-    return payload
+    async def _build() -> ActivityListOut:
+        items, total = await ActActivityCRUD.list(session, status=status, page=page, size=size)
+        return ActivityListOut(
+            items=[
+                ActivityListItem(
+                    id=a.id,
+                    type=a.type,
+                    title=a.title,
+                    description=a.description,
+                    status=a.status,
+                    creator_id=getattr(a, "creator_id", 0),
+                )
+                for a in items
+            ],
+            total=total,
+            page=page,
+            size=size,
+        )
+
+    return await cached_json_response(request, cache_key, ttl, _build)
 
 
 @router.get("/{activity_id}", response_model=ActivityOut)
-async def get_activity(activity_id: int, session: AsyncSession = Depends(get_session)):
+async def get_activity(activity_id: int, session: AsyncSession = Depends(get_read_session)):
     a = await ActActivityCRUD.get(session, activity_id)
     if not a:
         raise HTTPException(status_code=404, detail="Activity not found")
@@ -123,34 +121,31 @@ async def get_activity(activity_id: int, session: AsyncSession = Depends(get_ses
 
 @router.get("/{activity_id}/ranking", response_model=RankingOut)
 async def get_ranking(
+    request: Request,
     activity_id: int,
     top: int = Query(10, ge=1, le=100),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    a = await ActActivityCRUD.get(session, activity_id)
-    if not a:
-        raise HTTPException(status_code=404, detail="Activity not found")
-
-    cache = get_cache_service()
     settings = get_config_service().get_settings()
     ttl = min(getattr(settings, "cache_activity_ttl", 300), 10)
     cache_key = f"act:rank:{activity_id}:{top}"
 
-    cached = await cache.get(cache_key)
-    if cached is not None:
-        return cached
+    async def _build() -> dict:
+        # 仅在缓存未命中时校验活动是否存在（命中即说明曾成功生成）
+        a = await ActActivityCRUD.get(session, activity_id)
+        if not a:
+            raise HTTPException(status_code=404, detail="Activity not found")
+        rows = await ActVoteCRUD.get_ranking(session, activity_id, top=top)
+        opts = await ActVoteCRUD.list_options(session, activity_id, None, 1000)
+        id2label = {o.id: o.label for o in opts}
+        return {
+            "entries": [
+                {"option_id": oid, "label": id2label.get(oid, str(oid)), "votes": cnt}
+                for oid, cnt in rows
+            ]
+        }
 
-    rows = await ActVoteCRUD.get_ranking(session, activity_id, top=top)
-    opts = await ActVoteCRUD.list_options(session, activity_id, None, 1000)
-    id2label = {o.id: o.label for o in opts}
-    payload = {
-        "entries": [
-            {"option_id": oid, "label": id2label.get(oid, str(oid)), "votes": cnt}
-            for oid, cnt in rows
-        ]
-    }
-    await cache.set(cache_key, payload, ttl=ttl)
-    return payload
+    return await cached_json_response(request, cache_key, ttl, _build)
 
 
 @router.get("/{activity_id}/my-vote")
@@ -172,7 +167,7 @@ async def list_options(
     activity_id: int,
     query: Optional[str] = None,
     size: int = Query(50, ge=1, le=200),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     a = await ActActivityCRUD.get(session, activity_id)
     if not a:
@@ -332,7 +327,7 @@ async def revoke_vote(
 
 
 @router.get("/{activity_id}/posts")
-async def list_posts(activity_id: int, size: int = 20, session: AsyncSession = Depends(get_session)):
+async def list_posts(activity_id: int, size: int = 20, session: AsyncSession = Depends(get_read_session)):
     a = await ActActivityCRUD.get(session, activity_id)
     if not a:
         raise HTTPException(status_code=404, detail="Activity not found")
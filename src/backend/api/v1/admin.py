@@ -1,16 +1,18 @@
 """
 管理员API路由
 """
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from services.deps import get_session, get_crypto_service
+from services.deps import get_session, get_crypto_service, get_metrics_service, get_db_service, get_pics_gc
 from services.auth.utils import require_admin
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 # 注：成员导入功能已全部迁移至 members 模块。
-# 本模块仅保留管理员工具端点：decrypt_member_uin、database-stats。
+# 本模块仅保留管理员工具端点：decrypt_member_uin、database-stats、db-pool、metrics、pics。
 
 
 @router.get(
@@ -87,3 +89,83 @@ async def get_database_stats(
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取统计信息失败: {str(e)}")
+
+
+@router.get(
+    "/db-pool",
+    summary="获取数据库连接池状态",
+    description="返回连接池配置、占用/空闲/溢出连接数、checkout 等待分位数、排队与超时次数，以及自适应调整记录"
+)
+async def get_db_pool_stats(_: dict = Depends(require_admin)):
+    """获取数据库连接池状态"""
+    try:
+        return get_db_service().pool_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取连接池状态失败: {str(e)}")
+
+
+@router.get(
+    "/metrics",
+    summary="获取请求指标",
+    description="按路由返回延迟分位数（p50/p95/p99）、每请求 SQL 语句数与耗时、缓存各层命中次数，以及日志队列状态"
+)
+async def get_request_metrics(
+    sort_by: str = Query("p95_ms", description="排序字段，如 p95_ms、count、sql_per_request"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    _: dict = Depends(require_admin)
+):
+    """获取请求指标"""
+    try:
+        from utils.log_pipeline import get_logging_stats
+
+        data = get_metrics_service().snapshot(sort_by=sort_by, limit=limit)
+        data["logging"] = get_logging_stats()
+        return data
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取请求指标失败: {str(e)}")
+
+
+@router.post(
+    "/metrics/reset",
+    summary="重置请求指标",
+    description="清空已累计的路由指标，便于对比变更前后的表现"
+)
+async def reset_request_metrics(_: dict = Depends(require_admin)):
+    """重置请求指标"""
+    get_metrics_service().reset()
+    return {"message": "请求指标已重置"}
+
+
+@router.get(
+    "/pics/storage",
+    summary="获取日常图片存储统计",
+    description="按月份目录（yyyy/mm）返回图片文件数与字节数，以及孤儿图片回收的配置和最近一轮结果"
+)
+async def get_pics_storage(_: dict = Depends(require_admin)):
+    """获取日常图片存储统计"""
+    try:
+        pics_gc = get_pics_gc()
+        data = await pics_gc.storage_usage()
+        data["gc"] = pics_gc.stats()
+        return data
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取图片存储统计失败: {str(e)}")
+
+
+@router.post(
+    "/pics/gc",
+    summary="回收孤儿图片",
+    description="立即执行一轮孤儿图片回收；默认 dry_run 只报告将被删除的文件，dry_run=false 才会删除"
+)
+async def collect_orphaned_pics(
+    dry_run: bool = Query(True, description="只报告不删除"),
+    _: dict = Depends(require_admin)
+):
+    """回收孤儿图片"""
+    try:
+        report = await get_pics_gc().collect_exclusive(dry_run=dry_run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"回收孤儿图片失败: {str(e)}")
+    if report is None:
+        raise HTTPException(status_code=409, detail="另一个进程正在回收图片，请稍后重试")
+    return report.to_dict()
@@ -12,7 +12,7 @@ from pydantic import BaseModel, Field
 from services.database.models.user import User, UserCreate, UserRead, UserCRUD
 from services.deps import get_session, get_auth_service
 from services.auth.service import AuthService
-from services.auth.utils import get_current_active_user
+from services.auth.utils import get_current_active_user, require_admin
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -36,7 +36,10 @@ async def login(
     """
     # 验证用户
     user = await UserCRUD.get_by_username(session, username=form_data.username)
-    if not user or not auth_service.verify_password(form_data.password, user.password_hash):
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await auth_service.verify_and_update_password(form_data.password, user.password_hash)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码错误",
@@ -55,6 +58,11 @@ async def login(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
 
+    # 哈希参数已变化：透明重算并随最后登录时间一起提交
+    if new_hash:
+        user.password_hash = new_hash
+        session.add(user)
+
     # 更新最后登录时间
     await UserCRUD.update_last_login(session, user.id)
 
@@ -128,7 +136,7 @@ async def register(
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="用户名已存在")
 
     # 创建用户（默认角色 viewer，启用）
-    password_hash = auth_service.get_password_hash(payload.password)
+    password_hash = await auth_service.get_password_hash_async(payload.password)
     user = await UserCRUD.create(
         session,
         UserCreate(username=payload.username, password=payload.password, role="viewer", is_active=True),
@@ -163,11 +171,11 @@ async def change_password(
     auth_service: Annotated[AuthService, Depends(get_auth_service)]
 ):
     # 验证旧密码
-    if not auth_service.verify_password(payload.old_password, current_user.password_hash):
+    if not await auth_service.verify_password_async(payload.old_password, current_user.password_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="原密码不正确")
 
     # 更新新密码哈希
-    new_hash = auth_service.get_password_hash(payload.new_password)
+    new_hash = await auth_service.get_password_hash_async(payload.new_password)
     user = await UserCRUD.get_by_id(session, current_user.id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
@@ -177,6 +185,15 @@ async def change_password(
     return {"success": True}
 
 
+@router.get("/hash-metrics", summary="密码哈希执行器指标（管理员）")
+async def get_hash_metrics(
+    _: dict = Depends(require_admin),
+    auth_service: AuthService = Depends(get_auth_service)
+):
+    """返回哈希线程池的并发、拒绝数与耗时分布"""
+    return auth_service.hasher.stats()
+
+
 @router.post("/refresh", summary="刷新令牌")
 async def refresh_token(
     current_user: Annotated[User, Depends(get_current_active_user)],
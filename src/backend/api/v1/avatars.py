@@ -3,11 +3,11 @@
 """
 import logging
 from fastapi import APIRouter, HTTPException, Response, Depends
-from fastapi.responses import FileResponse
 from pathlib import Path
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from services.deps import get_session, get_config_service, get_crypto_service
+from services.deps import get_session, get_read_session, get_config_service, get_crypto_service
+from utils.x_accel import file_or_accel_response
 
 # 设置日志记录器
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ router = APIRouter(tags=["avatars"])
     summary="获取头像文件",
     description="根据成员ID获取头像文件，返回二进制流"
 )
-async def get_avatar(member_id: int, session: AsyncSession = Depends(get_session)):
+async def get_avatar(member_id: int, session: AsyncSession = Depends(get_read_session)):
     """获取头像文件"""
     logger.info(f"[GET_AVATAR] 开始处理头像请求 - member_id: {member_id}")
 
@@ -73,8 +73,11 @@ async def get_avatar(member_id: int, session: AsyncSession = Depends(get_session
 
         logger.info(f"[GET_AVATAR] 成功返回头像文件 - member_id: {member_id}, uin: {uin}")
         # 返回文件
-        return FileResponse(
-            path=avatar_path,
+        # 开启 X-Accel-Redirect 时由 nginx 发送文件字节
+        return file_or_accel_response(
+            avatar_path,
+            root=Path(settings.avatar_root),
+            location=settings.x_accel_avatars_location,
             media_type="image/webp",
             headers={
                 "Cache-Control": "public, max-age=86400",  # 缓存1天
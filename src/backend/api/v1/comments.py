@@ -6,9 +6,12 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from services.deps import get_session
+from services.deps import get_session, get_config_service, get_db_service
+from services.database.replicas import prefers_replica
 from services.auth.utils import require_admin
 from services.database.models import CommentCRUD, CommentCreate, MemberCRUD
+from services.cache.keys import MEMBER_COMMENTS_FIRST_PAGE_SIZE, member_comments_first_page_key
+from services.cache.response_cache import cached_json_response
 from schema.comment import (
     CommentResponse,
     CommentCreateRequest,
@@ -36,30 +39,52 @@ def get_client_ip(request: Request) -> str:
 
 @router.get("/members/{member_id}/comments", response_model=CommentListResponse)
 async def get_member_comments(
+    request: Request,
     member_id: int,
     page: int = 1,
     page_size: int = 20,
-    db: AsyncSession = Depends(get_session)
 ):
-    """获取某成员的评论列表"""
-    # 验证成员是否存在
-    member = await MemberCRUD.get_by_id(db, member_id)
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Member not found"
-        )
-    
+    """获取某成员的评论列表
+
+    总数读取成员上的反规范化计数（同时校验成员存在），不再单独 COUNT；
+    默认首页（page=1, page_size=20）缓存预序列化的 JSON，评论写入后失效，
+    常见的点开成员卡片只需一次缓存命中，不占用数据库连接（会话按需打开）。
+    """
     # 参数验证
     if page < 1:
         page = 1
     if page_size < 1 or page_size > 100:
         page_size = 20
-    
-    # 获取评论列表
-    comments = await CommentCRUD.get_by_member_id(db, member_id, page, page_size)
-    total = await CommentCRUD.count_by_member_id(db, member_id)
+
+    if page == 1 and page_size == MEMBER_COMMENTS_FIRST_PAGE_SIZE:
+        async def _build_first_page() -> CommentListResponse:
+            # 从主库回填：写入后缓存刚被删除，副本回放延迟内回填会把旧页缓存到 TTL 结束
+            async with get_db_service().with_session() as db:
+                return await _member_comments_page(db, member_id, page, page_size)
+
+        ttl = get_config_service().get_settings().cache_comment_page_ttl
+        return await cached_json_response(
+            request, member_comments_first_page_key(member_id), ttl, _build_first_page
+        )
+
+    async with get_db_service().with_read_session(prefer_replica=prefers_replica(request)) as db:
+        return await _member_comments_page(db, member_id, page, page_size)
+
+
+async def _member_comments_page(db: AsyncSession, member_id: int, page: int, page_size: int) -> CommentListResponse:
+    # 成员不存在时计数为 None
+    total = await CommentCRUD.get_member_comment_count(db, member_id)
+    if total is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Member not found"
+        )
     total_pages = math.ceil(total / page_size) if total > 0 else 1
+
+    # 获取评论列表（超出总数的页无需查询）
+    comments = []
+    if (page - 1) * page_size < total:
+        comments = await CommentCRUD.get_by_member_id(db, member_id, page, page_size)
     
     # 转换为响应模型
     comment_responses = [
@@ -247,6 +272,11 @@ async def get_high_dislike_comments(
         page_size = 20
     
     comments = await CommentCRUD.get_high_dislike_comments(db, threshold, page, page_size)
+    # 首页不足一页时总数即为本页条数，省去 COUNT
+    if page == 1 and len(comments) < page_size:
+        total = len(comments)
+    else:
+        total = await CommentCRUD.count_high_dislike_comments(db, threshold)
     
     comment_responses = [
         CommentResponse(
@@ -264,6 +294,9 @@ async def get_high_dislike_comments(
     
     return CommentModerationResponse(
         high_dislike_comments=comment_responses,
-        total=len(comment_responses),
-        threshold=threshold
+        total=total,
+        threshold=threshold,
+        page=page,
+        page_size=page_size,
+        total_pages=math.ceil(total / page_size) if total > 0 else 1
     )
@@ -4,15 +4,16 @@
 from __future__ import annotations
 import math
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from typing import List, Literal, Optional, Set
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from services.deps import get_session, get_auth_service, get_cache_service, get_config_service
+from services.deps import get_session, get_read_session, get_auth_service, get_config_service
 from services.auth.utils import get_current_active_user
 from services.database.models import DailyPostCRUD, DailyPostCreate, DailyPostUpdate
 from services.database.models.user import UserCRUD
 from services.database.models.member import MemberCRUD
+from services.cache.response_cache import cached_json_response, encode_payload, payload_response
 
 
 logger = logging.getLogger(__name__)
@@ -25,6 +26,35 @@ from schema.daily import (
     UploadImagesResponse,
 )
 
+# 列表视图：summary 不读取 content_jsonb、images 只返回首图；full 返回完整帖子（详情页同结构）
+DailyView = Literal["summary", "full"]
+DAILY_ITEM_FIELDS = frozenset(DailyPostItem.model_fields)
+_AUTHOR_FIELDS = {"author_display_name", "author_avatar_url"}
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """解析 fields=（逗号分隔）；id 总是返回，未知字段返回 400"""
+    if not fields:
+        return None
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = wanted - DAILY_ITEM_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return wanted | {"id"}
+
+
+def _resolve_view(view: str, fields: Optional[Set[str]]) -> str:
+    # 显式请求 content_jsonb 时才需要读取整行
+    if view == "full" or (fields is not None and "content_jsonb" in fields):
+        return "full"
+    return "summary"
+
+
+def _dump_items(items: List[DailyPostItem], fields: Optional[Set[str]]):
+    if fields is None:
+        return items
+    return [item.model_dump(mode="json", include=fields) for item in items]
+
 
 async def _get_author_info(session: AsyncSession, author_user_id: int):
     """根据 author_user_id 返回 (display_name, avatar_url)
@@ -48,8 +78,12 @@ async def _get_author_info(session: AsyncSession, author_user_id: int):
         return None, None
 
 
-async def _to_post_item(session: AsyncSession, post) -> DailyPostItem:
+async def _to_post_item(session: AsyncSession, post, with_author: bool = True) -> DailyPostItem:
     base = post.model_dump()
+    if "first_image" in base:
+        # 列表投影（DailyPostSummary）只带首图
+        first = base.pop("first_image")
+        base["images"] = [first] if isinstance(first, str) and first else []
 
     # 中文注释：兼容历史数据，将 /static/pics/... 统一映射到 /api/v1/daily/pics/...
     imgs = base.get("images") or []
@@ -63,6 +97,8 @@ async def _to_post_item(session: AsyncSession, post) -> DailyPostItem:
     if mapped:
         base["images"] = mapped
 
+    if not with_author:
+        return DailyPostItem(**base)
     name, avatar = await _get_author_info(session, post.author_user_id)
     if name is not None:
         base["author_display_name"] = name
@@ -77,42 +113,36 @@ async def _to_post_item(session: AsyncSession, post) -> DailyPostItem:
     summary="获取首页精选动态（trending）",
 )
 async def get_trending(
+    request: Request,
     limit: int = Query(12, ge=1, le=50),
-    session: AsyncSession = Depends(get_session),
+    view: DailyView = Query("summary", description="summary：不含 content_jsonb、仅首图；full：完整帖子"),
+    fields: Optional[str] = Query(None, description="逗号分隔的返回字段（如 id,content,images）"),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """获取首页精选动态（带缓存）
 
     Cache key strategy:
-    - Use namespaced key with parameter(s) to avoid collision: daily:trending:limit:{limit}
+    - Use namespaced key with parameter(s) to avoid collision:
+      daily:trending:limit:{limit}:view:{view}[:fields:{sorted fields}]
     TTL strategy:
     - Use settings.cache_default_ttl to balance freshness and performance.
+    Cached value is the final JSON bytes (plus gzip/br variants); hits skip model validation.
     """
-    cache_key = f"daily:trending:limit:{limit}"
+    wanted = _parse_fields(fields)
+    view = _resolve_view(view, wanted)
+    cache_key = f"daily:trending:limit:{limit}:view:{view}"
+    if wanted is not None:
+        cache_key += f":fields:{','.join(sorted(wanted))}"
+    settings = get_config_service().get_settings()
+    with_author = wanted is None or bool(wanted & _AUTHOR_FIELDS)
 
-    # Try to return from cache first
-    try:
-        cache_service = get_cache_service()
-        cached_items = await cache_service.get(cache_key)
-        if cached_items is not None:
-            return cached_items
-    except Exception as e:
-        # Cache failure should not break the main flow
-        logger.warning(f"Failed to get trending from cache: {e}")
-
-    # Cache miss: query database and build response
-    posts = await DailyPostCRUD.list_trending(session, limit=limit)
-    items = [await _to_post_item(session, p) for p in posts]
-
-    # Write to cache with configured TTL
-    try:
-        cache_service = get_cache_service()
-        config_service = get_config_service()
-        settings = config_service.get_settings()
-        await cache_service.set(cache_key, items, ttl=settings.cache_default_ttl)
-    except Exception as e:
-        logger.warning(f"Failed to cache trending items: {e}")
+    async def _build_items():
+        posts = await DailyPostCRUD.list_trending(session, limit=limit, view=view)
+        items = [await _to_post_item(session, p, with_author) for p in posts]
+        return _dump_items(items, wanted)
 
-    return items
+    # 命中时直接返回预序列化的 JSON 字节
+    return await cached_json_response(request, cache_key, settings.cache_default_ttl, _build_items)
 
 
 @router.get(
@@ -121,12 +151,17 @@ async def get_trending(
     summary="获取日常动态列表"
 )
 async def list_posts(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     tag: Optional[str] = None,
     author_user_id: Optional[int] = None,
-    session: AsyncSession = Depends(get_session),
+    view: DailyView = Query("summary", description="summary：不含 content_jsonb、仅首图；full：完整帖子"),
+    fields: Optional[str] = Query(None, description="逗号分隔的返回字段（如 id,content,images）"),
+    session: AsyncSession = Depends(get_read_session),
 ):
+    wanted = _parse_fields(fields)
+    view = _resolve_view(view, wanted)
     posts, total = await DailyPostCRUD.list_paginated(
         session=session,
         page=page,
@@ -134,9 +169,20 @@ async def list_posts(
         tag=tag,
         author_user_id=author_user_id,
         published_only=True,
+        view=view,
     )
     total_pages = math.ceil(total / page_size) if page_size else 1
-    items = [await _to_post_item(session, p) for p in posts]
+    with_author = wanted is None or bool(wanted & _AUTHOR_FIELDS)
+    items = [await _to_post_item(session, p, with_author) for p in posts]
+    if wanted is not None:
+        # 部分字段不满足 DailyPostListResponse 的必填约束，直接编码返回
+        return payload_response(encode_payload({
+            "posts": _dump_items(items, wanted),
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+        }), request)
     return DailyPostListResponse(
         posts=items,
         total=total,
@@ -221,9 +267,13 @@ async def upload_images(
     images: List[UploadFile] = File(...),
     current_user=Depends(get_current_active_user),
 ):
-    # 保存到 /static/pics/yyyy/mm 并返回 URL（已统一到 /api/v1/daily/pics/...）
-    from utils.uploads import save_upload_images
-    saved = await save_upload_images(images)
+    # 保存到 /static/pics/yyyy/mm 并返回 URL（已统一到 /api/v1/daily/pics/...）；相同内容复用已有文件
+    from utils.uploads import UploadTooLarge, save_upload_images
+    max_bytes = get_config_service().get_settings().upload_max_image_bytes
+    try:
+        saved = await save_upload_images(images, max_bytes=max_bytes)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=f"Image too large (max {e.max_bytes} bytes): {e.filename}")
     try:
         logger.debug(f"daily.upload_images by user={getattr(current_user, 'id', None)} count={len(images)}")
     except Exception:
@@ -236,10 +286,10 @@ async def upload_images(
     }
 
 
-from fastapi.responses import FileResponse
 import mimetypes
 import re
 from utils.uploads import PICS_ROOT
+from utils.x_accel import file_or_accel_response
 
 
 @router.get(
@@ -262,7 +312,13 @@ async def get_daily_pic(year: int, month: str, filename: str):
         "Cache-Control": "public, max-age=31536000",
         "ETag": f'"{filename}"',
     }
-    return FileResponse(path=str(file_path), media_type=mime or "application/octet-stream", headers=headers)
+    return file_or_accel_response(
+        file_path,
+        root=PICS_ROOT,
+        location=get_config_service().get_settings().x_accel_pics_location,
+        media_type=mime or "application/octet-stream",
+        headers=headers,
+    )
 
 
 # 兼容旧数据：/static/pics/... 在生产环境未挂载 /static 时也可工作
@@ -7,7 +7,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from services.deps import get_session
+from services.deps import get_session, get_read_session
 from services.auth.utils import get_current_active_user
 from services.database.models.daily_post_comment.crud import DailyPostCommentCRUD
 from services.database.models.daily_post_comment.base import DailyPostCommentCreate
@@ -33,7 +33,7 @@ async def recent_comments(
     request: Request,
     limit: int = Query(20, ge=1, le=100),
     include_deleted: bool = False,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """返回最近的评论列表，包含头像等聚合信息。"""
     comments = await DailyPostCommentCRUD.list_recent(session, limit=limit, include_deleted=include_deleted)
@@ -66,7 +66,7 @@ async def list_post_comments(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     include_deleted: bool = False,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     # 帖子存在性校验
     post = await DailyPostCRUD.get_by_id(session, post_id)
@@ -2,14 +2,18 @@
 成员相关API路由
 """
 import math
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from services.deps import get_session
+from services.deps import get_session, get_read_session
 from services.auth.utils import require_admin
 from schema.member import (
     MemberListResponse,
     MemberDetailResponse,
+    MemberSearchItem,
+    MemberSearchResponse,
     CreateMemberRequest,
     ImportMemberRequest,
     ImportBatchRequest,
@@ -31,7 +35,7 @@ async def get_members(
     request: Request,
     page: int = 1,
     page_size: int = 50,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """获取成员列表"""
     # 验证分页参数
@@ -73,25 +77,15 @@ async def get_members(
     summary="获取成员统计信息",
     description="获取群成员的统计信息"
 )
-async def get_member_stats(session: AsyncSession = Depends(get_session)):
-    """获取成员统计信息（带缓存）"""
-    try:
-        from sqlmodel import select, func
-        from services.database.models.member.base import Member
-        from services.deps import get_cache_service
-
-        # 尝试从缓存获取
-        cache_key = "member:stats:all"
-        try:
-            cache_service = get_cache_service()
-            cached_stats = await cache_service.get(cache_key)
-            if cached_stats is not None:
-                return cached_stats
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Failed to get member stats from cache: {e}")
-
-        # 缓存未命中，从数据库获取
+async def get_member_stats(request: Request, session: AsyncSession = Depends(get_session)):
+    """获取成员统计信息（缓存预序列化的 JSON 字节）"""
+    from sqlmodel import select, func
+    from services.database.models.member.base import Member
+    from services.deps import get_config_service
+    from services.cache.keys import MEMBER_STATS_ALL
+    from services.cache.response_cache import cached_json_response
+
+    async def _build_stats() -> dict:
         # 总成员数
         total_statement = select(func.count(Member.id))
         total_result = await session.exec(total_statement)
@@ -126,27 +120,83 @@ async def get_member_stats(session: AsyncSession = Depends(get_session)):
         year_stats = year_result.all()
         join_year_stats = {int(year): count for year, count in year_stats}
 
-        stats_response = {
+        return {
             "total_members": total_members,
             "role_distribution": role_counts,
             "join_year_stats": join_year_stats
         }
 
+    try:
+        settings = get_config_service().get_settings()
         # 缓存结果（使用配置的统计TTL）
-        try:
-            cache_service = get_cache_service()
-            from services.deps import get_config_service
-            config_service = get_config_service()
-            settings = config_service.get_settings()
-            await cache_service.set(cache_key, stats_response, ttl=settings.cache_stats_ttl)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Failed to cache member stats: {e}")
+        return await cached_json_response(request, MEMBER_STATS_ALL, settings.cache_stats_ttl, _build_stats)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取统计信息失败: {str(e)}")
+
+
+@router.get(
+    "/members/search",
+    response_model=MemberSearchResponse,
+    summary="搜索成员",
+    description="按显示名/群昵称/QQ昵称搜索成员；prefix 走内存前缀树（支持拼音），fuzzy 走 pg_trgm，auto 先前缀后模糊补足"
+)
+async def search_members(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=50, description="搜索关键词"),
+    limit: int = Query(10, ge=1, description="返回条数上限"),
+    mode: Literal["auto", "prefix", "fuzzy"] = Query("auto", description="搜索模式"),
+    session: AsyncSession = Depends(get_session)
+):
+    """搜索成员"""
+    from services.deps import get_config_service
+    from domain.member_search import get_member_search_index
 
-        return stats_response
+    settings = get_config_service().get_settings()
+    limit = min(limit, settings.member_search_max_limit)
+    keyword = q.strip()
+    if not keyword:
+        raise HTTPException(status_code=400, detail="搜索关键词不能为空")
 
+    try:
+        base_url = f"{request.url.scheme}://{request.url.netloc}"
+        items: list[MemberSearchItem] = []
+        seen: set[int] = set()
+        sources: list[str] = []
+
+        if mode != "fuzzy" and settings.member_search_trie_enabled:
+            index = await get_member_search_index(session)
+            for record, score in index.search(keyword, limit):
+                items.append(MemberSearchItem(
+                    **MemberService.create_member_response(record, base_url).model_dump(),
+                    score=score
+                ))
+                seen.add(record.id)
+            sources.append("trie")
+
+        if mode == "fuzzy" or (mode == "auto" and len(items) < limit) or not settings.member_search_trie_enabled:
+            for member, score in await MemberCRUD.search(session, keyword, limit + len(seen)):
+                if member.id in seen:
+                    continue
+                items.append(MemberSearchItem(
+                    **MemberService.create_member_response(member, base_url).model_dump(),
+                    score=round(score, 4)
+                ))
+                seen.add(member.id)
+                if len(items) >= limit:
+                    break
+            sources.append("db")
+
+        return MemberSearchResponse(
+            query=keyword,
+            items=items[:limit],
+            total=min(len(items), limit),
+            source="mixed" if len(sources) > 1 else (sources[0] if sources else "db")
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"获取统计信息失败: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"搜索成员失败: {str(e)}")
 
 
 @router.get(
@@ -158,7 +208,7 @@ async def get_member_stats(session: AsyncSession = Depends(get_session)):
 async def get_member_detail(
     member_id: int,
     request: Request,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """获取成员详情"""
     if member_id < 1:
@@ -285,16 +335,18 @@ async def import_members_from_json(
     "/members/refresh-avatars",
     response_model=ApiResponse,
     summary="批量刷新所有成员头像",
-    description="管理员操作：解密所有成员UIN并批量下载QQ头像为WebP"
+    description="管理员操作：解密所有成员UIN并增量刷新QQ头像（条件请求，源图未变化时不重新编码），缺失与最久未检查的头像优先"
 )
 async def refresh_all_member_avatars(
+    force: bool = Query(False, description="忽略 ETag 与源图摘要，强制重新下载并编码"),
+    limit: int | None = Query(None, ge=1, description="本次最多刷新的成员数（按优先级选取）"),
     session: AsyncSession = Depends(get_session),
     _: dict = Depends(require_admin)
 ):
     """批量刷新头像：
     - 加载所有成员
     - 解密UIN
-    - AvatarService 批量下载保存
+    - AvatarService 按优先级增量刷新
     - 返回统计结果
     """
     try:
@@ -317,12 +369,16 @@ async def refresh_all_member_avatars(
                 # 解密失败跳过该成员
                 continue
 
-        # 批量下载
-        stats = await AvatarService.batch_fetch_and_save_avatars_webp(uins)
+        # 增量刷新
+        stats = await AvatarService.batch_fetch_and_save_avatars_webp(uins, force=force, limit=limit)
+        unchanged = stats.get("not_modified", 0) + stats.get("unchanged", 0)
 
         return ApiResponse(
             success=True,
-            message=f"头像刷新完成：成功 {stats.get('success', 0)}，失败 {stats.get('failed', 0)}，共 {stats.get('total', 0)}",
+            message=(
+                f"头像刷新完成：更新 {stats.get('updated', 0)}，未变化 {unchanged}，"
+                f"失败 {stats.get('failed', 0)}，跳过 {stats.get('skipped', 0)}，共 {stats.get('total', 0)}"
+            ),
             data=stats
         )
     except Exception as e:
@@ -403,7 +459,6 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 from fastapi import UploadFile, File
 from utils.avatar import AvatarService
-from utils.qq_group.fetcher import fetch_members, QQGroupFetcherError
 
 
 class QQImportParams(BaseModel):
@@ -496,6 +551,9 @@ async def import_members_from_qq(
     _: dict = Depends(require_admin)
 ):
     """通过QQ群抓取后导入（迁移自 admin）"""
+    # 按需导入：抓取依赖 httpx，不在启动时加载
+    from utils.qq_group.fetcher import fetch_members, QQGroupFetcherError
+
     try:
         raw = await fetch_members(
             group_id=params.group_id,
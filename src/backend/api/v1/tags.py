@@ -0,0 +1,54 @@
+"""
+标签聚合API路由
+"""
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from services.deps import get_session, get_read_session
+from services.auth.utils import require_admin
+from services.database.models.tag_count.base import TAG_SCOPES
+from services.database.models.tag_count.crud import TagCountCRUD
+from schema.tag import TagFacetItem, TagFacetResponse
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+TagScope = Literal["daily_posts", "activities"]
+
+
+@router.get(
+    "",
+    response_model=TagFacetResponse,
+    summary="获取标签聚合",
+    description="按使用次数倒序返回标签及计数（日常动态只统计已发布的帖子），数据来自增量维护的 tag_counts 表"
+)
+async def get_tag_facets(
+    scope: TagScope = Query("daily_posts", description="作用域：daily_posts / activities"),
+    limit: int = Query(50, ge=1, le=200, description="返回的标签数"),
+    prefix: Optional[str] = Query(None, max_length=100, description="标签前缀过滤"),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """获取标签聚合（标签云）"""
+    rows = await TagCountCRUD.list_top(session, scope, limit=limit, prefix=prefix)
+    return TagFacetResponse(
+        scope=scope,
+        tags=[TagFacetItem(tag=row.tag, count=row.count) for row in rows],
+    )
+
+
+@router.post(
+    "/rebuild",
+    summary="重建标签计数",
+    description="按源表全量重算标签计数（迁移已回填，通常无需调用；用于手工修复数据后校正）"
+)
+async def rebuild_tag_counts(
+    scope: Optional[TagScope] = Query(None, description="作用域，缺省时重建全部"),
+    session: AsyncSession = Depends(get_session),
+    _: dict = Depends(require_admin),
+):
+    """重建标签计数"""
+    try:
+        scopes = [scope] if scope else list(TAG_SCOPES)
+        return {s: await TagCountCRUD.rebuild(session, s) for s in scopes}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"重建标签计数失败: {str(e)}")
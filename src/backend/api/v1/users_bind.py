@@ -78,6 +78,9 @@ async def bind_member(
         await session.rollback()
         raise HTTPException(status_code=409, detail="Binding conflict")
 
+    # 该成员已不可绑定
+    await MemberCRUD.invalidate_bindable_ids()
+
     return {"success": True}
 
 
@@ -96,34 +99,24 @@ async def get_bindable_members(
     session: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_active_user)
 ):
-    """返回未被绑定的成员（未被任何用户占用），分页返回精简字段。"""
-    from sqlmodel import select, func
-    from services.database.models.member.base import Member
-    from services.database.models.user.base import User
+    """返回未被绑定的成员（未被任何用户占用），分页返回精简字段。
 
+    可绑定集合以有序ID数组缓存，分页与总数直接在内存中计算；
+    本页成员的显示名走 member:id 缓存批量获取。
+    """
     if page < 1 or page_size < 1 or page_size > 100:
         raise HTTPException(status_code=400, detail="invalid pagination")
 
-    # 子查询：所有已绑定的 member_id
-    bound_stmt = select(User.member_id).where(User.member_id.is_not(None))
-
-    # 主查询：未绑定成员 + 分页
-    stmt = (
-        select(Member)
-        .where(Member.id.not_in(bound_stmt))
-        .order_by(Member.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-    )
-    members = (await session.exec(stmt)).all()
-
-    # 统计总数（未绑定成员总数）
-    count_stmt = select(func.count()).select_from(Member).where(Member.id.not_in(bound_stmt))
-    total = (await session.exec(count_stmt)).one()
+    bindable_ids = await MemberCRUD.get_bindable_ids(session)
+    total = len(bindable_ids)
+    start = (page - 1) * page_size
+    page_ids = list(bindable_ids[start:start + page_size])
 
+    members = await MemberCRUD.get_many_by_ids(session, page_ids) if page_ids else {}
     items = [
         BindableMemberItem(id=m.id, display_name=m.display_name, avatar_url=f"/api/v1/avatar/{m.id}")
-        for m in members
+        for m in (members.get(member_id) for member_id in page_ids)
+        if m is not None
     ]
 
     return BindableMembersResponse(
@@ -133,4 +126,3 @@ async def get_bindable_members(
         page_size=page_size,
         total_pages=(total + page_size - 1) // page_size,
     )
-
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: how long a fresh uvicorn process takes until it can serve traffic.
+
+Each run spawns `python -m uvicorn main:app` in a new interpreter (so imports, config parsing,
+schema verification and the PBKDF2 key warm-up are all paid again) and measures, from spawn:
+  - live:   first 200 from GET /health (the event loop accepts requests)
+  - ready:  first 200 from GET /ready (lifespan finished and background warm-ups done)
+  - first:  latency of the first real request after ready (--path), which still pays for cold
+            caches, the first pooled DB connections and lazily imported modules
+
+The server uses the current environment / .env, so DATABASE_URL (and REDIS_URL) must point at
+a database already migrated to the Alembic head (DB_SCHEMA_CHECK=verify refuses to start
+otherwise). The step timings reported by /ready are printed for the last run.
+
+Usage:
+    python benchmarks/bench_cold_start.py
+    python benchmarks/bench_cold_start.py --runs 10 --path "/api/v1/members?page=1&page_size=20"
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(client: httpx.Client, url: str, started: float, deadline: float, proc: subprocess.Popen) -> float:
+    """轮询直到 url 返回 200，返回自进程启动起的毫秒数"""
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            if client.get(url).status_code == 200:
+                return (time.perf_counter() - started) * 1000
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(f"{url} not ready before timeout")
+
+
+def run_once(path: str, timeout: float, show_output: bool) -> Dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    output = None if show_output else subprocess.DEVNULL
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND, env=os.environ.copy(), stdout=output, stderr=output,
+    )
+    deadline = started + timeout
+    try:
+        with httpx.Client(base_url=base, timeout=5.0) as client:
+            live_ms = wait_for(client, "/health", started, deadline, proc)
+            ready_ms = wait_for(client, "/ready", started, deadline, proc)
+            report = client.get("/ready").json()
+            t0 = time.perf_counter()
+            status = client.get(path).status_code
+            first_ms = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            client.get(path)
+            second_ms = (time.perf_counter() - t0) * 1000
+    finally:
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    return {
+        "live_ms": live_ms, "ready_ms": ready_ms, "first_ms": first_ms, "second_ms": second_ms,
+        "first_status": status, "steps_ms": report.get("steps_ms", {}),
+    }
+
+
+def describe(values: List[float]) -> str:
+    return f"median {statistics.median(values):8.1f}  min {min(values):8.1f}  max {max(values):8.1f}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/api/v1/members?page=1&page_size=20", help="first request after ready")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for /ready per run")
+    parser.add_argument("--show-output", action="store_true", help="show server stdout/stderr")
+    args = parser.parse_args(argv)
+
+    results = []
+    for i in range(args.runs):
+        r = run_once(args.path, args.timeout, args.show_output)
+        results.append(r)
+        print(f"run {i + 1}: live {r['live_ms']:.1f}ms  ready {r['ready_ms']:.1f}ms  "
+              f"first {r['first_ms']:.1f}ms ({r['first_status']})  second {r['second_ms']:.1f}ms")
+
+    print(f"\n{'':>8}  (ms over {args.runs} runs)")
+    for key in ("live_ms", "ready_ms", "first_ms", "second_ms"):
+        print(f"{key[:-3]:>8}  {describe([r[key] for r in results])}")
+    print(f"\nstartup steps (last run): {results[-1]['steps_ms']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Logging benchmark: avatar-style handler throughput under different logging pipelines.
+
+A throwaway FastAPI app serves a small webp through FileResponse and emits the same pattern of
+log calls as GET /api/v1/avatar/{id} plus CryptoService.decrypt_uin (2 INFO + 8 DEBUG lines per
+request, on the api.v1.avatars / services.crypto.service loggers). Modes:
+  - off:        logging disabled (upper bound)
+  - sync:       StreamHandler + FileHandler on the root logger (the previous setup_logging)
+  - queue:      QueueHandler + writer thread + RotatingFileHandler (utils.log_pipeline)
+  - queue+rate: same, with the default per-module rate limits for the hot loggers
+
+Log files go to a temporary directory; console output is discarded. Local tmpfs writes are
+nearly free, so --disk-latency-ms adds a per-record sleep inside FileHandler.emit to emulate a
+slow or contended disk: in sync mode that stalls the event loop, in queue mode only the writer thread.
+
+Usage:
+    python benchmarks/bench_logging.py --requests 3000 --concurrency 32
+    python benchmarks/bench_logging.py --disk-latency-ms 0.2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import logging
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import httpx
+
+# Ensure backend package imports work when running directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI
+from fastapi.responses import FileResponse
+
+from services.config.service import Settings
+from utils.log_pipeline import get_logging_stats, setup_queue_logging, stop_queue_logging
+
+avatar_log = logging.getLogger("api.v1.avatars")
+crypto_log = logging.getLogger("services.crypto.service")
+
+
+def build_app(avatar_path: Path) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/avatar/{member_id}")
+    async def get_avatar(member_id: int):
+        avatar_log.info(f"[GET_AVATAR] 开始处理头像请求 - member_id: {member_id}")
+        avatar_log.debug(f"[GET_AVATAR] 查询数据库中的成员信息 - member_id: {member_id}")
+        avatar_log.debug(f"[GET_AVATAR] 找到成员 - member_id: {member_id}, display_name: 成员{member_id}")
+        crypto_log.debug("[CRYPTO] 开始解密UIN - salt: 0123456789abcdef")
+        crypto_log.debug("[CRYPTO] 加密数据长度: 64")
+        crypto_log.debug("[CRYPTO] AESGCM实例创建成功")
+        crypto_log.debug("[CRYPTO] UIN解密成功")
+        avatar_log.debug(f"[GET_AVATAR] 头像文件路径: {avatar_path}")
+        avatar_log.debug("[GET_AVATAR] 头像文件存在: True")
+        avatar_log.info(f"[GET_AVATAR] 成功返回头像文件 - member_id: {member_id}")
+        return FileResponse(avatar_path, media_type="image/webp")
+
+    return app
+
+
+def configure(mode: str, log_dir: Path) -> None:
+    root = logging.getLogger()
+    stop_queue_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    logging.disable(logging.NOTSET)
+
+    if mode == "off":
+        logging.disable(logging.CRITICAL)
+        return
+    if mode == "sync":
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        root.setLevel(logging.DEBUG)
+        for handler in (logging.StreamHandler(sys.stdout), logging.FileHandler(log_dir / "app.log", encoding="utf-8")):
+            handler.setFormatter(formatter)
+            root.addHandler(handler)
+        return
+    rate_limits = Settings.model_fields["log_rate_limits"].default if mode == "queue+rate" else None
+    setup_queue_logging(log_dir, logging.DEBUG, rate_limits=rate_limits)
+
+
+async def drive(app: FastAPI, n: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            async with sem:
+                resp = await client.get(f"/api/v1/avatar/{i % 500 + 1}")
+                resp.raise_for_status()
+
+        await one(0)  # warm-up
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n)))
+        return n / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--disk-latency-ms", type=float, default=0.0, help="emulated latency per file write")
+    args = parser.parse_args()
+
+    if args.disk_latency_ms > 0:
+        delay = args.disk_latency_ms / 1000
+        original_emit = logging.FileHandler.emit
+
+        def slow_emit(self, record):
+            time.sleep(delay)
+            original_emit(self, record)
+
+        logging.FileHandler.emit = slow_emit
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        avatar = Path(tmp) / "10001.webp"
+        avatar.write_bytes(b"RIFF" + b"\0" * 4096)
+        app = build_app(avatar)
+        for mode in ("off", "sync", "queue", "queue+rate"):
+            log_dir = Path(tmp) / mode.replace("+", "_")
+            log_dir.mkdir()
+            with redirect_stdout(io.StringIO()):
+                configure(mode, log_dir)
+                rps = asyncio.run(drive(app, args.requests, args.concurrency))
+                dropped = get_logging_stats()["dropped"] if mode.startswith("queue") else 0
+                results[mode] = (rps, dropped)
+                configure("off", log_dir)
+    logging.disable(logging.NOTSET)
+
+    baseline = results["sync"][0]
+    for mode, (rps, dropped) in results.items():
+        print(f"{mode:<11} {rps:8.0f} rps  x{rps / baseline:.2f} vs sync  dropped={dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Member search benchmark (10k members by default).
+
+- trie: build time + per-query latency of the in-memory prefix index (domain/member_search.py)
+- db:   optional, latency of MemberCRUD.search (pg_trgm) against DATABASE_URL when --db is given;
+        the members table must already contain data (e.g. seeded by the benchmark suite)
+
+Usage:
+    python benchmarks/bench_member_search.py --members 10000 --queries 2000
+    python benchmarks/bench_member_search.py --db
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Ensure backend package imports work when running directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from domain.member_search import MemberSearchIndex, MemberSearchRecord, pinyin_available
+
+_SURNAMES = "赵钱孙李周吴郑王冯陈褚卫蒋沈韩杨朱秦尤许何吕施张孔曹严华金魏陶姜"
+_GIVEN = "子涵欣怡梓轩浩宇一诺雨桐思远明哲俊杰嘉懿可馨晨阳若曦天佑梦琪"
+_LATIN = ["alice", "bob", "carol", "dave", "eve", "mallory", "neo", "trinity", "vrc", "div", "kuma", "neko"]
+
+
+def _random_name(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.5:
+        return rng.choice(_SURNAMES) + "".join(rng.choice(_GIVEN) for _ in range(rng.randint(1, 2)))
+    if kind < 0.8:
+        return f"{rng.choice(_LATIN).title()}_{rng.randint(1, 9999)}"
+    return f"{rng.choice(_LATIN)}{rng.choice(_SURNAMES)}{rng.choice(_GIVEN)}"
+
+
+def make_records(n: int, seed: int = 42) -> list[MemberSearchRecord]:
+    rng = random.Random(seed)
+    records = []
+    for i in range(1, n + 1):
+        display = _random_name(rng)
+        records.append(MemberSearchRecord(
+            id=i,
+            display_name=display,
+            group_nick=display if rng.random() < 0.7 else None,
+            qq_nick=_random_name(rng),
+            role=2,
+            join_time=datetime(2020, 1, 1),
+        ))
+    return records
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def bench_trie(records: list[MemberSearchRecord], queries: list[str], limit: int) -> None:
+    started = time.perf_counter()
+    index = MemberSearchIndex.build(records)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    latencies = []
+    hits = 0
+    for q in queries:
+        t0 = time.perf_counter()
+        result = index.search(q, limit)
+        latencies.append((time.perf_counter() - t0) * 1_000_000)
+        hits += bool(result)
+
+    print(f"[trie] members={len(records)} pinyin={pinyin_available()} build={build_ms:.1f}ms")
+    print(
+        f"[trie] queries={len(queries)} hit_rate={hits / len(queries):.2%} "
+        f"mean={statistics.mean(latencies):.1f}us p50={_percentile(latencies, 0.5):.1f}us "
+        f"p99={_percentile(latencies, 0.99):.1f}us"
+    )
+
+
+async def bench_db(queries: list[str], limit: int) -> None:
+    from services.config.factory import ConfigServiceFactory
+    from services.database.factory import DatabaseServiceFactory
+    from services.database.models.member.crud import MemberCRUD
+
+    settings = ConfigServiceFactory().create().get_settings()
+    db = DatabaseServiceFactory().create(settings.database_url)
+    latencies = []
+    try:
+        async with db.with_session() as session:
+            for q in queries:
+                t0 = time.perf_counter()
+                await MemberCRUD.search(session, q, limit)
+                latencies.append((time.perf_counter() - t0) * 1000)
+    finally:
+        await db.teardown()
+    print(
+        f"[db]   queries={len(queries)} mean={statistics.mean(latencies):.2f}ms "
+        f"p50={_percentile(latencies, 0.5):.2f}ms p99={_percentile(latencies, 0.99):.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", action="store_true", help="also benchmark pg_trgm search via DATABASE_URL")
+    args = parser.parse_args()
+
+    records = make_records(args.members, args.seed)
+    rng = random.Random(args.seed + 1)
+    queries = []
+    for _ in range(args.queries):
+        name = rng.choice(records).display_name
+        queries.append(name[: rng.randint(1, max(1, min(4, len(name))))])
+
+    bench_trie(records, queries, args.limit)
+    if args.db:
+        asyncio.run(bench_db(queries, args.limit))
+
+
+if __name__ == "__main__":
+    main()
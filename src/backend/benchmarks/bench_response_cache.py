@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Response cache benchmark: object cache + response_model (before) vs pre-serialized bytes (after).
+
+In-process mode (default) mounts two routes per endpoint shape on a throwaway FastAPI app, both
+served from a warm in-memory cache, and drives them through httpx's ASGI transport:
+  - before: cached Python object returned with response_model (validation + jsonable_encoder)
+  - after:  cached JSON bytes returned via services.cache.response_cache.payload_response
+
+Live mode (--base-url) hits the real endpoints of a running server and reports requests/sec,
+useful to compare two deployments (e.g. before/after this change).
+
+Usage:
+    python benchmarks/bench_response_cache.py --requests 2000
+    python benchmarks/bench_response_cache.py --base-url http://127.0.0.1:8000 --requests 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+# Ensure backend package imports work when running directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI, Request
+
+from schema.activity2 import ActivityListItem, ActivityListOut, RankingOut
+from schema.daily import DailyPostItem
+from services.cache.response_cache import encode_payload, payload_response
+
+LIVE_PATHS = [
+    "/api/v1/members/stats",
+    "/api/v1/daily/trending?limit=12",
+    "/api/v1/activities?status=ongoing&page=1&size=10",
+]
+
+
+def _sample_payloads() -> dict[str, tuple[Any, Any]]:
+    """(response_model, data) per endpoint shape"""
+    stats = {
+        "total_members": 1800,
+        "role_distribution": {"群主": 1, "管理员": 12, "群员": 1787},
+        "join_year_stats": {year: 100 + year % 7 for year in range(2012, 2026)},
+    }
+    trending = [
+        DailyPostItem(
+            id=i,
+            author_user_id=i % 20 + 1,
+            content="今天的活动非常有趣，大家一起玩了很久。" * 8,
+            images=[f"/api/v1/daily/pics/2025/09/{i:016x}.webp"],
+            tags=["日常", "活动"],
+            published=True,
+            likes_count=i * 3,
+            comments_count=i,
+            views_count=i * 50,
+            created_at="2025-09-01T12:00:00",
+            updated_at="2025-09-01T12:00:00",
+            author_display_name=f"成员{i}",
+            author_avatar_url=f"/api/v1/avatar/{i}",
+        )
+        for i in range(1, 13)
+    ]
+    activities = ActivityListOut(
+        items=[
+            ActivityListItem(id=i, type="vote", title=f"活动 {i}", description="投票选出下一次活动主题" * 3,
+                             status="ongoing", creator_id=1)
+            for i in range(1, 11)
+        ],
+        total=42,
+        page=1,
+        size=10,
+    )
+    ranking = {"entries": [{"option_id": i, "label": f"选项 {i}", "votes": 100 - i} for i in range(1, 11)]}
+    return {
+        "member_stats": (None, stats),
+        "trending": (list[DailyPostItem], trending),
+        "activities": (ActivityListOut, activities),
+        "ranking": (RankingOut, ranking),
+    }
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    for name, (model, data) in _sample_payloads().items():
+        object_cache = data
+        bytes_cache = encode_payload(data, compress_min_bytes=1024)
+
+        def _before(obj=object_cache) -> Callable:
+            async def handler() -> Any:
+                return obj
+            return handler
+
+        def _after(payload=bytes_cache) -> Callable:
+            async def handler(request: Request):
+                return payload_response(payload, request)
+            return handler
+
+        app.add_api_route(f"/before/{name}", _before(), response_model=model, methods=["GET"])
+        app.add_api_route(f"/after/{name}", _after(), response_model=model, methods=["GET"])
+    return app
+
+
+async def _drive(client: httpx.AsyncClient, path: str, n: int, concurrency: int, headers: dict) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            resp = await client.get(path, headers=headers)
+            resp.raise_for_status()
+
+    await one()  # warm-up
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return n / (time.perf_counter() - started)
+
+
+async def run_in_process(n: int, concurrency: int) -> None:
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in _sample_payloads():
+            for encoding in ("identity", "gzip"):
+                headers = {"Accept-Encoding": encoding}
+                before = await _drive(client, f"/before/{name}", n, concurrency, headers)
+                after = await _drive(client, f"/after/{name}", n, concurrency, headers)
+                print(f"{name:<13} {encoding:<8} before={before:8.0f} rps  after={after:8.0f} rps  "
+                      f"x{after / before:.2f}")
+
+
+async def run_live(base_url: str, n: int, concurrency: int) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+        for path in LIVE_PATHS:
+            rps = await _drive(client, path, n, concurrency, {"Accept-Encoding": "gzip, br"})
+            print(f"{path:<55} {rps:8.0f} rps")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--base-url", default=None, help="benchmark a running server instead")
+    args = parser.parse_args()
+
+    if args.base_url:
+        asyncio.run(run_live(args.base_url, args.requests, args.concurrency))
+    else:
+        asyncio.run(run_in_process(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite: seeded dataset + hot-endpoint scenarios + regression thresholds.
+
+Runs the real app in-process (lifespan, middleware, caches, database) against a dedicated local
+PostgreSQL database; the database name must contain "bench" because seeding truncates tables.
+The L2 cache defaults to cashews' in-process memory backend (mem://), which stands in for
+fakeredis; pass --redis-url redis://127.0.0.1:6379/15 to measure against a local Redis
+(use a dedicated Redis database: it is flushed at the start of every run).
+
+Commands:
+    seed     generate the dataset for --scale/--seed and load it (plus one avatar file per member)
+    run      reseed (unless --no-seed), run the scenarios, write results JSON, optionally compare
+    compare  compare two result files using benchmarks/suite/thresholds.json
+
+Results default to benchmarks/results/<commit>.json. `run --baseline <file>` (or `compare`)
+exits with status 1 when any threshold is exceeded, so the suite can gate a commit.
+
+Usage:
+    createdb vd_index_bench
+    python benchmarks/bench_suite.py seed --database-url postgresql+asyncpg://u:p@localhost/vd_index_bench
+    python benchmarks/bench_suite.py run --scale medium --requests 500 --concurrency 16 \\
+        --database-url postgresql+asyncpg://u:p@localhost/vd_index_bench \\
+        --baseline benchmarks/results/baseline.json
+    python benchmarks/bench_suite.py compare benchmarks/results/baseline.json benchmarks/results/abc123.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+# Ensure backend package imports work when running directly
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from benchmarks.suite.dataset import SCALES, Dataset, generate, scale_config
+from benchmarks.suite.report import (
+    THRESHOLDS_FILE,
+    build_meta,
+    compare,
+    comparability_warnings,
+    load_json,
+    print_findings,
+    write_result,
+)
+from benchmarks.suite.scenarios import SCENARIO_NAMES, SCENARIOS, BenchContext, request_count, run_scenario
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+WORK_DIR = Path(__file__).resolve().parent / ".bench"
+
+
+def _configure_env(args: argparse.Namespace) -> None:
+    """应用配置在导入 main 时读取，需在导入前写入环境变量"""
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["REDIS_URL"] = args.redis_url
+    os.environ["AVATAR_ROOT"] = str(WORK_DIR / "avatars")
+    # 与生产一致：非调试模式（INFO 日志、无 traceback 响应）
+    os.environ.setdefault("DEBUG", "false")
+
+
+def _import_app():
+    import main
+    from utils.log_pipeline import setup_queue_logging
+
+    # 日志只写文件，避免控制台输出干扰结果
+    settings = main.settings
+    setup_queue_logging(
+        WORK_DIR / "logs",
+        logging.DEBUG if settings.debug else logging.INFO,
+        max_bytes=settings.log_max_bytes,
+        backup_count=settings.log_backup_count,
+        queue_size=settings.log_queue_size,
+        sampling=settings.log_sampling,
+        rate_limits=settings.log_rate_limits,
+        console=False,
+    )
+    return main.app
+
+
+def _dataset(args: argparse.Namespace) -> Dataset:
+    config = scale_config(
+        args.scale,
+        seed=args.seed,
+        members=args.members,
+        daily_posts=args.daily_posts,
+        member_comments=args.member_comments,
+    )
+    return generate(config)
+
+
+async def _seed(dataset: Dataset) -> dict:
+    from services.deps import get_auth_service, get_crypto_service, session_scope
+    from benchmarks.suite.loader import load_dataset, write_avatars
+
+    async with session_scope() as session:
+        loaded = await load_dataset(session, dataset, get_crypto_service(), get_auth_service())
+    loaded["avatars"] = write_avatars(dataset, WORK_DIR / "avatars")
+    return loaded
+
+
+async def cmd_seed(args: argparse.Namespace) -> int:
+    app = _import_app()
+    dataset = _dataset(args)
+    async with app.router.lifespan_context(app):
+        loaded = await _seed(dataset)
+    print(f"seeded {dataset.config.fingerprint()} in {loaded['seconds']}s: {loaded['rows']}")
+    return 0
+
+
+def _selected(names: Optional[str]) -> List:
+    if not names:
+        return SCENARIOS
+    wanted = [n.strip() for n in names.split(",") if n.strip()]
+    unknown = set(wanted) - set(SCENARIO_NAMES)
+    if unknown:
+        raise SystemExit(f"unknown scenarios: {', '.join(sorted(unknown))} (available: {', '.join(SCENARIO_NAMES)})")
+    return [s for s in SCENARIOS if s.name in wanted]
+
+
+async def cmd_run(args: argparse.Namespace) -> int:
+    from cashews import cache as C
+
+    app = _import_app()
+    dataset = _dataset(args)
+    scenarios = _selected(args.scenarios)
+    results = {}
+
+    async with app.router.lifespan_context(app):
+        from services.deps import get_auth_service
+
+        if not args.no_seed:
+            loaded = await _seed(dataset)
+            print(f"seeded {dataset.config.fingerprint()} in {loaded['seconds']}s")
+        await C.clear()
+
+        auth_service = get_auth_service()
+        tokens = {u["id"]: auth_service.create_access_token({"sub": u["username"]}) for u in dataset.users}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=60) as client:
+            ctx = BenchContext(client=client, dataset=dataset, rng=random.Random(args.seed), tokens=tokens)
+            for scenario in scenarios:
+                n = request_count(scenario, args.requests)
+                stats = await run_scenario(ctx, scenario, n, args.concurrency)
+                results[scenario.name] = {"description": scenario.description, **stats.summary()}
+                r = results[scenario.name]
+                print(
+                    f"{scenario.name:<16} n={r['count']:<5} err={r['errors']:<3} rps={r['rps']:<8} "
+                    f"p50={r['p50_ms']:.2f}ms p95={r['p95_ms']:.2f}ms p99={r['p99_ms']:.2f}ms "
+                    f"sql/op={r['sql_per_op']}"
+                )
+
+    result = {
+        "meta": build_meta(
+            BACKEND,
+            scale=args.scale,
+            seed=args.seed,
+            dataset_fingerprint=dataset.config.fingerprint(),
+            dataset=dataset.counts(),
+            requests=args.requests,
+            concurrency=args.concurrency,
+            cache_backend=args.redis_url.split("://", 1)[0],
+        ),
+        "scenarios": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{result['meta']['commit']}.json"
+    write_result(output, result)
+    print(f"results written to {output}")
+
+    thresholds = load_json(Path(args.thresholds))
+    baseline = load_json(Path(args.baseline)) if args.baseline else None
+    warnings = comparability_warnings(result, baseline) if baseline else []
+    return print_findings(compare(result, baseline, thresholds), warnings)
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    baseline, current = load_json(Path(args.baseline)), load_json(Path(args.current))
+    thresholds = load_json(Path(args.thresholds))
+    return print_findings(compare(current, baseline, thresholds), comparability_warnings(current, baseline))
+
+
+def _add_dataset_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--members", type=int, help="override the member count of --scale")
+    p.add_argument("--daily-posts", type=int, help="override the daily post count of --scale")
+    p.add_argument("--member-comments", type=int, help="override the member wall comment count of --scale")
+    p.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL", ""),
+                   help="dedicated benchmark database (default: $BENCH_DATABASE_URL)")
+    p.add_argument("--allow-any-db", action="store_true", help="skip the 'bench' database name check")
+    p.add_argument("--redis-url", default=os.environ.get("BENCH_REDIS_URL", "mem://"),
+                   help="L2 cache backend (default: mem://, in-process)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_seed = sub.add_parser("seed", help="generate and load the dataset")
+    _add_dataset_args(p_seed)
+
+    p_run = sub.add_parser("run", help="run the scenarios and write results JSON")
+    _add_dataset_args(p_run)
+    p_run.add_argument("--no-seed", action="store_true", help="reuse the data already loaded (same --scale/--seed)")
+    p_run.add_argument("--scenarios", help=f"comma-separated subset of: {', '.join(SCENARIO_NAMES)}")
+    p_run.add_argument("--requests", type=int, default=500, help="requests per scenario (scaled by its weight)")
+    p_run.add_argument("--concurrency", type=int, default=16)
+    p_run.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    p_run.add_argument("--baseline", help="result file to compare against")
+    p_run.add_argument("--thresholds", default=str(THRESHOLDS_FILE))
+
+    p_cmp = sub.add_parser("compare", help="compare two result files")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--thresholds", default=str(THRESHOLDS_FILE))
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        raise SystemExit(cmd_compare(args))
+
+    from benchmarks.suite.loader import check_bench_database
+
+    if not args.database_url:
+        parser.error("--database-url (or BENCH_DATABASE_URL) is required")
+    check_bench_database(args.database_url, args.allow_any_db)
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    _configure_env(args)
+    os.chdir(BACKEND)
+    command = cmd_seed if args.command == "seed" else cmd_run
+    raise SystemExit(asyncio.run(command(args)))
+
+
+if __name__ == "__main__":
+    main()
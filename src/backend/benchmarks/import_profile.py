@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the application entry point.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter (several times, keeping the
+fastest run so disk cache noise does not dominate) and reports:
+  - total wall time of the import and the sum reported by -X importtime
+  - top modules by cumulative time (what pulling in a module costs, children included)
+  - top modules by self time (module body execution, e.g. FastAPI route/dependency analysis)
+  - self time grouped by top-level package (fastapi, sqlalchemy, PIL, ...)
+  - which of a watch list of heavy optional modules (PIL, alembic, httpx, ...) got imported
+
+`--budget-ms` exits with status 1 when the import takes longer, `--forbid` fails when a module
+that should be imported lazily shows up (e.g. `--forbid PIL --forbid alembic`).
+
+Usage:
+    python benchmarks/import_profile.py
+    python benchmarks/import_profile.py --runs 5 --top 30 --json benchmarks/results/import-profile.json
+    python benchmarks/import_profile.py --forbid PIL --forbid alembic --budget-ms 2500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# 启动时不应加载、仅在具体功能中按需导入的模块
+WATCH_MODULES = ("PIL", "alembic", "httpx", "pypinyin", "brotli", "uvicorn", "tenacity")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_once(module: str) -> Tuple[float, List[Tuple[str, int, int, int]]]:
+    """返回 (wall 秒, [(模块, self µs, cumulative µs, 深度)])"""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": os.environ.get("PYTHONDONTWRITEBYTECODE", "")}
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.strip().splitlines()[-15:])
+        raise SystemExit(f"import {module} failed:\n{tail}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return wall, rows
+
+
+def summarize(rows: List[Tuple[str, int, int, int]], top: int) -> Dict:
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    loaded = {name for name, *_ in rows}
+    root = max(rows, key=lambda r: r[2]) if rows else ("", 0, 0, 0)
+    return {
+        "importtime_ms": round(root[2] / 1000, 1),
+        "modules": len(rows),
+        "top_cumulative": [
+            {"module": n, "cumulative_ms": round(c / 1000, 1), "self_ms": round(s / 1000, 1)}
+            for n, s, c, _ in sorted(rows, key=lambda r: -r[2])[:top]
+        ],
+        "top_self": [
+            {"module": n, "self_ms": round(s / 1000, 1)} for n, s, _, _ in sorted(rows, key=lambda r: -r[1])[:top]
+        ],
+        "by_package": {
+            k: round(v / 1000, 1) for k, v in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]
+        },
+        "watched": {m: any(n == m or n.startswith(m + ".") for n in loaded) for m in WATCH_MODULES},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters; the fastest run is reported")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", help="also write the report as JSON")
+    parser.add_argument("--budget-ms", type=float, help="fail when the wall time exceeds this")
+    parser.add_argument("--forbid", action="append", default=[], help="fail when this module gets imported")
+    args = parser.parse_args()
+
+    runs = [run_once(args.module) for _ in range(max(1, args.runs))]
+    wall, rows = min(runs, key=lambda r: r[0])
+    report = {"module": args.module, "wall_ms": round(wall * 1000, 1),
+              "wall_ms_runs": [round(w * 1000, 1) for w, _ in runs], **summarize(rows, args.top)}
+
+    print(f"import {args.module}: wall {report['wall_ms']}ms (runs: {report['wall_ms_runs']}), "
+          f"importtime {report['importtime_ms']}ms, {report['modules']} modules")
+    print("\ncumulative ms   self ms  module")
+    for r in report["top_cumulative"]:
+        print(f"{r['cumulative_ms']:>13}  {r['self_ms']:>8}  {r['module']}")
+    print("\n  self ms  module")
+    for r in report["top_self"]:
+        print(f"{r['self_ms']:>9}  {r['module']}")
+    print("\n  self ms  package")
+    for name, ms in report["by_package"].items():
+        print(f"{ms:>9}  {name}")
+    print("\nwatched: " + ", ".join(f"{m}={'loaded' if v else 'lazy'}" for m, v in report["watched"].items()))
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    loaded_packages = {name.split(".")[0] for name, *_ in rows}
+    failures = [f"{m} imported at startup" for m in args.forbid if m in loaded_packages]
+    if args.budget_ms is not None and report["wall_ms"] > args.budget_ms:
+        failures.append(f"wall {report['wall_ms']}ms > budget {args.budget_ms}ms")
+    for f in failures:
+        print(f"FAIL: {f}")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Access-log workload capture and replay.
+
+capture  parse nginx (logs/access.log) or uvicorn access logs into an anonymized workload file
+         (JSON lines): ids become keyed pseudonyms, client data is dropped, and each request is
+         classified with the app's route table (api/router.py).
+replay   send the workload to a local instance, keeping the original inter-arrival times
+         (--speed 2 = twice as fast, --speed 0 = as fast as --max-inflight allows). Only GET/HEAD
+         are replayed (logs carry no request bodies); pseudonymous ids are mapped onto ids that
+         exist locally (defaults follow the bench_suite dataset of --scale, override with --id-max).
+         Latency distribution, error rate and status codes are recorded per route.
+compare  compare two replay results (e.g. two builds) with benchmarks/suite/thresholds.json;
+         exits with status 1 on regression.
+
+Usage:
+    python benchmarks/replay_access_log.py capture ../../logs/access.log -o benchmarks/.bench/prod.workload.jsonl
+    python benchmarks/replay_access_log.py replay benchmarks/.bench/prod.workload.jsonl \\
+        --base-url http://127.0.0.1:8000 --speed 2 -o benchmarks/results/replay-main.json
+    python benchmarks/replay_access_log.py compare benchmarks/results/replay-main.json benchmarks/results/replay-branch.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import httpx
+
+# Ensure backend package imports work when running directly
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from benchmarks.suite.dataset import SCALES
+from benchmarks.suite.report import (
+    THRESHOLDS_FILE,
+    ScenarioStats,
+    build_meta,
+    compare,
+    comparability_warnings,
+    load_json,
+    print_findings,
+    sql_count_from_server_timing,
+    write_result,
+)
+from benchmarks.suite.workload import (
+    STATIC_ROUTE,
+    UNMATCHED_ROUTE,
+    Anonymizer,
+    IdMapper,
+    RouteClassifier,
+    WorkloadEntry,
+    capture,
+    read_workload,
+    write_workload,
+)
+
+REPLAY_METHODS = {"GET", "HEAD"}
+
+
+def _lines(paths: List[str]) -> Iterator[str]:
+    for p in paths:
+        opener = gzip.open if p.endswith(".gz") else open
+        with opener(p, "rt", encoding="utf-8", errors="replace") as f:
+            yield from f
+
+
+def cmd_capture(args: argparse.Namespace) -> int:
+    entries, stats = capture(_lines(args.logs), RouteClassifier(), Anonymizer(), args.default_interval)
+    write_workload(Path(args.output), entries)
+    routes = Counter(f"{e.method} {e.route}" for e in entries)
+    span = entries[-1].t if entries else 0.0
+    print(f"captured {stats.get('total', 0)} requests over {span:.0f}s -> {args.output} ({stats})")
+    for route, n in routes.most_common(args.top):
+        print(f"{n:>8}  {route}")
+    return 0
+
+
+def _id_max(args: argparse.Namespace) -> Dict[str, int]:
+    config = SCALES[args.scale]
+    id_max = {
+        "member_id": config.members,
+        "user_id": config.users,
+        "post_id": config.daily_posts,
+        "comment_id": config.member_comments,
+        "activity_id": min(config.activities, config.vote_activities),
+        "option_id": config.vote_activities * config.options_per_vote,
+    }
+    for item in args.id_max or []:
+        name, _, value = item.partition("=")
+        id_max[name] = int(value)
+    return id_max
+
+
+def _workload_digest(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=6).hexdigest()
+
+
+async def _replay(args: argparse.Namespace, entries: List[WorkloadEntry], mapper: IdMapper) -> dict:
+    per_route: Dict[str, ScenarioStats] = {}
+    original: Dict[str, ScenarioStats] = {}
+    lags: List[float] = []
+    sem = asyncio.Semaphore(args.max_inflight)
+    headers = {"Authorization": f"Bearer {args.bearer}"} if args.bearer else {}
+    loop = asyncio.get_running_loop()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, headers=headers) as client:
+
+        async def send(entry: WorkloadEntry) -> None:
+            key = f"{entry.method} {entry.route}"
+            t0 = time.perf_counter()
+            sql_count = None
+            try:
+                resp = await client.request(entry.method, mapper.url(entry))
+                status = resp.status_code
+                sql_count = sql_count_from_server_timing(resp.headers.get("server-timing"))
+            except httpx.HTTPError:
+                status = None
+            finally:
+                sem.release()
+            per_route.setdefault(key, ScenarioStats()).observe((time.perf_counter() - t0) * 1000, status, sql_count)
+
+        tasks = []
+        started = loop.time()
+        for entry in entries:
+            if args.speed > 0:
+                due = started + entry.t / args.speed
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await sem.acquire()
+            if args.speed > 0:
+                # 并发上限或事件循环繁忙导致的发送延迟：越大说明回放越偏离原始到达节奏
+                lags.append(max(0.0, loop.time() - due) * 1000)
+            tasks.append(asyncio.create_task(send(entry)))
+            if entry.request_time_ms is not None:
+                original.setdefault(f"{entry.method} {entry.route}", ScenarioStats()).observe(
+                    entry.request_time_ms, entry.status
+                )
+        await asyncio.gather(*tasks)
+        wall = loop.time() - started
+
+    for stats in per_route.values():
+        stats.wall_seconds = wall
+    lags.sort()
+    return {
+        "scenarios": {k: per_route[k].summary() for k in sorted(per_route)},
+        "original": {k: original[k].summary() for k in sorted(original)},
+        "replay": {
+            "sent": len(tasks),
+            "wall_seconds": round(wall, 2),
+            "lag_p50_ms": round(lags[len(lags) // 2], 2) if lags else None,
+            "lag_p95_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 2) if lags else None,
+        },
+    }
+
+
+def cmd_replay(args: argparse.Namespace) -> int:
+    workload = Path(args.workload)
+    all_entries = list(read_workload(workload))
+    skipped = Counter()
+    entries = []
+    for e in all_entries:
+        if args.duration and e.t > args.duration:
+            break
+        if e.method not in REPLAY_METHODS:
+            skipped["method"] += 1
+        elif e.route == UNMATCHED_ROUTE:
+            skipped["unmatched"] += 1
+        elif e.route == STATIC_ROUTE and not args.include_static:
+            skipped["static"] += 1
+        else:
+            entries.append(e)
+    if args.limit:
+        entries = entries[:args.limit]
+    if not entries:
+        raise SystemExit("nothing to replay")
+
+    mapper = IdMapper(all_entries, _id_max(args))
+    span = entries[-1].t / args.speed if args.speed > 0 else 0
+    print(f"replaying {len(entries)} requests (skipped {dict(skipped)}) against {args.base_url}"
+          + (f", ~{span:.0f}s at x{args.speed:g}" if span else ", unthrottled"))
+    result = asyncio.run(_replay(args, entries, mapper))
+    result["replay"]["skipped"] = dict(skipped)
+    result["meta"] = build_meta(
+        BACKEND,
+        label=args.label,
+        base_url=args.base_url,
+        workload=_workload_digest(workload),
+        speed=args.speed,
+        max_inflight=args.max_inflight,
+        scale=args.scale,
+    )
+    result = {"meta": result.pop("meta"), **result}
+
+    for route, r in result["scenarios"].items():
+        print(
+            f"{r['count']:>6}  err={r['error_rate']:<6} p50={r['p50_ms']:>8.2f}ms p95={r['p95_ms']:>8.2f}ms "
+            f"p99={r['p99_ms']:>8.2f}ms  {route}"
+        )
+    print(f"replay: {result['replay']}")
+    if args.output:
+        write_result(Path(args.output), result)
+        print(f"results written to {args.output}")
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    baseline, current = load_json(Path(args.baseline)), load_json(Path(args.current))
+    thresholds = load_json(Path(args.thresholds))
+    # 回放按原始节奏发送，吞吐由负载决定而非被测构建，不做 rps 检查；低频路由样本太少，分位数没有意义
+    thresholds["defaults"] = {**thresholds.get("defaults", {}), "min_count": args.min_count, "rps_regression_pct": None}
+    return print_findings(compare(current, baseline, thresholds), comparability_warnings(current, baseline))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_cap = sub.add_parser("capture", help="parse access logs into an anonymized workload")
+    p_cap.add_argument("logs", nargs="+", help="nginx or uvicorn access logs (.gz supported)")
+    p_cap.add_argument("-o", "--output", required=True)
+    p_cap.add_argument("--default-interval", type=float, default=0.1,
+                       help="spacing for log lines without timestamps (seconds)")
+    p_cap.add_argument("--top", type=int, default=20, help="routes to list after capture")
+
+    p_rep = sub.add_parser("replay", help="replay a workload against a local instance")
+    p_rep.add_argument("workload")
+    p_rep.add_argument("--base-url", default="http://127.0.0.1:8000")
+    p_rep.add_argument("--speed", type=float, default=1.0, help="time multiplier; 0 = unthrottled")
+    p_rep.add_argument("--max-inflight", type=int, default=256)
+    p_rep.add_argument("--timeout", type=float, default=30.0)
+    p_rep.add_argument("--duration", type=float, help="only replay the first N seconds of the workload")
+    p_rep.add_argument("--limit", type=int, help="only replay the first N requests")
+    p_rep.add_argument("--include-static", action="store_true")
+    p_rep.add_argument("--scale", choices=sorted(SCALES), default="medium",
+                       help="bench_suite dataset loaded locally (sets default id ranges)")
+    p_rep.add_argument("--id-max", action="append", metavar="PARAM=N", help="e.g. member_id=1800")
+    p_rep.add_argument("--bearer", help="access token sent with every request")
+    p_rep.add_argument("--label", help="build label stored in the result meta")
+    p_rep.add_argument("-o", "--output")
+
+    p_cmp = sub.add_parser("compare", help="compare two replay results")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--thresholds", default=str(THRESHOLDS_FILE))
+    p_cmp.add_argument("--min-count", type=int, default=20, help="skip routes with fewer samples")
+
+    args = parser.parse_args()
+    handler = {"capture": cmd_capture, "replay": cmd_replay, "compare": cmd_compare}[args.command]
+    raise SystemExit(handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""
+Reproducible benchmark suite (see benchmarks/bench_suite.py).
+
+- dataset:   deterministic, seeded generator of members, activities, daily posts, comments and votes
+- loader:    writes a dataset into a dedicated PostgreSQL database (tables are truncated first)
+- scenarios: hot endpoints driven in-process through the full middleware stack
+- report:    latency/SQL statistics, JSON result files and regression checks against a baseline
+"""
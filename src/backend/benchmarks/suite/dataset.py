@@ -0,0 +1,324 @@
+"""
+Seeded dataset generator.
+
+Everything is derived from a single random.Random(seed), so the same SeedConfig always yields
+the same rows (ids, names, participant lists, comment trees, vote distribution). Rows are plain
+dicts keyed by column name with explicit primary keys, ready for executemany inserts; member rows
+carry the plaintext `uin`, which the loader encrypts.
+
+Popularity is skewed on purpose (Zipf-like weights): a few members collect most wall comments
+and a few options most votes, which is what the hot paths see in production.
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import random
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Sequence
+
+Row = Dict[str, Any]
+
+EPOCH = datetime(2024, 1, 1, 8, 0, 0)
+
+_SURNAMES = "赵钱孙李周吴郑王冯陈褚卫蒋沈韩杨朱秦尤许何吕施张孔曹严华金魏陶姜"
+_GIVEN = "子涵欣怡梓轩浩宇一诺雨桐思远明哲俊杰嘉懿可馨晨阳若曦天佑梦琪"
+_LATIN = ["alice", "bob", "carol", "dave", "eve", "mallory", "neo", "trinity", "vrc", "div", "kuma", "neko"]
+_WORDS = [
+    "今天", "一起", "开黑", "世界", "地图", "合影", "活动", "周末", "夜跑", "音乐会",
+    "新人", "欢迎", "截图", "模型", "上传", "好耶", "辛苦了", "下次", "再来", "打卡",
+    "VRChat", "Quest", "avatar", "world", "party", "photo", "event", "cute", "GG", "nice",
+]
+_TAGS = ["日常", "合影", "活动", "音乐", "舞蹈", "摄影", "新人", "世界推荐", "模型", "闲聊", "夜谈", "游戏"]
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    seed: int = 42
+    members: int = 2000
+    users: int = 500                      # bound accounts (voters / daily authors), users[i] -> members[i]
+    activities: int = 100                 # star-calendar activities
+    max_participants: int = 1500          # participant_ids length is drawn up to this
+    daily_posts: int = 1000
+    comments_per_post: int = 8            # mean; nested replies are part of this count
+    reply_ratio: float = 0.4              # share of daily comments that reply to an earlier one
+    member_comments: int = 20000          # member wall comments (skewed towards popular members)
+    vote_activities: int = 10
+    options_per_vote: int = 40
+    vote_participation: float = 0.6       # share of users that voted in each vote activity
+
+    def fingerprint(self) -> str:
+        """Short stable id of the dataset shape; results are only comparable for equal fingerprints"""
+        raw = json.dumps(asdict(self), sort_keys=True).encode()
+        return hashlib.blake2b(raw, digest_size=6).hexdigest()
+
+
+SCALES: Dict[str, SeedConfig] = {
+    "small": SeedConfig(
+        members=300, users=100, activities=20, max_participants=200, daily_posts=150,
+        member_comments=2000, vote_activities=3, options_per_vote=15,
+    ),
+    "medium": SeedConfig(),
+    "large": SeedConfig(
+        members=20000, users=5000, activities=500, max_participants=10000, daily_posts=10000,
+        member_comments=200000, vote_activities=40, options_per_vote=100,
+    ),
+}
+
+
+def scale_config(scale: str, seed: int = 42, **overrides: Any) -> SeedConfig:
+    return replace(SCALES[scale], seed=seed, **{k: v for k, v in overrides.items() if v is not None})
+
+
+@dataclass
+class Dataset:
+    config: SeedConfig
+    members: List[Row] = field(default_factory=list)
+    users: List[Row] = field(default_factory=list)
+    activities: List[Row] = field(default_factory=list)
+    daily_posts: List[Row] = field(default_factory=list)
+    daily_comments: List[Row] = field(default_factory=list)
+    member_comments: List[Row] = field(default_factory=list)
+    vote_activities: List[Row] = field(default_factory=list)
+    vote_options: List[Row] = field(default_factory=list)
+    vote_records: List[Row] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "members": len(self.members),
+            "users": len(self.users),
+            "activities": len(self.activities),
+            "activity_participants": sum(a["participants_total"] for a in self.activities),
+            "daily_posts": len(self.daily_posts),
+            "daily_comments": len(self.daily_comments),
+            "member_comments": len(self.member_comments),
+            "vote_activities": len(self.vote_activities),
+            "vote_options": len(self.vote_options),
+            "vote_records": len(self.vote_records),
+        }
+
+
+def _name(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.5:
+        return rng.choice(_SURNAMES) + "".join(rng.choice(_GIVEN) for _ in range(rng.randint(1, 2)))
+    if kind < 0.8:
+        return f"{rng.choice(_LATIN).title()}_{rng.randint(1, 9999)}"
+    return f"{rng.choice(_LATIN)}{rng.choice(_SURNAMES)}{rng.choice(_GIVEN)}"
+
+
+def _sentence(rng: random.Random, lo: int, hi: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(lo, hi)))
+
+
+def _at(rng: random.Random, days: int = 600) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(days * 86400))
+
+
+def zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    """Cumulative Zipf weights for rng.choices(cum_weights=...)"""
+    return list(itertools.accumulate(1 / (rank ** s) for rank in range(1, n + 1)))
+
+
+def tiptap_doc(rng: random.Random, images: Sequence[str]) -> Dict[str, Any]:
+    """Tiptap document: a few paragraphs (some with bold/links), images interleaved, optional list"""
+    content: List[Dict[str, Any]] = []
+    paragraphs = rng.randint(1, 4)
+    for i in range(paragraphs):
+        text = [{"type": "text", "text": _sentence(rng, 4, 20)}]
+        if rng.random() < 0.3:
+            text.append({"type": "text", "marks": [{"type": "bold"}], "text": " " + rng.choice(_WORDS)})
+        if rng.random() < 0.15:
+            text.append({
+                "type": "text",
+                "marks": [{"type": "link", "attrs": {"href": "https://vrchat.com/home", "target": "_blank"}}],
+                "text": " link",
+            })
+        content.append({"type": "paragraph", "content": text})
+        if i < len(images):
+            content.append({"type": "image", "attrs": {"src": images[i], "alt": None, "title": None}})
+    for src in images[paragraphs:]:
+        content.append({"type": "image", "attrs": {"src": src, "alt": None, "title": None}})
+    if rng.random() < 0.2:
+        content.append({
+            "type": "bulletList",
+            "content": [
+                {"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": rng.choice(_WORDS)}]}]}
+                for _ in range(rng.randint(2, 5))
+            ],
+        })
+    return {"type": "doc", "content": content}
+
+
+def generate(config: SeedConfig) -> Dataset:
+    rng = random.Random(config.seed)
+    ds = Dataset(config=config)
+
+    # ---- members: unique 9-10 digit UINs, one owner and a handful of admins ----
+    uins = rng.sample(range(100_000_000, 3_999_999_999), config.members)
+    for i, uin in enumerate(uins, start=1):
+        group_nick = _name(rng) if rng.random() < 0.7 else None
+        qq_nick = _name(rng)
+        join_time = _at(rng, 1500)
+        ds.members.append({
+            "id": i,
+            "uin": uin,
+            "display_name": group_nick or qq_nick,
+            "group_nick": group_nick,
+            "qq_nick": qq_nick,
+            "salt": "%032x" % rng.getrandbits(128),
+            "role": 0 if i == 1 else (1 if i <= 1 + config.members // 100 else 2),
+            "join_time": join_time,
+            "last_speak_time": join_time + timedelta(days=rng.randint(0, 300)) if rng.random() < 0.8 else None,
+            "level_point": rng.randint(0, 50000),
+            "level_value": rng.randint(1, 100),
+            "q_age": rng.randint(0, 20),
+            "created_at": join_time,
+            "updated_at": join_time,
+        })
+
+    # ---- users bound to the first N members ----
+    for i in range(1, min(config.users, config.members) + 1):
+        created = _at(rng)
+        ds.users.append({
+            "id": i,
+            "username": f"bench_user_{i}",
+            "password_hash": "",  # filled by the loader (one bcrypt hash shared by all accounts)
+            "is_active": True,
+            "role": "admin" if i == 1 else "viewer",
+            "member_id": i,
+            "created_at": created,
+            "updated_at": created,
+            "last_login": None,
+        })
+    user_ids = [u["id"] for u in ds.users]
+
+    # ---- star-calendar activities with large participant lists ----
+    member_ids = [m["id"] for m in ds.members]
+    for i in range(1, config.activities + 1):
+        total = min(len(member_ids), int(config.max_participants * rng.random() ** 2) + 1)
+        participants = sorted(rng.sample(member_ids, total))
+        date = _at(rng)
+        ds.activities.append({
+            "id": i,
+            "title": f"{rng.choice(_TAGS)}活动 #{i}",
+            "description": _sentence(rng, 5, 30)[:500],
+            "date": date,
+            "tags": rng.sample(_TAGS, rng.randint(1, 3)),
+            "participant_ids": participants,
+            "participants_total": len(participants),
+            "created_at": date,
+            "updated_at": date,
+        })
+
+    # ---- daily posts (tiptap JSON) with nested comments ----
+    comment_id = itertools.count(1)
+    for i in range(1, config.daily_posts + 1):
+        created = _at(rng)
+        images = [
+            f"/api/v1/daily/pics/{created:%Y}/{created:%m}/{rng.getrandbits(64):016x}.webp"
+            for _ in range(rng.choice((0, 1, 1, 2, 3, 6)))
+        ]
+        doc = tiptap_doc(rng, images)
+        first_text = next(
+            (n["content"][0]["text"] for n in doc["content"] if n["type"] == "paragraph"), ""
+        )
+        post = {
+            "id": i,
+            "author_user_id": rng.choice(user_ids),
+            "content_jsonb": doc,
+            "content": first_text[:2000],
+            "images": images,
+            "tags": rng.sample(_TAGS, rng.randint(0, 3)),
+            "likes_count": int(rng.paretovariate(1.5)) - 1,
+            "comments_count": 0,
+            "views_count": int(rng.paretovariate(1.2) * 20),
+            "published": rng.random() > 0.05,
+            "created_at": created,
+            "updated_at": created,
+        }
+        ds.daily_posts.append(post)
+
+        thread: List[int] = []
+        for _ in range(int(rng.expovariate(1 / config.comments_per_post)) if config.comments_per_post else 0):
+            cid = next(comment_id)
+            at = created + timedelta(minutes=rng.randint(1, 20000))
+            ds.daily_comments.append({
+                "id": cid,
+                "post_id": i,
+                "author_user_id": rng.choice(user_ids),
+                "parent_id": rng.choice(thread) if thread and rng.random() < config.reply_ratio else None,
+                "content": _sentence(rng, 1, 25)[:1000],
+                "likes": int(rng.paretovariate(2)) - 1,
+                "dislikes": 1 if rng.random() < 0.05 else 0,
+                "author_ip": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                "is_deleted": rng.random() < 0.02,
+                "created_at": at,
+                "updated_at": at,
+            })
+            thread.append(cid)
+        post["comments_count"] = len(thread)
+
+    # ---- member wall comments, skewed towards popular members ----
+    popularity = zipf_weights(len(member_ids))
+    shuffled = member_ids[:]
+    rng.shuffle(shuffled)
+    for cid, member_id in enumerate(rng.choices(shuffled, cum_weights=popularity, k=config.member_comments), start=1):
+        at = _at(rng)
+        ds.member_comments.append({
+            "id": cid,
+            "member_id": member_id,
+            "content": _sentence(rng, 1, 20)[:500],
+            "likes": int(rng.paretovariate(2)) - 1,
+            "dislikes": 1 if rng.random() < 0.03 else 0,
+            "is_anonymous": rng.random() < 0.8,
+            "author_ip": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+            "is_deleted": rng.random() < 0.01,
+            "created_at": at,
+            "updated_at": at,
+        })
+
+    # ---- vote activities: options are members, votes follow a Zipf distribution ----
+    option_id = itertools.count(1)
+    record_id = itertools.count(1)
+    for i in range(1, config.vote_activities + 1):
+        created = _at(rng)
+        ds.vote_activities.append({
+            "id": i,
+            "type": "vote",
+            "title": f"{rng.choice(_TAGS)}投票 #{i}",
+            "description": _sentence(rng, 3, 12),
+            "anonymous_allowed": True,
+            "allow_change": True,
+            "starts_at": created,
+            "ends_at": None,
+            "status": "ongoing",
+            "creator_id": 1,
+            "created_at": created,
+        })
+        options = []
+        for member_id in rng.sample(member_ids, min(config.options_per_vote, len(member_ids))):
+            oid = next(option_id)
+            options.append(oid)
+            ds.vote_options.append({
+                "id": oid,
+                "activity_id": i,
+                "label": f"成员 {member_id}",
+                "member_id": member_id,
+                "created_at": created,
+            })
+        weights = zipf_weights(len(options))
+        for voter in user_ids:
+            if rng.random() >= config.vote_participation:
+                continue
+            ds.vote_records.append({
+                "id": next(record_id),
+                "activity_id": i,
+                "option_id": rng.choices(options, cum_weights=weights)[0],
+                "voter_id": voter,
+                "display_anonymous": rng.random() < 0.3,
+                "created_at": created + timedelta(minutes=rng.randint(1, 10000)),
+            })
+    return ds
@@ -0,0 +1,114 @@
+"""
+Dataset loader: truncates the benchmark tables and bulk-inserts a generated Dataset.
+
+Refuses to touch a database whose name does not contain "bench" unless explicitly allowed,
+since every load starts with TRUNCATE ... RESTART IDENTITY CASCADE.
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Iterable, List, Sequence
+from urllib.parse import urlsplit
+
+from sqlalchemy import insert, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from services.database.events_cache import mark_tables_changed
+from services.database.models.activity.base import Activity
+from services.database.models.activity_subsystem.base import (
+    ActActivity,
+    ActAuditLog,
+    ActThreadPost,
+    ActVoteOption,
+    ActVoteRecord,
+)
+from services.database.models.comment.base import Comment
+from services.database.models.daily_post.base import DailyPost
+from services.database.models.daily_post_comment.base import DailyPostComment
+from services.database.models.member.base import Member
+from services.database.models.user.base import User
+
+from .dataset import Dataset, Row
+
+BENCH_PASSWORD = "bench-password"
+CHUNK = 2000
+
+# 插入顺序即外键依赖顺序
+_TABLES = [
+    (Member, "members"),
+    (User, "users"),
+    (Activity, "activities"),
+    (DailyPost, "daily_posts"),
+    (DailyPostComment, "daily_comments"),
+    (Comment, "member_comments"),
+    (ActActivity, "vote_activities"),
+    (ActVoteOption, "vote_options"),
+    (ActVoteRecord, "vote_records"),
+]
+_TRUNCATE_ONLY = [ActThreadPost, ActAuditLog]
+
+# RIFF/WEBP placeholder of a typical avatar size (only served as bytes, never decoded)
+AVATAR_BYTES = b"RIFF" + (6004).to_bytes(4, "little") + b"WEBP" + b"\0" * 6000
+
+
+def database_name(url: str) -> str:
+    return urlsplit(url).path.lstrip("/")
+
+
+def check_bench_database(url: str, allow_any: bool = False) -> None:
+    if not allow_any and "bench" not in database_name(url):
+        raise SystemExit(
+            f"refusing to seed database {database_name(url)!r}: its name must contain 'bench' "
+            "(tables are truncated); pass --allow-any-db to override"
+        )
+
+
+def _chunks(rows: Sequence[Row], size: int) -> Iterable[List[Row]]:
+    for start in range(0, len(rows), size):
+        yield list(rows[start:start + size])
+
+
+def write_avatars(dataset: Dataset, avatar_root: Path) -> int:
+    """One small webp per member, named <uin>.webp like AvatarService writes them"""
+    avatar_root.mkdir(parents=True, exist_ok=True)
+    for m in dataset.members:
+        path = avatar_root / f"{m['uin']}.webp"
+        if not path.exists():
+            path.write_bytes(AVATAR_BYTES)
+    return len(dataset.members)
+
+
+async def load_dataset(session: AsyncSession, dataset: Dataset, crypto_service, auth_service) -> dict:
+    """清空并写入数据集，返回各表行数与耗时"""
+    started = time.perf_counter()
+    tables = [model.__tablename__ for model, _ in _TABLES] + [m.__tablename__ for m in _TRUNCATE_ONLY]
+    await session.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+
+    password_hash = auth_service.get_password_hash(BENCH_PASSWORD)
+    loaded = {}
+    for model, attr in _TABLES:
+        rows: List[Row] = getattr(dataset, attr)
+        if model is Member:
+            rows = [
+                {**{k: v for k, v in r.items() if k != "uin"}, "uin_encrypted": crypto_service.encrypt_uin(r["uin"], r["salt"])}
+                for r in rows
+            ]
+        elif model is User:
+            rows = [{**r, "password_hash": password_hash} for r in rows]
+        for chunk in _chunks(rows, CHUNK):
+            await session.execute(insert(model.__table__), chunk)
+        if rows:
+            # 显式主键插入不会推进序列，之后应用写入需要从 max(id) 继续
+            table = model.__tablename__
+            await session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+            ))
+        loaded[model.__tablename__] = len(rows)
+
+    # Core insert 不经过 ORM flush，需手动登记以触发缓存与 ETag 失效
+    mark_tables_changed(session, *tables)
+    await session.commit()
+    await session.execute(text(f"ANALYZE {', '.join(tables)}"))
+    await session.commit()
+    return {"rows": loaded, "seconds": round(time.perf_counter() - started, 2)}
@@ -0,0 +1,207 @@
+"""
+Result files and regression checks.
+
+A result file is JSON: {"meta": {...commit, dataset fingerprint, run settings...},
+"scenarios": {name: {count, errors, rps, mean_ms, p50_ms, p95_ms, p99_ms, max_ms, sql_per_op}}}.
+
+compare() checks a new result against a baseline using thresholds.json:
+  - latency (p95/p99) may not grow by more than <metric>_regression_pct, and the absolute
+    growth must also exceed min_delta_ms so sub-millisecond jitter never fails a run;
+  - throughput may not drop by more than rps_regression_pct;
+  - SQL statements per operation may not grow by more than sql_per_op_increase (deterministic,
+    so this is the most reliable signal for N+1 regressions);
+  - error rate may not exceed max_error_rate;
+  - optional absolute budgets (p95_ms_max, sql_per_op_max) apply even without a baseline;
+  - scenarios with fewer than min_count samples are skipped (replayed low-traffic routes).
+"""
+from __future__ import annotations
+
+import json
+import platform
+import re
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+THRESHOLDS_FILE = Path(__file__).with_name("thresholds.json")
+
+_SQL_COUNT_RE = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def sql_count_from_server_timing(header: Optional[str]) -> Optional[int]:
+    """Server-Timing 头（metrics_middleware 写入）中的 SQL 语句数"""
+    if not header:
+        return None
+    match = _SQL_COUNT_RE.search(header)
+    return int(match.group(1)) if match else None
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+@dataclass
+class ScenarioStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[str, int] = field(default_factory=dict)
+    sql_counts: List[int] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    def observe(self, latency_ms: float, status: Optional[int], sql_count: Optional[int] = None) -> None:
+        self.latencies_ms.append(latency_ms)
+        key = str(status) if status is not None else "exception"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors += 1
+        if sql_count is not None:
+            self.sql_counts.append(sql_count)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+        count = len(ordered)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+            "rps": round(count / self.wall_seconds, 1) if self.wall_seconds else 0.0,
+            "mean_ms": round(statistics.fmean(ordered), 3) if ordered else 0.0,
+            "p50_ms": round(_percentile(ordered, 0.50), 3),
+            "p95_ms": round(_percentile(ordered, 0.95), 3),
+            "p99_ms": round(_percentile(ordered, 0.99), 3),
+            "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+            "sql_per_op": round(statistics.fmean(self.sql_counts), 2) if self.sql_counts else None,
+        }
+
+
+def git_info(cwd: Path) -> Dict[str, Any]:
+    def _git(*args: str) -> str:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=cwd, capture_output=True, text=True, timeout=10, check=True
+            ).stdout.strip()
+        except Exception:
+            return ""
+
+    return {
+        "commit": _git("rev-parse", "--short=12", "HEAD") or "unknown",
+        "branch": _git("rev-parse", "--abbrev-ref", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def build_meta(cwd: Path, **extra: Any) -> Dict[str, Any]:
+    return {
+        **git_info(cwd),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        **extra,
+    }
+
+
+def write_result(path: Path, result: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, ensure_ascii=False, indent=2, sort_keys=False), encoding="utf-8")
+
+
+def load_json(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _limits(thresholds: Dict[str, Any], scenario: str) -> Dict[str, Any]:
+    return {**thresholds.get("defaults", {}), **thresholds.get("scenarios", {}).get(scenario, {})}
+
+
+@dataclass
+class Finding:
+    scenario: str
+    metric: str
+    baseline: Optional[float]
+    current: Optional[float]
+    limit: str
+    regression: bool
+
+    def describe(self) -> str:
+        mark = "REGRESSION" if self.regression else "ok"
+        base = "-" if self.baseline is None else f"{self.baseline:g}"
+        cur = "-" if self.current is None else f"{self.current:g}"
+        return f"{mark:<10} {self.scenario:<16} {self.metric:<12} {base:>10} -> {cur:<10} ({self.limit})"
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Optional[Dict[str, Any]],
+    thresholds: Dict[str, Any],
+) -> List[Finding]:
+    """对比每个场景的指标，返回所有检查项（regression=True 为超出阈值）"""
+    findings: List[Finding] = []
+    base_scenarios = (baseline or {}).get("scenarios", {})
+    for name, cur in current.get("scenarios", {}).items():
+        limits = _limits(thresholds, name)
+        base = base_scenarios.get(name)
+        if cur.get("count", 0) < limits.get("min_count", 0):
+            continue
+
+        max_error_rate = limits.get("max_error_rate")
+        if max_error_rate is not None:
+            findings.append(Finding(
+                name, "error_rate", base.get("error_rate") if base else None, cur["error_rate"],
+                f"<= {max_error_rate}", cur["error_rate"] > max_error_rate,
+            ))
+        for metric, key in (("p95_ms", "p95_ms_max"), ("sql_per_op", "sql_per_op_max")):
+            budget = limits.get(key)
+            if budget is not None and cur.get(metric) is not None:
+                findings.append(Finding(
+                    name, metric, None, cur[metric], f"budget {budget}", cur[metric] > budget,
+                ))
+
+        if not base:
+            continue
+        min_delta = float(limits.get("min_delta_ms", 0))
+        for metric in ("p95_ms", "p99_ms"):
+            pct = limits.get(f"{metric[:3]}_regression_pct")
+            if pct is None or not base.get(metric):
+                continue
+            allowed = base[metric] * (1 + pct / 100)
+            regressed = cur[metric] > allowed and cur[metric] - base[metric] > min_delta
+            findings.append(Finding(name, metric, base[metric], cur[metric], f"+{pct}%, >{min_delta:g}ms", regressed))
+        pct = limits.get("rps_regression_pct")
+        if pct is not None and base.get("rps"):
+            findings.append(Finding(
+                name, "rps", base["rps"], cur["rps"], f"-{pct}%", cur["rps"] < base["rps"] * (1 - pct / 100),
+            ))
+        increase = limits.get("sql_per_op_increase")
+        if increase is not None and base.get("sql_per_op") is not None and cur.get("sql_per_op") is not None:
+            findings.append(Finding(
+                name, "sql_per_op", base["sql_per_op"], cur["sql_per_op"], f"+{increase:g}",
+                cur["sql_per_op"] > base["sql_per_op"] + increase,
+            ))
+    return findings
+
+
+def comparability_warnings(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """数据集或运行参数不同的结果不可直接对比"""
+    warnings = []
+    cur_meta, base_meta = current.get("meta", {}), baseline.get("meta", {})
+    for key in ("dataset_fingerprint", "workload", "speed", "requests", "concurrency", "cache_backend", "machine"):
+        if cur_meta.get(key) != base_meta.get(key):
+            warnings.append(f"{key} differs: baseline={base_meta.get(key)!r} current={cur_meta.get(key)!r}")
+    return warnings
+
+
+def print_findings(findings: List[Finding], warnings: List[str]) -> int:
+    """打印对比结果，返回进程退出码（有回退为 1）"""
+    for w in warnings:
+        print(f"warning: {w}")
+    for f in findings:
+        print(f.describe())
+    regressions = [f for f in findings if f.regression]
+    print(f"{len(regressions)} regression(s) in {len(findings)} checks")
+    return 1 if regressions else 0
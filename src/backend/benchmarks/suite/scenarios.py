@@ -0,0 +1,229 @@
+"""
+Benchmark scenarios for the hot endpoints.
+
+HTTP scenarios go through httpx.ASGITransport into the real app (all middleware, dependencies,
+caches and the database), so results include routing, serialization and cache layers; the SQL
+statement count per request is read from the Server-Timing header written by metrics_middleware.
+
+qq_import calls the same service functions as POST /members/import (upsert + departures
+reconciliation) without the avatar download step, which would hit qlogo.cn over the network.
+
+Read-only scenarios come first; vote_burst and qq_import write, so they run last and a fresh
+seed is needed before the next run (bench_suite.py run reseeds by default).
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .dataset import Dataset
+from .report import ScenarioStats, sql_count_from_server_timing
+
+API = "/api/v1"
+
+
+@dataclass
+class BenchContext:
+    client: httpx.AsyncClient
+    dataset: Dataset
+    rng: random.Random
+    tokens: Dict[int, str] = field(default_factory=dict)  # user id -> access token
+    state: Dict[str, object] = field(default_factory=dict)
+
+    def hot_member_ids(self, n: int) -> List[int]:
+        """按墙评论数排序的成员（与生产一致：少数成员拥有大部分评论）"""
+        key = f"hot_members:{n}"
+        if key not in self.state:
+            counts: Dict[int, int] = {}
+            for c in self.dataset.member_comments:
+                counts[c["member_id"]] = counts.get(c["member_id"], 0) + 1
+            self.state[key] = [m for m, _ in sorted(counts.items(), key=lambda kv: -kv[1])[:n]]
+        return self.state[key]  # type: ignore[return-value]
+
+
+# 单次操作：返回 (HTTP 状态码, SQL 语句数)；状态码 None 表示异常
+Op = Callable[[BenchContext, int], Awaitable[Tuple[Optional[int], Optional[int]]]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    op: Op
+    weight: float = 1.0                  # fraction of --requests
+    requests: Optional[int] = None       # fixed count, overrides weight
+    concurrency: Optional[int] = None    # None -> --concurrency
+    warmup: int = 5
+    writes: bool = False
+
+
+async def _get(ctx: BenchContext, url: str, **kwargs) -> Tuple[Optional[int], Optional[int]]:
+    resp = await ctx.client.get(url, **kwargs)
+    return resp.status_code, sql_count_from_server_timing(resp.headers.get("server-timing"))
+
+
+async def members_page(ctx: BenchContext, i: int):
+    pages = max(1, -(-len(ctx.dataset.members) // 100))
+    return await _get(ctx, f"{API}/members", params={"page": i % pages + 1, "page_size": 100})
+
+
+async def member_wall(ctx: BenchContext, i: int):
+    hot = ctx.hot_member_ids(50)
+    # 80% 请求落在热门成员，其余随机
+    if hot and ctx.rng.random() < 0.8:
+        member_id = ctx.rng.choice(hot)
+    else:
+        member_id = ctx.rng.randint(1, len(ctx.dataset.members))
+    return await _get(ctx, f"{API}/comments/members/{member_id}/comments", params={"page": 1, "page_size": 20})
+
+
+async def avatar(ctx: BenchContext, i: int):
+    return await _get(ctx, f"{API}/avatar/{ctx.rng.randint(1, len(ctx.dataset.members))}")
+
+
+async def trending(ctx: BenchContext, i: int):
+    return await _get(ctx, f"{API}/daily/trending", params={"limit": 12})
+
+
+async def daily_list(ctx: BenchContext, i: int):
+    return await _get(ctx, f"{API}/daily/posts", params={"page": i % 5 + 1, "page_size": 20})
+
+
+async def daily_list_full(ctx: BenchContext, i: int):
+    # 对照组：完整视图会读取并序列化每条帖子的 Tiptap JSON
+    return await _get(ctx, f"{API}/daily/posts", params={"page": i % 5 + 1, "page_size": 20, "view": "full"})
+
+
+async def daily_comments(ctx: BenchContext, i: int):
+    post = ctx.rng.choice(ctx.dataset.daily_posts)
+    return await _get(ctx, f"{API}/daily/posts/{post['id']}/comments")
+
+
+async def star_calendar(ctx: BenchContext, i: int):
+    pages = max(1, -(-len(ctx.dataset.activities) // 10))
+    return await _get(ctx, f"{API}/star_calendar/activities", params={"page": i % pages + 1, "page_size": 10})
+
+
+async def ranking(ctx: BenchContext, i: int):
+    activity = ctx.rng.choice(ctx.dataset.vote_activities)
+    return await _get(ctx, f"{API}/activities/{activity['id']}/ranking", params={"top": 10})
+
+
+async def vote_burst(ctx: BenchContext, i: int):
+    """所有用户在同一个活动上集中投票/改票（热点行 + 排行榜缓存失效）"""
+    activity_id = ctx.dataset.vote_activities[0]["id"]
+    options = ctx.state.setdefault("burst_options", [
+        o["id"] for o in ctx.dataset.vote_options if o["activity_id"] == activity_id
+    ])
+    user_ids = sorted(ctx.tokens)
+    user_id = user_ids[i % len(user_ids)]
+    resp = await ctx.client.post(
+        f"{API}/activities/{activity_id}/vote",
+        json={"option_id": ctx.rng.choice(options), "display_anonymous": False},  # type: ignore[arg-type]
+        headers={"Authorization": f"Bearer {ctx.tokens[user_id]}"},
+    )
+    return resp.status_code, sql_count_from_server_timing(resp.headers.get("server-timing"))
+
+
+def import_batch(dataset: Dataset, iteration: int, joiners: float = 0.01) -> list:
+    """QQ 群导出格式的成员列表：约 10% 改名，另有约 1% 新入群成员"""
+    from schema.member import ImportMemberRequest
+
+    rng = random.Random(dataset.config.seed * 1000 + iteration)
+    batch = []
+    for m in dataset.members:
+        card = m["group_nick"] or ""
+        if (m["id"] + iteration) % 10 == 0:
+            card = f"{m['display_name']}·{iteration}"
+        last_speak = m["last_speak_time"] + timedelta(days=iteration) if m["last_speak_time"] else None
+        batch.append(ImportMemberRequest(
+            uin=m["uin"],
+            role=m["role"],
+            join_time=int(m["join_time"].timestamp()),
+            last_speak_time=int(last_speak.timestamp()) if last_speak else None,
+            card=card,
+            nick=m["qq_nick"] or "",
+            lv={"point": m["level_point"], "level": m["level_value"]},
+            qage=m["q_age"],
+        ))
+    for _ in range(max(1, int(len(dataset.members) * joiners))):
+        batch.append(ImportMemberRequest(
+            uin=rng.randrange(4_000_000_000, 4_294_967_295),
+            role=2,
+            join_time=int(time.time()),
+            last_speak_time=None,
+            card="",
+            nick=f"new_{rng.getrandbits(24):06x}",
+            lv={"point": 0, "level": 1},
+            qage=0,
+        ))
+    return batch
+
+
+async def qq_import(ctx: BenchContext, i: int):
+    from domain.member_service import MemberService
+    from services.deps import session_scope
+    from services.metrics.service import begin_request_metrics, end_request_metrics
+
+    batch = import_batch(ctx.dataset, i + 1)
+    rm, token = begin_request_metrics()
+    try:
+        async with session_scope() as session:
+            await MemberService.upsert_members_from_json(session, batch)
+            await MemberService.reconcile_departures(session, [m.uin for m in batch])
+    finally:
+        end_request_metrics(token)
+    return 200, rm.sql_count
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("members_page", "GET /members?page_size=100 (member circle)", members_page),
+    Scenario("member_wall", "GET /comments/members/{id}/comments, skewed to popular members", member_wall),
+    Scenario("avatar", "GET /avatar/{id} (decrypt UIN + file response)", avatar, weight=2.0),
+    Scenario("trending", "GET /daily/trending?limit=12", trending),
+    Scenario("daily_list", "GET /daily/posts?page_size=20 (summary view)", daily_list),
+    Scenario("daily_list_full", "GET /daily/posts?page_size=20&view=full (full Tiptap JSON)", daily_list_full,
+             weight=0.5),
+    Scenario("daily_comments", "GET /daily/posts/{id}/comments (nested threads)", daily_comments),
+    Scenario("star_calendar", "GET /star_calendar/activities (large participant lists)", star_calendar),
+    Scenario("ranking", "GET /activities/{id}/ranking?top=10 (vote activities)", ranking),
+    Scenario("vote_burst", "POST /activities/{id}/vote, all users on one activity", vote_burst,
+             concurrency=64, warmup=0, writes=True),
+    Scenario("qq_import", "member upsert + departures for the whole group", qq_import,
+             requests=3, concurrency=1, warmup=0, writes=True),
+]
+
+SCENARIO_NAMES = [s.name for s in SCENARIOS]
+
+
+def request_count(scenario: Scenario, requests: int) -> int:
+    return scenario.requests if scenario.requests is not None else max(1, int(requests * scenario.weight))
+
+
+async def run_scenario(ctx: BenchContext, scenario: Scenario, requests: int, concurrency: int) -> ScenarioStats:
+    """先做少量预热（填充缓存/连接池），再以给定并发执行 requests 次"""
+    for i in range(scenario.warmup):
+        await scenario.op(ctx, -1 - i)
+
+    stats = ScenarioStats()
+    sem = asyncio.Semaphore(scenario.concurrency or concurrency)
+
+    async def one(i: int) -> None:
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                status, sql_count = await scenario.op(ctx, i)
+            except Exception:
+                status, sql_count = None, None
+            stats.observe((time.perf_counter() - t0) * 1000, status, sql_count)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    stats.wall_seconds = time.perf_counter() - started
+    return stats
@@ -0,0 +1,244 @@
+"""
+Access-log workload capture.
+
+parse_line() understands:
+  - nginx `main` log_format (nginx.conf), optionally followed by $request_time
+  - uvicorn access lines as written by utils/log_pipeline ("<asctime> - uvicorn.access - INFO - ...")
+  - bare uvicorn access lines ("INFO:     1.2.3.4:5678 - "GET /x HTTP/1.1" 200 OK"), which carry
+    no timestamp; they are spaced evenly (see capture(default_interval=...))
+
+Each request is classified with the app's own route table (api.router.main_router), matched in
+registration order exactly like Starlette does, so "/api/v1/members/bindable" is not mistaken for
+"/api/v1/members/{member_id}".
+
+Anonymization: client address, user agent, referer and auth data are dropped; id path parameters
+(`id`, `*_id`, `uin`) and free-text query values are replaced with keyed-hash pseudonyms. Other
+path parameters (year/month/filename of daily pictures) are kept. Pseudonyms are stable within a
+capture and shared across routes, so the key distribution (hot members, hot posts) survives, and
+replay maps them onto ids that exist in the local dataset.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import secrets
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+_NGINX_RE = re.compile(
+    r'^(?P<addr>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<target>\S+) [^"]*" '
+    r'(?P<status>\d{3}) (?P<bytes>\d+|-)(?: "[^"]*" "[^"]*"(?: "[^"]*")?)?(?: (?P<rt>\d+(?:\.\d+)?))?'
+)
+_UVICORN_PIPELINE_RE = re.compile(
+    r'^(?P<time>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d+)?) - uvicorn\.access - \w+ - '
+    r'\S+ - "(?P<method>[A-Z]+) (?P<target>\S+) [^"]*" (?P<status>\d{3})'
+)
+_UVICORN_BARE_RE = re.compile(r'^\w+:\s+\S+ - "(?P<method>[A-Z]+) (?P<target>\S+) [^"]*" (?P<status>\d{3})')
+
+# 非标识性的查询参数原样保留，其余值做假名化；鉴权相关参数直接丢弃
+PASS_QUERY_KEYS = {"page", "page_size", "size", "limit", "top", "status", "view", "fields", "sort", "order", "tag"}
+DROP_QUERY_KEYS = {"token", "access_token", "code", "cookie", "bkn", "password"}
+
+UNMATCHED_ROUTE = "<unmatched>"
+STATIC_ROUTE = "<static>"
+
+
+@dataclass
+class AccessRecord:
+    method: str
+    path: str
+    query: str
+    status: int
+    timestamp: Optional[float]              # epoch seconds; None for bare uvicorn lines
+    request_time_ms: Optional[float] = None  # nginx $request_time when logged
+
+
+def _nginx_time(value: str) -> float:
+    return datetime.strptime(value, "%d/%b/%Y:%H:%M:%S %z").timestamp()
+
+
+def _pipeline_time(value: str) -> float:
+    return datetime.strptime(value.split(",")[0], "%Y-%m-%d %H:%M:%S").timestamp()
+
+
+def parse_line(line: str) -> Optional[AccessRecord]:
+    line = line.strip()
+    m = _NGINX_RE.match(line)
+    if m:
+        target = urlsplit(m["target"])
+        return AccessRecord(
+            m["method"], target.path, target.query, int(m["status"]), _nginx_time(m["time"]),
+            float(m["rt"]) * 1000 if m["rt"] else None,
+        )
+    m = _UVICORN_PIPELINE_RE.search(line)
+    if m:
+        target = urlsplit(m["target"])
+        return AccessRecord(m["method"], target.path, target.query, int(m["status"]), _pipeline_time(m["time"]))
+    m = _UVICORN_BARE_RE.match(line)
+    if m:
+        target = urlsplit(m["target"])
+        return AccessRecord(m["method"], target.path, target.query, int(m["status"]), None)
+    return None
+
+
+class RouteClassifier:
+    """用应用自身的路由表把具体路径归类为路由模板，并取出路径参数"""
+
+    def __init__(self, routes: Optional[Iterable[Any]] = None) -> None:
+        if routes is None:
+            from api.router import main_router
+            routes = main_router.routes
+        try:
+            # 新版 FastAPI 的 include_router 为惰性挂载，需展开为带完整前缀的有效路由
+            from fastapi.routing import iter_route_contexts
+            routes = list(iter_route_contexts(list(routes)))
+        except ImportError:
+            routes = list(routes)
+        self._routes = [r for r in routes if getattr(r, "path_regex", None) and getattr(r, "methods", None)]
+
+    def classify(self, method: str, path: str) -> Tuple[str, Dict[str, str]]:
+        lookup = "GET" if method == "HEAD" else method
+        for route in self._routes:
+            m = route.path_regex.match(path)
+            if m and lookup in route.methods:
+                return route.path, m.groupdict()
+        if path.startswith("/api/"):
+            return UNMATCHED_ROUTE, {}
+        return STATIC_ROUTE, {}
+
+
+def is_id_param(name: str) -> bool:
+    return name in ("id", "uin") or name.endswith("_id")
+
+
+class Anonymizer:
+    """带密钥的假名化：同一原值在一次采集中始终得到同一假名，密钥不落盘"""
+
+    def __init__(self, key: Optional[bytes] = None) -> None:
+        self._key = key or secrets.token_bytes(32)
+
+    def pseudonym(self, kind: str, value: str) -> str:
+        return hashlib.blake2b(f"{kind}\0{value}".encode(), key=self._key, digest_size=6).hexdigest()
+
+    def params(self, params: Dict[str, str]) -> Dict[str, str]:
+        return {k: self.pseudonym(f"param:{k}", v) if is_id_param(k) else v for k, v in params.items()}
+
+    def query(self, query: str) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        for k, v in parse_qsl(query, keep_blank_values=True):
+            if k in DROP_QUERY_KEYS:
+                continue
+            out[k] = v if k in PASS_QUERY_KEYS else f"anon_{self.pseudonym('q:' + k, v)}"
+        return out
+
+
+@dataclass
+class WorkloadEntry:
+    t: float                     # seconds since the first captured request
+    method: str
+    route: str                   # route template, e.g. /api/v1/members/{member_id}
+    params: Dict[str, str] = field(default_factory=dict)   # path params (ids as pseudonyms)
+    query: Dict[str, str] = field(default_factory=dict)
+    status: int = 0              # original status
+    request_time_ms: Optional[float] = None  # original latency (nginx only)
+    path: Optional[str] = None   # static paths only (no ids to hide)
+
+
+def capture(
+    lines: Iterable[str],
+    classifier: RouteClassifier,
+    anonymizer: Anonymizer,
+    default_interval: float = 0.1,
+) -> Tuple[List[WorkloadEntry], Dict[str, int]]:
+    """解析日志行并生成匿名化的负载，返回 (entries, 统计)"""
+    stats: Counter = Counter()
+    entries: List[WorkloadEntry] = []
+    origin: Optional[float] = None
+    untimed = 0
+    for line in lines:
+        record = parse_line(line)
+        if record is None:
+            stats["unparsed"] += 1
+            continue
+        if record.timestamp is None:
+            t = untimed * default_interval
+            untimed += 1
+        else:
+            origin = record.timestamp if origin is None else origin
+            t = record.timestamp - origin
+        route, raw_params = classifier.classify(record.method, record.path)
+        stats[route if route in (UNMATCHED_ROUTE, STATIC_ROUTE) else "api"] += 1
+        entries.append(WorkloadEntry(
+            t=t,
+            method=record.method,
+            route=route,
+            params=anonymizer.params(raw_params),
+            query=anonymizer.query(record.query),
+            status=record.status,
+            request_time_ms=record.request_time_ms,
+            path=record.path if route == STATIC_ROUTE else None,
+        ))
+    _spread_within_second(entries)
+    stats["total"] = len(entries)
+    return entries, dict(stats)
+
+
+def _spread_within_second(entries: List[WorkloadEntry]) -> None:
+    """日志时间只精确到秒：同一秒内的请求按日志顺序均匀分布，避免回放时在整秒处突发；
+    随后按时间排序并平移到从 0 开始（nginx 记录的是请求结束时间，可能略有乱序）"""
+    per_second = Counter(int(e.t // 1) for e in entries)
+    seen: Counter = Counter()
+    for e in entries:
+        second = int(e.t // 1)
+        e.t = second + seen[second] / per_second[second]
+        seen[second] += 1
+    entries.sort(key=lambda e: e.t)
+    shift = entries[0].t if entries else 0.0
+    for e in entries:
+        e.t = round(e.t - shift, 3)
+
+
+def write_workload(path: Path, entries: Iterable[WorkloadEntry]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for e in entries:
+            f.write(json.dumps({k: v for k, v in asdict(e).items() if v not in (None, {})}, ensure_ascii=False) + "\n")
+
+
+def read_workload(path: Path) -> Iterator[WorkloadEntry]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield WorkloadEntry(**json.loads(line))
+
+
+class IdMapper:
+    """把假名映射到本地数据集中存在的 ID：按出现频次排名取模，热点键仍是热点键"""
+
+    def __init__(self, entries: Iterable[WorkloadEntry], id_max: Dict[str, int], default_max: int = 100) -> None:
+        freq: Dict[str, Counter] = {}
+        for e in entries:
+            for name, token in e.params.items():
+                if is_id_param(name):
+                    freq.setdefault(name, Counter())[token] += 1
+        self._ids: Dict[Tuple[str, str], int] = {}
+        for name, counter in freq.items():
+            limit = max(1, id_max.get(name, default_max))
+            for rank, (token, _) in enumerate(counter.most_common()):
+                self._ids[(name, token)] = rank % limit + 1
+
+    def url(self, entry: WorkloadEntry) -> str:
+        if entry.path is not None:
+            path = entry.path
+        else:
+            path = entry.route
+            for name, value in entry.params.items():
+                if is_id_param(name):
+                    value = str(self._ids.get((name, value), 1))
+                path = re.sub(r"\{" + re.escape(name) + r"(?::[^}]*)?\}", value, path)
+        return f"{path}?{urlencode(entry.query)}" if entry.query else path
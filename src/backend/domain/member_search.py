@@ -0,0 +1,221 @@
+"""
+成员搜索：内存前缀树（自动补全）+ 拼音无关匹配
+中文注释：数据库侧的模糊搜索由 pg_trgm GIN 索引支撑（见 MemberCRUD.search），
+本模块只负责亚毫秒级的前缀补全；成员表变更后由 events_cache 标记失效，下次查询时惰性重建。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from services.database.models.member.base import Member
+
+try:  # 可选依赖：未安装时仅关闭拼音匹配
+    from pypinyin import lazy_pinyin
+except ImportError:  # pragma: no cover - 取决于部署环境
+    lazy_pinyin = None
+
+logger = logging.getLogger(__name__)
+
+# 命中来源的优先级（越小越靠前）
+TIER_EXACT = 0
+TIER_DISPLAY_PREFIX = 1
+TIER_NICK_PREFIX = 2
+TIER_TOKEN_PREFIX = 3
+TIER_PINYIN_PREFIX = 4
+
+# 每个节点保留的候选数量上限（控制内存，同时足够覆盖单次补全）
+DEFAULT_TOP_K = 50
+
+_CJK_RE = re.compile(r"[㐀-鿿]")
+_TOKEN_SPLIT_RE = re.compile(r"[\s\-_.·,，。|/\\()（）\[\]【】<>《》~!！?？@#&*+=:：;；'\"“”‘’]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """统一全半角/大小写并去掉空白，作为索引与查询的公共形式"""
+    if not text:
+        return ""
+    return "".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def pinyin_available() -> bool:
+    return lazy_pinyin is not None
+
+
+@lru_cache(maxsize=65536)
+def _pinyin_keys_cached(text: str) -> Tuple[str, ...]:
+    # 只转换一次：首字母由全拼音节取首字符得到，与 Style.FIRST_LETTER 结果一致
+    syllables = lazy_pinyin(text, errors="default")
+    full = normalize_text("".join(syllables))
+    initials = normalize_text("".join(s[0] for s in syllables if s))
+    return tuple(k for k in dict.fromkeys((full, initials)) if k)
+
+
+def pinyin_keys(text: Optional[str]) -> List[str]:
+    """中文昵称的拼音键：全拼与首字母（如 张三 -> zhangsan, zs）；未安装 pypinyin 时为空"""
+    if not text or lazy_pinyin is None or not _CJK_RE.search(text):
+        return []
+    return list(_pinyin_keys_cached(text))
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in (normalize_text(p) for p in _TOKEN_SPLIT_RE.split(text)) if t]
+
+
+@dataclass(frozen=True)
+class MemberSearchRecord:
+    """索引内保存的成员精简信息（足以直接构建搜索结果，无需回表）"""
+    id: int
+    display_name: str
+    group_nick: Optional[str]
+    qq_nick: Optional[str]
+    role: int
+    join_time: Optional[datetime]
+
+
+class _TrieNode:
+    __slots__ = ("children", "entries")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        # (tier, key_len, member_id)，构建完成后排序、去重并截断
+        self.entries: List[Tuple[int, int, int]] = []
+
+
+class MemberSearchIndex:
+    """成员前缀树索引
+
+    每个成员以多个键入树：显示名、群昵称、QQ昵称、各自的分词，以及可选的拼音全拼/首字母。
+    每个节点预先保存排好序的 top-k 候选，查询只需沿前缀下行一次。
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K) -> None:
+        self._root = _TrieNode()
+        self._top_k = top_k
+        self._records: Dict[int, MemberSearchRecord] = {}
+        self.built_at: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _insert(self, key: str, tier: int, member_id: int) -> None:
+        node = self._root
+        entry = (tier, len(key), member_id)
+        for ch in key:
+            node = node.children.setdefault(ch, _TrieNode())
+            node.entries.append(entry)
+        # 完整名称命中记为精确匹配；分词/拼音的完整命中仍保留原层级
+        if tier in (TIER_DISPLAY_PREFIX, TIER_NICK_PREFIX):
+            node.entries.append((TIER_EXACT, len(key), member_id))
+
+    def _finalize(self, node: _TrieNode) -> None:
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            current.entries.sort()
+            seen = set()
+            kept: List[Tuple[int, int, int]] = []
+            for entry in current.entries:
+                if entry[2] in seen:
+                    continue
+                seen.add(entry[2])
+                kept.append(entry)
+                if len(kept) >= self._top_k:
+                    break
+            current.entries = kept
+            stack.extend(current.children.values())
+
+    @classmethod
+    def build(cls, records: Iterable[MemberSearchRecord], top_k: int = DEFAULT_TOP_K) -> "MemberSearchIndex":
+        index = cls(top_k=top_k)
+        for rec in records:
+            index._records[rec.id] = rec
+            display = normalize_text(rec.display_name)
+            if display:
+                index._insert(display, TIER_DISPLAY_PREFIX, rec.id)
+            for nick in (rec.group_nick, rec.qq_nick):
+                key = normalize_text(nick)
+                if key and key != display:
+                    index._insert(key, TIER_NICK_PREFIX, rec.id)
+            for raw in {rec.display_name, rec.group_nick or "", rec.qq_nick or ""}:
+                parts = _tokens(raw)
+                if len(parts) > 1:
+                    for token in parts:
+                        index._insert(token, TIER_TOKEN_PREFIX, rec.id)
+                for key in pinyin_keys(raw):
+                    index._insert(key, TIER_PINYIN_PREFIX, rec.id)
+        index._finalize(index._root)
+        index.built_at = time.time()
+        return index
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[MemberSearchRecord, float]]:
+        """前缀查询，返回 [(记录, 分数)]，分数在 (0, 1] 区间，越大越相关"""
+        key = normalize_text(query)
+        if not key:
+            return []
+        node = self._root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        results: List[Tuple[MemberSearchRecord, float]] = []
+        for tier, key_len, member_id in node.entries[:limit]:
+            rec = self._records.get(member_id)
+            if rec is None:
+                continue
+            # 分层给分，同层内键越短（越接近完整匹配）越高
+            score = round((1.0 - 0.15 * tier) * (len(key) / max(key_len, len(key))) ** 0.25, 4)
+            results.append((rec, score))
+        return results
+
+
+# 进程内单例：成员表变更时标记为脏，下次查询惰性重建
+_index: Optional[MemberSearchIndex] = None
+_dirty = True
+_build_lock: Optional[asyncio.Lock] = None
+
+
+def mark_member_search_dirty() -> None:
+    """成员数据变更后调用（由 events_cache 在提交后触发）"""
+    global _dirty
+    _dirty = True
+
+
+async def get_member_search_index(session: AsyncSession) -> MemberSearchIndex:
+    """获取（必要时重建）前缀树索引"""
+    global _index, _dirty, _build_lock
+    if _index is not None and not _dirty:
+        return _index
+    if _build_lock is None:
+        _build_lock = asyncio.Lock()
+    async with _build_lock:
+        if _index is not None and not _dirty:
+            return _index
+        # 先清标记再读库：重建期间的新写入会再次置脏，不会丢失
+        _dirty = False
+        started = time.perf_counter()
+        statement = select(
+            Member.id, Member.display_name, Member.group_nick, Member.qq_nick, Member.role, Member.join_time
+        )
+        try:
+            result = await session.exec(statement)
+            records = [MemberSearchRecord(*row) for row in result.all()]
+            _index = await asyncio.to_thread(MemberSearchIndex.build, records)
+        except Exception:
+            _dirty = True
+            raise
+        logger.info(
+            f"[MEMBER_SEARCH] trie rebuilt: members={len(records)}, pinyin={pinyin_available()}, "
+            f"cost={(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return _index
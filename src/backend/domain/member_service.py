@@ -1,6 +1,7 @@
 """
 成员业务逻辑服务
 """
+import asyncio
 import secrets
 import logging
 from datetime import datetime, timezone
@@ -12,6 +13,8 @@ from services.database.models.base import to_naive_beijing
 
 from services.database.models import ActivityCRUD
 from services.database.models.comment.crud import CommentCRUD
+from services.database.models.user.crud import UserCRUD
+from services.database.events_cache import mark_principals_changed, mark_tables_changed
 from schema.member import MemberResponse, MemberDetailResponse, ImportMemberRequest
 from services.deps import get_crypto_service
 from utils.avatar import AvatarService
@@ -252,7 +255,11 @@ class MemberService:
     @staticmethod
     async def reconcile_departures(session: AsyncSession, latest_uins: List[int]) -> Dict[str, Any]:
         """对比数据库与最新成员UIN列表，清理已退群成员。
-        返回统计信息：{"deleted": n, "details": [...]}。
+
+        批量执行：先一次性算出退群集合，再在同一事务内依次
+        删除评论 -> 剔除活动参与者 -> 解除用户绑定 -> 删除成员，最后统一提交；
+        提交成功后再批量失效 member:id 缓存，并在线程池中删除头像文件。
+        返回统计信息：{"deleted": n, "details": [...]}，details 每项结构与逐个清理时一致。
         """
         logger = logging.getLogger(__name__)
         crypto = get_crypto_service()
@@ -269,73 +276,73 @@ class MemberService:
                 continue
         latest_set = set(int(x) for x in latest_uins if x is not None)
         logger.info(f"[RECONCILE] mapped existing UINs: {len(uin_to_member)}; latest_set size: {len(latest_set)}")
-        departed = [ (u, m) for u, m in uin_to_member.items() if u not in latest_set ]
+        departed = [(u, m.id) for u, m in uin_to_member.items() if u not in latest_set]
         logger.info(f"[RECONCILE] departed candidates: {len(departed)}")
-        details = []
-        for u, m in departed:
-            info = await MemberService._cleanup_member_departure(session, m, u)
-            details.append(info)
-        logger.info(f"[RECONCILE] deleted count: {len(details)}")
-        return {"deleted": len(details), "details": details}
-
-
-    @staticmethod
-    async def _cleanup_member_departure(session: AsyncSession, member: Member, uin: int) -> Dict[str, Any]:
-        """清理退群成员的相关数据并删除成员记录。
-        步骤：删除评论 -> 从所有活动的参与者中移除 -> 删除头像文件 -> 删除成员。
-        """
-        logger = logging.getLogger(__name__)
-        removed = {
-            "member_id": member.id,
-            "uin": uin,
-            "comments_deleted": 0,
-            "activities_updated": 0,
-            "avatar_deleted": False,
-            "member_deleted": False,
-            "errors": []
+        if not departed:
+            return {"deleted": 0, "details": []}
+
+        details: Dict[int, Dict[str, Any]] = {
+            member_id: {
+                "member_id": member_id,
+                "uin": uin,
+                "comments_deleted": 0,
+                "activities_updated": 0,
+                "avatar_deleted": False,
+                "member_deleted": False,
+                "errors": [],
+            }
+            for uin, member_id in departed
         }
-        # 删除评论
-        try:
-            from services.database.models.comment.crud import CommentCRUD
-            deleted_cnt = await CommentCRUD.delete_by_member_id(session, member.id)
-            removed["comments_deleted"] = deleted_cnt
-            logger.info(f"[RECONCILE] member {member.id} comments deleted: {deleted_cnt}")
-        except Exception as e:
-            logger.warning(f"[RECONCILE] delete comments failed for member {member.id}: {e}")
-            removed["errors"].append(f"comments:{e}")
-        # 从活动中移除
-        try:
-            activities = await ActivityCRUD.get_by_participant(session, member.id)
-            count = 0
-            for act in activities:
-                updated = await ActivityCRUD.remove_participant(session, act.id, member.id)
-                if updated:
-                    count += 1
-            removed["activities_updated"] = count
-            logger.info(f"[RECONCILE] member {member.id} removed from activities: {count}")
-        except Exception as e:
-            logger.warning(f"[RECONCILE] remove from activities failed for member {member.id}: {e}")
-            removed["errors"].append(f"activities:{e}")
-        # 删除头像文件
-        try:
-            removed["avatar_deleted"] = AvatarService.delete_avatar_file_by_uin(uin)
-            logger.info(f"[RECONCILE] member {member.id} avatar_deleted={removed['avatar_deleted']}")
-        except Exception as e:
-            logger.warning(f"[RECONCILE] delete avatar failed for member {member.id}: {e}")
-            removed["errors"].append(f"avatar:{e}")
-        # 最后删除成员
+        member_ids = list(details.keys())
+
         try:
-            ok = await MemberCRUD.delete(session, member.id)
-            removed["member_deleted"] = bool(ok)
-            # 二次核验：再查一次
-            try:
-                from services.database.models.member.base import Member as MemberModel
-                check = await session.get(MemberModel, member.id)
-                logger.info(f"[RECONCILE] member {member.id} deleted={ok}, verify_exists={check is not None}")
-            except Exception as e2:
-                logger.warning(f"[RECONCILE] verify after delete failed for member {member.id}: {e2}")
+            comment_counts = await CommentCRUD.delete_by_member_ids(session, member_ids, commit=False)
+            activity_counts = await ActivityCRUD.remove_participants_bulk(session, member_ids, commit=False)
+            unbound_users = await UserCRUD.unbind_members(session, member_ids, commit=False)
+            deleted_ids = await MemberCRUD.delete_many(session, member_ids, commit=False)
+            mark_tables_changed(session, "comments", "activities", "users", "members")
+            mark_principals_changed(session, unbound_users)
+            await session.commit()
         except Exception as e:
-            logger.error(f"[RECONCILE] delete member failed for member {member.id}: {e}")
-            removed["errors"].append(f"member:{e}")
-        return removed
+            await session.rollback()
+            logger.error(f"[RECONCILE] bulk cleanup failed, rolled back {len(member_ids)} members: {e}")
+            for info in details.values():
+                info["errors"].append(f"transaction:{e}")
+            return {"deleted": 0, "details": list(details.values())}
+
+        if unbound_users:
+            logger.info(f"[RECONCILE] unbound users from departed members: {unbound_users}")
+        for member_id, info in details.items():
+            info["comments_deleted"] = comment_counts.get(member_id, 0)
+            info["activities_updated"] = activity_counts.get(member_id, 0)
+        for member_id in deleted_ids:
+            details[member_id]["member_deleted"] = True
+
+        await MemberCRUD.invalidate_cache_many(deleted_ids)
+        await CommentCRUD.invalidate_member_first_pages(member_ids)
+
+        # 头像文件删除放在事务之后，且不阻塞事件循环
+        removable = [(member_id, details[member_id]["uin"]) for member_id in deleted_ids]
+        avatar_results = await asyncio.to_thread(MemberService._delete_avatar_files, removable)
+        for member_id, (ok, err) in avatar_results.items():
+            details[member_id]["avatar_deleted"] = ok
+            if err:
+                details[member_id]["errors"].append(f"avatar:{err}")
+
+        deleted_count = len(deleted_ids)
+        logger.info(
+            f"[RECONCILE] deleted count: {deleted_count}; comments={sum(comment_counts.values())}; "
+            f"activity_refs={sum(activity_counts.values())}"
+        )
+        return {"deleted": deleted_count, "details": list(details.values())}
 
+    @staticmethod
+    def _delete_avatar_files(items: List[Tuple[int, int]]) -> Dict[int, Tuple[bool, Optional[str]]]:
+        """批量删除头像文件（同步，供 to_thread 调用），返回 {member_id: (是否删除, 错误信息)}"""
+        results: Dict[int, Tuple[bool, Optional[str]]] = {}
+        for member_id, uin in items:
+            try:
+                results[member_id] = (AvatarService.delete_avatar_file_by_uin(uin), None)
+            except Exception as e:
+                results[member_id] = (False, str(e))
+        return results
@@ -2,81 +2,70 @@
 FastAPI主应用
 """
 import time
+_IMPORT_STARTED = time.perf_counter()  # 冷启动计时起点（/ready 的 ready_after_ms 包含导入耗时）
+
+import asyncio
 import logging
-import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.encoders import jsonable_encoder
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from services.database.service import DatabaseService
 from services.database.factory import DatabaseServiceFactory
 from services.auth.factory import AuthServiceFactory
 from services.config.factory import ConfigServiceFactory
 from services.crypto.factory import CryptoServiceFactory
 from services.cache.factory import CacheServiceFactory
+from services.metrics.factory import MetricsServiceFactory
+from services.pics_gc.factory import PicsGcFactory
+from services.metrics.service import metrics_middleware
+from services.metrics.nplusone import nplusone_middleware_factory
 from services.cache.cashews_init import CashewsCache
-from services.deps import set_database_service, set_auth_service, set_config_service, set_crypto_service, set_cache_service
+from services.deps import set_database_service, set_auth_service, set_config_service, set_crypto_service, set_cache_service, set_metrics_service, set_pics_gc
 from services.auth.utils import create_super_user
+from services.auth.hashing import HashingSaturatedError
+from services.cache.conditional import conditional_get_middleware
+from services.database.replicas import read_your_writes_middleware_factory
+from utils.static_files import PrecompressedStaticFiles
+from utils.log_pipeline import setup_queue_logging
+from utils.startup import StartupTracker
 from services.database.models.user import User
 from sqlmodel import select
 from api.router import main_router
 
-# 初始化全局配置服务
+# 初始化全局配置服务（lifespan 复用同一实例，只解析一次环境变量/.env）
 config_factory = ConfigServiceFactory()
 config_service = config_factory.create()
 settings = config_service.get_settings()
+set_config_service(config_service)
 
 
 def setup_logging():
-    """设置日志配置"""
+    """设置日志配置：QueueHandler + 独立写线程，文件按大小滚动，热点模块限速"""
     # 创建日志目录 - 移到项目根目录，避免触发uvicorn热重载
     log_dir = Path("../../logs")
-    log_dir.mkdir(exist_ok=True)
 
     # 设置日志级别
     log_level = logging.DEBUG if settings.debug else logging.INFO
 
-    # 创建格式化器
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+    setup_queue_logging(
+        log_dir,
+        log_level,
+        max_bytes=settings.log_max_bytes,
+        backup_count=settings.log_backup_count,
+        queue_size=settings.log_queue_size,
+        sampling=settings.log_sampling,
+        rate_limits=settings.log_rate_limits,
     )
 
-    # 设置根日志记录器
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-
-    # 清除现有的处理器
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-
-    # 控制台处理器
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-
-    # 文件处理器
-    file_handler = logging.FileHandler(log_dir / "app.log", encoding='utf-8')
-    file_handler.setLevel(log_level)
-    file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
-
-    # 错误日志文件处理器
-    error_handler = logging.FileHandler(log_dir / "error.log", encoding='utf-8')
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(formatter)
-    root_logger.addHandler(error_handler)
-
     # 设置特定模块的日志级别
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("fastapi").setLevel(logging.INFO)
@@ -93,6 +82,9 @@ logger = logging.getLogger(__name__)
 # 速率限制器
 limiter = Limiter(key_func=get_remote_address)
 
+# 启动步骤耗时与就绪状态（/ready）
+startup = StartupTracker(started=_IMPORT_STARTED)
+
 
 async def ensure_admin_user_exists(db_service, auth_service, config_service, logger):
     """
@@ -144,40 +136,40 @@ async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时执行
     logger.info("🚀 启动后端服务...")
-
-    # 初始化配置服务
-    config_factory = ConfigServiceFactory()
-    config_service = config_factory.create()
-    set_config_service(config_service)
-    settings = config_service.get_settings()
+    startup.steps["import"] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
 
     logger.info(f"调试模式: {settings.debug}")
     logger.info(f"数据库URL: {settings.database_url}")
     logger.info(f"头像根目录: {settings.avatar_root}")
 
-    # 初始化 cashews 两级缓存（L1 本地 + L2 Redis）
-    CashewsCache.setup(
-        redis_url=settings.redis_url,
-        l1_size=settings.cache_max_size,
-        l1_prefix="l1:",
-    )
-    # 注册 SQLAlchemy 事务事件（导入即注册）
-    import services.database.events_cache  # noqa: F401
-
-    # 初始化缓存服务
-    cache_factory = CacheServiceFactory()
-    cache_service = cache_factory.create(config_service=config_service)
-    set_cache_service(cache_service)
+    with startup.step("cache"):
+        # 初始化 cashews 两级缓存（L1 本地 + L2 Redis）
+        CashewsCache.setup(
+            redis_url=settings.redis_url,
+            l1_size=settings.cache_max_size,
+            l1_prefix="l1:",
+        )
+        # 注册 SQLAlchemy 事务事件（导入即注册）
+        import services.database.events_cache  # noqa: F401
+
+        # 初始化缓存服务
+        cache_factory = CacheServiceFactory()
+        cache_service = cache_factory.create(config_service=config_service)
+        set_cache_service(cache_service)
     logger.info(f"✅ 缓存服务初始化完成 - 最大容量: {settings.cache_max_size}, 默认TTL: {settings.cache_default_ttl}秒")
 
-    # 初始化加密服务
+    # 初始化指标服务（注册 SQL 计数事件）
+    set_metrics_service(MetricsServiceFactory().create(config_service))
+
+    # 初始化加密服务；PBKDF2 密钥派生放到线程中预热，与后续启动步骤并行，完成前 /ready 返回 503
     crypto_factory = CryptoServiceFactory()
     crypto_service = crypto_factory.create(config_service)
     set_crypto_service(crypto_service)
+    startup.background("crypto_key", asyncio.to_thread(crypto_service.warm_up))
 
     # 初始化数据库服务
     db_factory = DatabaseServiceFactory()
-    db_service = db_factory.create(settings.database_url)
+    db_service = db_factory.create(settings.database_url, config_service)
     set_database_service(db_service)
 
     # 初始化认证服务
@@ -185,25 +177,41 @@ async def lifespan(app: FastAPI):
     auth_service = auth_factory.create()
     set_auth_service(auth_service)
 
-    # 创建数据库和表
-    await db_service.create_db_and_tables()
+    # 校验数据库结构版本（默认与 Alembic head 对比，不再每次启动 create_all）
+    with startup.step("schema"):
+        await db_service.prepare_schema(settings.db_schema_check)
+    # 只读副本首次健康检查（未配置时无操作）
+    with startup.step("replicas"):
+        await db_service.start_replicas()
     logger.info("✅ 数据库初始化完成")
     logger.info("✅ 认证服务初始化完成")
 
+    # 孤儿图片回收（后台定时，多 worker 通过 Redis 锁互斥）
+    pics_gc = PicsGcFactory().create(db_service, config_service)
+    set_pics_gc(pics_gc)
+    pics_gc.start()
+
     # 确保必要的目录存在
-    from pathlib import Path
     Path(settings.avatar_root).mkdir(parents=True, exist_ok=True)
     Path("./data").mkdir(parents=True, exist_ok=True)
     logger.info("✅ 目录结构初始化完成")
 
     # 检查并创建管理员账户
-    await ensure_admin_user_exists(db_service, auth_service, config_service, logger)
+    with startup.step("admin_user"):
+        await ensure_admin_user_exists(db_service, auth_service, config_service, logger)
+
+    startup.complete()
+    logger.info(f"✅ 启动完成 - 耗时: {startup.steps}")
 
     yield
 
     # 关闭时执行
     logger.info("🛑 关闭后端服务...")
+    await startup.wait_background()
+    await pics_gc.stop()
+    auth_service.teardown()
     await db_service.teardown()
+    # 日志写线程在进程退出时由 atexit 停止，uvicorn 在 lifespan 之后输出的日志仍会写出
 
 
 
@@ -216,6 +224,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    # 未走响应缓存的路由统一用 orjson 编码
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -235,6 +245,23 @@ async def add_process_time_header(request: Request, call_next):
     return response
 
 
+# 条件请求中间件：If-None-Match 命中时在进入路由前直接返回 304
+app.middleware("http")(conditional_get_middleware)
+
+# 写后读一致：配置了只读副本时，写请求成功后短时间内该客户端的读请求走主库
+if settings.database_replica_urls:
+    app.middleware("http")(read_your_writes_middleware_factory(settings.db_read_your_writes_seconds))
+
+# N+1 检测中间件（仅开发时按配置开启）
+if settings.sql_nplusone_threshold > 0:
+    app.middleware("http")(
+        nplusone_middleware_factory(settings.sql_nplusone_threshold, settings.sql_nplusone_action)
+    )
+
+# 指标中间件（最外层）：路由延迟直方图、SQL/缓存计数与 Server-Timing 头
+app.middleware("http")(metrics_middleware)
+
+
 # CORS中间件
 app.add_middleware(
     CORSMiddleware,
@@ -268,6 +295,20 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     )
 
 
+@app.exception_handler(HashingSaturatedError)
+async def hashing_saturated_handler(request: Request, exc: HashingSaturatedError):
+    """密码哈希执行器饱和：快速返回 429，提示客户端稍后重试"""
+    return JSONResponse(
+        status_code=429,
+        content={
+            "error": "HTTP_ERROR",
+            "message": "登录请求过多，请稍后重试",
+            "status_code": 429
+        },
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """通用异常处理"""
@@ -312,8 +353,8 @@ static_dir = Path(__file__).parent.parent / "static"
 if static_dir.exists():
     print(f"📁 静态文件目录: {static_dir}")
     if not settings.debug:
-        # 生产模式：挂载到根路径
-        app.mount("/", StaticFiles(directory=str(static_dir), html=True), name="static")
+        # 生产模式：挂载到根路径（预压缩变体 + 哈希资源 immutable 缓存）
+        app.mount("/", PrecompressedStaticFiles(directory=str(static_dir), html=True), name="static")
         print("✅ 生产模式：静态文件服务已启用")
     else:
         # 开发模式：挂载到 /static 路径（可选，用于测试）
@@ -327,13 +368,19 @@ else:
 # 健康检查
 @app.get("/health", summary="健康检查")
 async def health_check():
-    """健康检查端点"""
+    """健康检查端点（存活探针：进程能响应即返回 200）"""
     return {
         "status": "healthy",
         "timestamp": time.time()
     }
 
 
+@app.get("/ready", summary="就绪检查")
+async def readiness_check():
+    """就绪探针：启动流程完成且预热任务（加密密钥派生等）结束后返回 200，否则 503"""
+    return JSONResponse(status_code=200 if startup.ready else 503, content=startup.report())
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
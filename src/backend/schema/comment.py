@@ -65,6 +65,9 @@ class CommentModerationResponse(BaseModel):
     high_dislike_comments: List[CommentResponse] = Field(description="高点踩评论列表")
     total: int = Field(description="符合条件的评论总数")
     threshold: int = Field(description="点踩数阈值")
+    page: int = Field(default=1, description="当前页码")
+    page_size: int = Field(default=20, description="每页大小")
+    total_pages: int = Field(default=1, description="总页数")
 
 
 class ErrorResponse(BaseModel):
@@ -28,6 +28,19 @@ class MemberListResponse(BaseModel):
     total_pages: int = Field(description="总页数")
 
 
+class MemberSearchItem(MemberResponse):
+    """成员搜索结果项"""
+    score: float = Field(description="相关度（0-1，越大越相关）")
+
+
+class MemberSearchResponse(BaseModel):
+    """成员搜索响应模型"""
+    query: str = Field(description="搜索关键词")
+    items: List[MemberSearchItem]
+    total: int = Field(description="返回条数")
+    source: str = Field(description="结果来源：trie=内存前缀树, db=pg_trgm, mixed=两者合并")
+
+
 class MemberDetailResponse(MemberResponse):
     """成员详情响应模型"""
     level_point: Optional[int] = Field(default=None, description="群等级积分")
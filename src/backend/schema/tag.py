@@ -0,0 +1,17 @@
+"""
+标签相关的Pydantic模型
+"""
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class TagFacetItem(BaseModel):
+    """单个标签及其使用次数"""
+    tag: str = Field(description="标签")
+    count: int = Field(description="使用该标签的条目数")
+
+
+class TagFacetResponse(BaseModel):
+    """标签聚合（标签云）响应模型"""
+    scope: str = Field(description="作用域：daily_posts / activities")
+    tags: List[TagFacetItem] = Field(description="按使用次数倒序的标签列表")
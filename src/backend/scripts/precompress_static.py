@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Generate .br / .gz siblings for the built frontend (served by utils.static_files.PrecompressedStaticFiles).
+
+- Only text-like assets above --min-bytes are compressed (images and woff2 are already compressed)
+- A variant is kept only when it saves at least 5% over the original
+- Up-to-date variants are skipped, variants whose source file is gone are removed
+- brotli is optional (pip install "vd-index[compression]"); without it only .gz is produced
+
+Usage:
+    python scripts/precompress_static.py ../frontend/dist
+    python scripts/precompress_static.py static --min-bytes 512
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+# Ensure backend package imports work when running directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.static_files import COMPRESSIBLE_SUFFIXES, ENCODINGS
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+MIN_SAVING = 0.95
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    funcs: Dict[str, Callable[[bytes], bytes]] = {
+        ".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        funcs[".br"] = lambda data: brotli.compress(data, quality=11)
+    return funcs
+
+
+def precompress(root: Path, min_bytes: int = 1024) -> Tuple[int, int, int]:
+    """Returns (written, skipped, removed)"""
+    compressors = _compressors()
+    variant_suffixes = tuple(suffix for _, suffix in ENCODINGS)
+    written = skipped = removed = 0
+
+    for path in sorted(root.rglob("*")):
+        if not path.is_file():
+            continue
+        # stale variant: its source no longer exists
+        if path.suffix in variant_suffixes:
+            if not path.with_suffix("").exists():
+                path.unlink()
+                removed += 1
+            continue
+        if not path.name.endswith(COMPRESSIBLE_SUFFIXES):
+            continue
+        source_stat = path.stat()
+        if source_stat.st_size < min_bytes:
+            continue
+
+        data = None
+        for suffix, compress in compressors.items():
+            target = path.with_name(path.name + suffix)
+            if target.exists() and target.stat().st_mtime >= source_stat.st_mtime:
+                skipped += 1
+                continue
+            data = data if data is not None else path.read_bytes()
+            compressed = compress(data)
+            if len(compressed) > len(data) * MIN_SAVING:
+                if target.exists():
+                    target.unlink()
+                    removed += 1
+                continue
+            target.write_bytes(compressed)
+            written += 1
+    return written, skipped, removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", type=Path, help="built frontend directory (e.g. ../frontend/dist)")
+    parser.add_argument("--min-bytes", type=int, default=1024)
+    args = parser.parse_args()
+
+    if not args.directory.is_dir():
+        print(f"Error: directory not found: {args.directory}")
+        sys.exit(1)
+
+    written, skipped, removed = precompress(args.directory, args.min_bytes)
+    encodings = "br, gzip" if brotli is not None else "gzip (install brotli for .br)"
+    print(f"Precompressed {args.directory}: written={written}, up-to-date={skipped}, removed={removed} [{encodings}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+密码哈希执行器
+中文注释：bcrypt 每次计算约 100–300ms，直接在协程里调用会阻塞事件循环。
+这里用独立线程池（默认与 CPU 核数相同）执行哈希/校验，并限制排队长度：
+并发超过 workers + queue_size 时立即抛出 HashingSaturatedError（由 API 层转成 429），
+避免登录洪峰拖垮整个 worker。同时记录各操作的耗时分布供管理端查看。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+# 每个操作保留的最近样本数（用于分位数）
+_SAMPLE_WINDOW = 1024
+
+
+class HashingSaturatedError(RuntimeError):
+    """哈希执行器已满（执行中 + 排队数达到上限）"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing executor is saturated")
+        self.retry_after = retry_after
+
+
+class _OpStats:
+    __slots__ = ("count", "total_ms", "max_ms", "samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+
+    def record(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.samples.append(ms)
+
+    def snapshot(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 2)
+
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class PasswordHasher:
+    """线程池 + 有界排队的密码哈希执行器"""
+
+    def __init__(self, pwd_context: CryptContext, max_workers: int = 0, queue_size: int = 32):
+        self.pwd_context = pwd_context
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_size = max(0, queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pwd-hash")
+        # 只在事件循环线程中增减，无需加锁
+        self._in_flight = 0
+        self._rejected = 0
+        # 等待耗时（排队）与执行耗时分开统计
+        self._wait = _OpStats()
+        self._ops: Dict[str, _OpStats] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.queue_size
+
+    async def _run(self, op: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.capacity:
+            self._rejected += 1
+            raise HashingSaturatedError()
+        self._in_flight += 1
+        submitted = time.perf_counter()
+
+        def _timed() -> Tuple[Any, float, float]:
+            started = time.perf_counter()
+            result = fn(*args)
+            return result, started, time.perf_counter()
+
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._executor, _timed)
+        finally:
+            self._in_flight -= 1
+        self._wait.record((started - submitted) * 1000)
+        self._ops.setdefault(op, _OpStats()).record((finished - started) * 1000)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", self.pwd_context.verify, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """校验密码；若哈希参数已过时（如 bcrypt rounds 变化）同时返回新哈希"""
+        return await self._run(
+            "verify", self.pwd_context.verify_and_update, plain_password, hashed_password
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "in_flight": self._in_flight,
+            "rejected": self._rejected,
+            "queue_wait": self._wait.snapshot(),
+            "operations": {op: s.snapshot() for op, s in self._ops.items()},
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,83 @@
+"""
+认证主体缓存
+中文注释：以 (sub, iat) 为键在 L1 本地缓存已认证用户的快照，省去每个鉴权请求的一次 DB 查询；
+同时在 Redis（L2）维护每个用户的 token 版本号。密码、角色、启用状态、成员绑定变化时
+由 events_cache 在提交后递增版本号，缓存条目中的版本与当前版本不一致即视为失效。
+读取版本号失败（Redis 不可用）时不使用缓存，直接回源数据库，保证撤销不被削弱。
+"""
+from __future__ import annotations
+
+import logging
+from typing import Optional, Tuple
+
+from cashews import cache as C
+
+from services.cache.keys import L1_PREFIX
+from services.database.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# 这些字段变化会影响鉴权结果或 current_user 的语义
+PRINCIPAL_FIELDS = ("password_hash", "role", "is_active", "member_id", "username")
+
+DEFAULT_PRINCIPAL_TTL = 30
+
+
+def token_version_key(username: str) -> str:
+    return f"auth:tokver:{username}"
+
+
+def principal_key(username: str, iat: int) -> str:
+    return f"{L1_PREFIX}auth:principal:{username}:{iat}"
+
+
+def _principal_ttl() -> int:
+    try:
+        from services.deps import get_config_service
+        return get_config_service().get_settings().auth_principal_cache_ttl
+    except Exception:
+        return DEFAULT_PRINCIPAL_TTL
+
+
+async def get_token_version(username: str) -> Optional[int]:
+    """读取用户当前 token 版本（仅 L2/Redis）；读取失败返回 None"""
+    try:
+        value = await C.get(token_version_key(username))
+        return int(value or 0)
+    except Exception as e:
+        logger.warning(f"[AUTH] failed to read token version for {username}: {e}")
+        return None
+
+
+async def bump_token_version(username: str) -> None:
+    """递增用户 token 版本，使所有已缓存的认证主体立即失效"""
+    try:
+        await C.incr(token_version_key(username))
+    except Exception as e:
+        logger.warning(f"[AUTH] failed to bump token version for {username}: {e}")
+
+
+async def get_cached_principal(username: str, iat: int) -> Tuple[Optional[User], Optional[int]]:
+    """返回 (缓存命中的用户, 当前版本号)；未命中或版本不一致时用户为 None"""
+    version = await get_token_version(username)
+    if version is None or _principal_ttl() <= 0:
+        return None, None
+    try:
+        entry = await C.get(principal_key(username, iat))
+    except Exception:
+        entry = None
+    if entry is not None and entry[0] == version:
+        return entry[1], version
+    return None, version
+
+
+async def cache_principal(username: str, iat: int, user: User, version: Optional[int]) -> None:
+    """缓存用户快照（脱离会话的副本，避免跨请求共享 ORM 实例）"""
+    ttl = _principal_ttl()
+    if version is None or ttl <= 0:
+        return
+    try:
+        snapshot = User(**user.model_dump())
+        await C.set(principal_key(username, iat), (version, snapshot), expire=ttl)
+    except Exception as e:
+        logger.warning(f"[AUTH] failed to cache principal for {username}: {e}")
@@ -3,10 +3,11 @@
 处理JWT认证、密码验证等功能
 """
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from services.config.service import Settings
+from .hashing import PasswordHasher
 
 
 class AuthService:
@@ -14,7 +15,20 @@ class AuthService:
 
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        rounds = settings.auth_bcrypt_rounds
+        # min/max 与默认值一致：rounds 配置变化后旧哈希 needs_update，登录时透明重算
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        self.hasher = PasswordHasher(
+            self.pwd_context,
+            max_workers=settings.auth_hash_workers,
+            queue_size=settings.auth_hash_queue_size,
+        )
 
     @property
     def secret_key(self) -> str:
@@ -39,15 +53,33 @@ class AuthService:
         """生成密码哈希"""
         return self.pwd_context.hash(password)
 
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """在哈希线程池中验证密码（不阻塞事件循环，饱和时抛 HashingSaturatedError）"""
+        return await self.hasher.verify(plain_password, hashed_password)
+
+    async def verify_and_update_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """验证密码，哈希参数过时时返回新哈希（用于登录时透明重算）"""
+        return await self.hasher.verify_and_update(plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """在哈希线程池中生成密码哈希"""
+        return await self.hasher.hash(password)
+
+    def teardown(self) -> None:
+        """关闭哈希线程池"""
+        self.hasher.shutdown()
+
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """创建访问令牌"""
         to_encode = data.copy()
+        now = datetime.utcnow()
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
+            expire = now + timedelta(minutes=self.access_token_expire_minutes)
         
-        to_encode.update({"exp": expire})
+        # iat 同时作为认证主体缓存键的一部分
+        to_encode.update({"exp": expire, "iat": now})
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
 
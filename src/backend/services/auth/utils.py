@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from services.database.models.user import User, UserCRUD
 from services.deps import get_session, get_auth_service
 from .service import AuthService
+from .principal import cache_principal, get_cached_principal
 
 # OAuth2 认证方案
 oauth2_scheme = OAuth2PasswordBearer(
@@ -39,11 +40,17 @@ async def get_current_user_by_jwt(
     if username is None:
         raise credentials_exception
     
-    # 查询用户
+    # 先查认证主体缓存（按 sub + iat，版本号校验），未命中再查库
+    iat = int(payload.get("iat") or 0)
+    user, version = await get_cached_principal(username, iat)
+    if user is not None:
+        return user
+
     user = await UserCRUD.get_by_username(session, username=username)
     if user is None:
         raise credentials_exception
-    
+
+    await cache_principal(username, iat, user, version)
     return user
 
 
@@ -0,0 +1,203 @@
+"""
+条件请求（ETag / 304）
+中文注释：为公开的 JSON 列表/详情端点生成强 ETag，并在进入路由之前处理 If-None-Match。
+ETag 由「请求 URL + 相关表的命名空间版本号」哈希得到，无需构建响应体、也不访问数据库；
+版本号保存在 Redis（ns:ver:{表名}），由 events_cache 在事务提交后递增。
+Redis 不可用时整条逻辑旁路，请求照常处理（只是没有 ETag）。
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import secrets
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cashews import cache as C
+from fastapi import Request, Response
+
+from services.cache.response_cache import accepts_encoding
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE_VERSION_PREFIX = "ns:ver:"
+
+# 响应可能按 Accept-Encoding 返回不同编码的变体（见 response_cache），强 ETag 需区分
+_CODINGS = ("br", "gzip")
+
+
+def namespace_version_key(table: str) -> str:
+    return f"{NAMESPACE_VERSION_PREFIX}{table}"
+
+
+@dataclass(frozen=True)
+class ConditionalPolicy:
+    """单条路由的条件请求策略
+
+    name: 策略名（Settings.http_cache_control 以此为键覆盖 Cache-Control）
+    pattern: 匹配请求路径的正则（完整匹配）
+    tables: 响应内容依赖的表，任一表的版本变化都会改变 ETag
+    cache_control: 默认 Cache-Control
+    """
+    name: str
+    pattern: re.Pattern
+    tables: Tuple[str, ...]
+    cache_control: str = "public, no-cache"
+
+
+def _policy(name: str, path: str, tables: Sequence[str], cache_control: str = "public, no-cache") -> ConditionalPolicy:
+    return ConditionalPolicy(name, re.compile(path), tuple(tables), cache_control)
+
+
+# 只登记匿名可访问、响应不依赖当前用户、且 GET 无副作用的端点
+# （/daily/posts/{id} 会自增浏览量，不在此列）
+POLICIES: List[ConditionalPolicy] = [
+    _policy("members.stats", r"/api/v1/members/stats", ("members",), "public, max-age=60, must-revalidate"),
+    _policy("members.list", r"/api/v1/members", ("members",)),
+    _policy("members.detail", r"/api/v1/members/\d+", ("members",)),
+    _policy("daily.trending", r"/api/v1/daily/trending", ("daily_posts", "users", "members")),
+    _policy("daily.list", r"/api/v1/daily/posts", ("daily_posts", "users", "members")),
+    # tag_counts 由触发器随 daily_posts / activities 的写入维护，版本号跟随源表
+    _policy("tags.facet", r"/api/v1/tags", ("daily_posts", "activities")),
+    _policy("star_calendar.list", r"/api/v1/star_calendar/activities", ("activities", "members")),
+    _policy("star_calendar.stats", r"/api/v1/star_calendar/activities/stats", ("activities",)),
+    _policy("star_calendar.detail", r"/api/v1/star_calendar/activity/\d+", ("activities", "members")),
+    _policy("activities.list", r"/api/v1/activities", ("act_activity",)),
+    _policy(
+        "activities.ranking",
+        r"/api/v1/activities/\d+/ranking",
+        ("act_activity", "act_activity_vote_option", "act_activity_vote_record"),
+    ),
+]
+
+
+def match_policy(path: str, policies: Iterable[ConditionalPolicy] = POLICIES) -> Optional[ConditionalPolicy]:
+    for policy in policies:
+        if policy.pattern.fullmatch(path):
+            return policy
+    return None
+
+
+def compute_etag(policy: ConditionalPolicy, host: str, path: str, query: str, versions: Sequence[int]) -> str:
+    """由策略名、主机、路径、规范化后的查询串与各表版本号计算强 ETag（带引号）
+
+    主机参与计算：部分响应（如成员列表的头像 URL）包含按请求主机拼出的绝对地址。
+    """
+    params = "&".join(sorted(p for p in query.split("&") if p))
+    raw = "|".join([policy.name, host, path, params, *(str(v) for v in versions)])
+    return f'"{hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()}"'
+
+
+def encoded_etag(etag: str, coding: Optional[str]) -> str:
+    """编码变体的 ETag：在引号内追加 -gzip / -br 后缀"""
+    if not coding:
+        return etag
+    return f'{etag[:-1]}-{coding}"'
+
+
+def _parse_if_none_match(header: str) -> List[str]:
+    tags = []
+    for part in header.split(","):
+        tag = part.strip()
+        # If-None-Match 使用弱比较：忽略 W/ 前缀（反向代理压缩时常把强 ETag 改为弱 ETag）
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def etag_matches(if_none_match: str, etag: str, accept_encoding: str = "") -> bool:
+    """客户端缓存的任一 ETag 是否与当前表示一致（包含其可接受编码的变体）"""
+    tags = _parse_if_none_match(if_none_match)
+    if "*" in tags:
+        return True
+    candidates = {etag}
+    candidates.update(encoded_etag(etag, c) for c in _CODINGS if accepts_encoding(accept_encoding, c))
+    return any(tag in candidates for tag in tags)
+
+
+def _settings():
+    from services.deps import get_config_service
+    return get_config_service().get_settings()
+
+
+def cache_control_for(policy: ConditionalPolicy) -> str:
+    try:
+        overrides: Dict[str, str] = _settings().http_cache_control or {}
+    except Exception:
+        overrides = {}
+    return overrides.get(policy.name, policy.cache_control)
+
+
+async def bump_namespace_version(table: str) -> None:
+    """递增表的命名空间版本（由 events_cache 在提交后调用）"""
+    try:
+        await C.incr(namespace_version_key(table))
+    except Exception as e:
+        logger.warning(f"[ETAG] failed to bump namespace version for {table}: {e}")
+
+
+async def get_namespace_versions(tables: Sequence[str]) -> Optional[List[int]]:
+    """读取各表版本号；读取失败或存在缺失时返回 None（本次不生成 ETag）
+
+    缺失的版本号以随机值初始化而非从 0 开始：Redis 被清空后计数不会回到旧值，
+    避免与客户端手里的历史 ETag 意外相同而返回过期内容。
+    """
+    keys = [namespace_version_key(t) for t in tables]
+    try:
+        values = await C.get_many(*keys)
+        missing = [k for k, v in zip(keys, values) if v is None]
+        if missing:
+            for key in missing:
+                await C.set(key, secrets.randbits(48), exist=False)
+            return None
+        return [int(v) for v in values]
+    except Exception as e:
+        logger.warning(f"[ETAG] failed to read namespace versions {tables}: {e}")
+        return None
+
+
+async def conditional_get_middleware(request: Request, call_next):
+    """HTTP 中间件：命中 If-None-Match 时直接 304，否则为 200 响应附加 ETag/Cache-Control"""
+    if request.method not in ("GET", "HEAD"):
+        return await call_next(request)
+    policy = match_policy(request.url.path)
+    if policy is None:
+        return await call_next(request)
+    try:
+        enabled = _settings().etag_enabled
+    except Exception:
+        enabled = True
+    if not enabled:
+        return await call_next(request)
+
+    versions = await get_namespace_versions(policy.tables)
+    if versions is None:
+        return await call_next(request)
+
+    # 供 cached_json_response 把同一组版本号拼进缓存键：ETag 与缓存的响应体始终对应同一版本
+    request.state.namespace_versions = versions
+    etag = compute_etag(policy, request.url.netloc, request.url.path, request.url.query, versions)
+    cache_control = cache_control_for(policy)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag, request.headers.get("accept-encoding", "")):
+        coding = next((c for c in _CODINGS if encoded_etag(etag, c) in _parse_if_none_match(if_none_match)), None)
+        return Response(
+            status_code=304,
+            headers={
+                "ETag": encoded_etag(etag, coding),
+                "Cache-Control": cache_control,
+                "Vary": "Accept-Encoding",
+            },
+        )
+
+    response = await call_next(request)
+    if response.status_code == 200:
+        coding = response.headers.get("content-encoding")
+        response.headers["ETag"] = encoded_etag(etag, coding if coding in _CODINGS else None)
+        if "cache-control" not in response.headers:
+            response.headers["Cache-Control"] = cache_control
+    return response
@@ -8,6 +8,16 @@ L1_PREFIX = "l1:"
 # Domain-level keys (examples already used in project)
 ACTIVITY_STATS_ALL = "activity:stats:all"
 MEMBER_STATS_ALL = "member:stats:all"
+# 可绑定成员ID（按 created_at DESC 排序的紧凑数组）
+MEMBER_BINDABLE_IDS = "member:bindable:ids"
+
+# 成员评论列表首页（page=1, page_size=MEMBER_COMMENTS_FIRST_PAGE_SIZE，与前端默认一致）的预序列化响应
+MEMBER_COMMENTS_FIRST_PAGE_SIZE = 20
+
+
+def member_comments_first_page_key(member_id: int) -> str:
+    return f"comment:member:{member_id}:first"
+
 
 # Tags for bulk invalidation (reserved for future use)
 TAG_ACTIVITY_STATS = "activity:stats"
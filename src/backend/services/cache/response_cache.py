@@ -0,0 +1,127 @@
+"""
+预序列化响应缓存
+中文注释：缓存最终的 JSON 字节（可选 gzip/brotli 预压缩变体），命中时直接返回原始 Response，
+跳过 response_model 校验与 jsonable_encoder 编码。缓存值为三元组 (json, gzip, br)，
+沿用各端点原有的缓存键，因此 events_cache 中已有的失效逻辑无需改动。
+"""
+from __future__ import annotations
+
+import gzip
+import logging
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+try:  # 可选依赖：未安装时只提供 gzip 变体
+    import brotli
+except ImportError:  # pragma: no cover - 取决于部署环境
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+
+# (原始 JSON, gzip 变体, brotli 变体)
+EncodedPayload = Tuple[bytes, Optional[bytes], Optional[bytes]]
+
+
+def _compress_min_bytes() -> int:
+    try:
+        from services.deps import get_config_service
+        return get_config_service().get_settings().response_cache_compress_min_bytes
+    except Exception:
+        return 1024
+
+
+def encode_payload(data: Any, compress_min_bytes: Optional[int] = None) -> EncodedPayload:
+    """序列化为 JSON 字节，并在体积足够大时生成 gzip/brotli 变体"""
+    body = orjson.dumps(jsonable_encoder(data), option=orjson.OPT_NON_STR_KEYS)
+    threshold = _compress_min_bytes() if compress_min_bytes is None else compress_min_bytes
+    if len(body) < threshold:
+        return body, None, None
+    gz = gzip.compress(body, compresslevel=6, mtime=0)
+    br = brotli.compress(body, quality=5) if brotli is not None else None
+    return body, gz, br
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Accept-Encoding 中是否接受指定编码（q=0 视为拒绝）"""
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() != coding:
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def payload_response(payload: EncodedPayload, request: Optional[Request] = None, status_code: int = 200) -> Response:
+    """按 Accept-Encoding 选择变体，构造原始 Response"""
+    body, gz, br = payload
+    headers = {"Vary": "Accept-Encoding"}
+    accept = request.headers.get("accept-encoding", "") if request is not None else ""
+    if br is not None and accepts_encoding(accept, "br"):
+        body = br
+        headers["Content-Encoding"] = "br"
+    elif gz is not None and accepts_encoding(accept, "gzip"):
+        body = gz
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, status_code=status_code, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def _is_payload(value: Any) -> bool:
+    return isinstance(value, tuple) and len(value) == 3 and isinstance(value[0], (bytes, bytearray))
+
+
+def versioned_cache_key(request: Optional[Request], cache_key: str) -> str:
+    """条件请求中间件已读取命名空间版本号时，把版本号拼进缓存键
+
+    表变更后版本号递增，旧版本的缓存（包括其他 worker 的 L1）不再被读取，
+    新 ETag 不会与旧响应体配对；未经过中间件（无 ETag）时保持原键，只按 TTL 过期。
+    """
+    versions = getattr(getattr(request, "state", None), "namespace_versions", None)
+    if not versions:
+        return cache_key
+    return f"{cache_key}:ns:{'.'.join(str(v) for v in versions)}"
+
+
+async def cached_json_response(
+    request: Request,
+    cache_key: str,
+    ttl: int,
+    producer: Callable[[], Awaitable[Any]],
+) -> Response:
+    """读缓存命中则直接返回字节；否则调用 producer 生成数据、编码并写回缓存
+
+    缓存读写失败不影响主流程；旧格式（Python 对象）的缓存值视为未命中。
+    数据来自只读副本时不写回缓存（副本可能落后于已递增的版本号，见 database/replicas.py）。
+    """
+    from services.database.replicas import served_from_replica
+    from services.deps import get_cache_service
+
+    cache_key = versioned_cache_key(request, cache_key)
+    try:
+        cached = await get_cache_service().get(cache_key)
+        if _is_payload(cached):
+            return payload_response(cached, request)
+    except Exception as e:
+        logger.warning(f"Failed to get response cache {cache_key}: {e}")
+
+    data = await producer()
+    payload = encode_payload(data)
+    if served_from_replica(request):
+        return payload_response(payload, request)
+
+    try:
+        await get_cache_service().set(cache_key, payload, ttl=ttl)
+    except Exception as e:
+        logger.warning(f"Failed to set response cache {cache_key}: {e}")
+
+    return payload_response(payload, request)
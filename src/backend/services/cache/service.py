@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 
 from cashews import cache as C
 from services.cache.keys import L1_PREFIX
+from services.metrics.service import CACHE_L1_HIT, CACHE_L2_HIT, CACHE_MISS, record_cache
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -92,12 +93,15 @@ class CacheService:
         """获取缓存值（优先 L1，本地 miss 则查 L2，并回填 L1）"""
         # 先读 L1（本地内存）
         value = await C.get(f"{L1_PREFIX}{key}")
+        tier = CACHE_L1_HIT
         if value is None:
             # 再读 L2（Redis）
             value = await C.get(key)
+            tier = CACHE_L2_HIT if value is not None else CACHE_MISS
             # 命中 L2 时回填 L1
             if value is not None:
                 await C.set(f"{L1_PREFIX}{key}", value, expire=self._default_ttl)
+        record_cache(tier)
 
         # 更新统计
         self._stats.total_requests += 1
@@ -4,6 +4,7 @@
 import hashlib
 import secrets
 import logging
+import threading
 from typing import Union
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes
@@ -27,28 +28,45 @@ class CryptoService:
         """
         self.config_service = config_service
         self._key = None
+        self._key_lock = threading.Lock()
         self._salt = b"vd_member_salt_2024"  # 固定盐值
     
     @property
     def key(self) -> bytes:
         """获取加密密钥"""
         if self._key is None:
-            logger.debug("[CRYPTO] 初始化加密密钥")
-            master_key = self.config_service.get_or_create_aes_key()
-            logger.debug(f"[CRYPTO] 主密钥长度: {len(master_key)}")
-            logger.debug(f"[CRYPTO] 主密钥前10字符: {master_key[:10]}...")
-
-            # 使用PBKDF2从主密钥派生AES密钥
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,  # AES-256需要32字节密钥
-                salt=self._salt,
-                iterations=100000,
-            )
-            self._key = kdf.derive(master_key.encode())
-            logger.debug(f"[CRYPTO] 派生密钥长度: {len(self._key)}")
-            logger.info("[CRYPTO] 加密密钥初始化完成")
+            # 预热线程与首个请求可能同时到达：只派生一次
+            with self._key_lock:
+                if self._key is None:
+                    self._key = self._derive_key()
         return self._key
+
+    @property
+    def is_warm(self) -> bool:
+        return self._key is not None
+
+    def warm_up(self) -> None:
+        """预先派生密钥：PBKDF2 10 万次迭代需要数十到上百毫秒，启动时放到线程中执行，
+        避免第一个头像/解密请求在事件循环里同步计算"""
+        _ = self.key
+
+    def _derive_key(self) -> bytes:
+        """使用PBKDF2从主密钥派生AES密钥"""
+        logger.debug("[CRYPTO] 初始化加密密钥")
+        master_key = self.config_service.get_or_create_aes_key()
+        logger.debug(f"[CRYPTO] 主密钥长度: {len(master_key)}")
+        logger.debug(f"[CRYPTO] 主密钥前10字符: {master_key[:10]}...")
+
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,  # AES-256需要32字节密钥
+            salt=self._salt,
+            iterations=100000,
+        )
+        key = kdf.derive(master_key.encode())
+        logger.debug(f"[CRYPTO] 派生密钥长度: {len(key)}")
+        logger.info("[CRYPTO] 加密密钥初始化完成")
+        return key
     
     def encrypt_uin(self, uin: int, salt: str) -> str:
         """加密UIN"""
@@ -1,8 +1,8 @@
 from __future__ import annotations
 import asyncio
-from typing import Set
+from typing import List, Set
 
-from sqlalchemy import event
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 from cashews import cache as C
 
@@ -10,11 +10,28 @@ from services.cache.keys import (
     L1_PREFIX,
     ACTIVITY_STATS_ALL,
     MEMBER_STATS_ALL,
+    MEMBER_BINDABLE_IDS,
     TAG_ACTIVITY_STATS,
     TAG_MEMBER_STATS,
 )
 
 _CHANGED_KEY = "__changed_tablenames__"
+_PRINCIPAL_KEY = "__principal_changed_usernames__"
+
+
+def mark_tables_changed(session, *names: str) -> None:
+    """手动登记变更的表名。
+
+    Core 级别的批量语句（update()/delete()）不会出现在 session.new/dirty/deleted 中，
+    需调用方显式登记，提交后才能触发同样的缓存失效。
+    """
+    info = session.info  # AsyncSession.info 代理到同步 Session.info
+    info.setdefault(_CHANGED_KEY, set()).update(names)
+
+
+def mark_principals_changed(session, usernames) -> None:
+    """手动登记鉴权信息变化的用户（用于绕过 ORM 的批量 UPDATE），提交后递增其 token 版本"""
+    session.info.setdefault(_PRINCIPAL_KEY, set()).update(u for u in usernames if u)
 
 
 @event.listens_for(Session, "after_flush")
@@ -24,22 +41,80 @@ def _after_flush_collect(session: Session, flush_ctx) -> None:  # type: ignore[n
         name = getattr(getattr(obj, "__table__", None), "name", None) or getattr(obj, "__tablename__", None)
         if name:
             names.add(name)
+        if name == "users":
+            _collect_principal_change(session, obj)
+
+
+def _collect_principal_change(session: Session, obj) -> None:
+    """用户鉴权相关字段变化（或删除）时，记录需要递增 token 版本的用户名"""
+    from services.auth.principal import PRINCIPAL_FIELDS
+
+    state = inspect(obj)
+    changed = obj in session.deleted
+    if not changed:
+        for field in PRINCIPAL_FIELDS:
+            history = state.attrs[field].history
+            if history.has_changes():
+                changed = True
+                # 改名时旧用户名对应的缓存同样需要失效
+                if field == "username":
+                    session.info.setdefault(_PRINCIPAL_KEY, set()).update(
+                        v for v in history.deleted if v
+                    )
+    if changed and getattr(obj, "username", None):
+        session.info.setdefault(_PRINCIPAL_KEY, set()).add(obj.username)
+
+
+async def _delete_then_bump(keys: List[str], names: Set[str]) -> None:
+    """先删除缓存键，再递增命名空间版本号
+
+    顺序不能颠倒：版本号先变时，期间到达的请求会拿到新 ETag 却读到尚未删除的旧响应体。
+    """
+    from services.cache.conditional import bump_namespace_version
+
+    for key in keys:
+        try:
+            await C.delete(key)
+        except Exception:
+            pass
+    for name in names:
+        await bump_namespace_version(name)
 
 
 @event.listens_for(Session, "after_commit")
 def _after_commit_invalidate(session: Session) -> None:  # type: ignore[no-redef]
     names: Set[str] = session.info.pop(_CHANGED_KEY, set())
-    if not names:
+    usernames: Set[str] = session.info.pop(_PRINCIPAL_KEY, set())
+    if not names and not usernames:
         return
     loop = asyncio.get_event_loop()
+    keys: List[str] = []
+
+    if usernames:
+        from services.auth.principal import bump_token_version
+        for username in usernames:
+            loop.create_task(bump_token_version(username))
 
     if any(name in {"activities", "activity", "activity_participants"} for name in names):
-        loop.create_task(C.delete(ACTIVITY_STATS_ALL))
-        loop.create_task(C.delete(f"{L1_PREFIX}{ACTIVITY_STATS_ALL}"))
+        keys += [ACTIVITY_STATS_ALL, f"{L1_PREFIX}{ACTIVITY_STATS_ALL}"]
         # Future: tag-based invalidation
         # loop.create_task(C.delete_tags(TAG_ACTIVITY_STATS))
 
     if any(name in {"members", "member"} for name in names):
-        loop.create_task(C.delete(MEMBER_STATS_ALL))
-        loop.create_task(C.delete(f"{L1_PREFIX}{MEMBER_STATS_ALL}"))
+        keys += [
+            MEMBER_STATS_ALL, f"{L1_PREFIX}{MEMBER_STATS_ALL}",
+            MEMBER_BINDABLE_IDS, f"{L1_PREFIX}{MEMBER_BINDABLE_IDS}",
+        ]
+        # 成员搜索前缀树：仅标记，下一次搜索时惰性重建
+        from domain.member_search import mark_member_search_dirty
+        mark_member_search_dirty()
         # loop.create_task(C.delete_tags(TAG_MEMBER_STATS))
+
+    if "users" in names and MEMBER_BINDABLE_IDS not in keys:
+        # 删除用户或解绑会释放其成员，可绑定列表需要重新计算
+        keys += [MEMBER_BINDABLE_IDS, f"{L1_PREFIX}{MEMBER_BINDABLE_IDS}"]
+
+    # 经过条件请求中间件的响应缓存键已带命名空间版本号（见 response_cache.versioned_cache_key），
+    # 版本号递增后自动失效；上面的固定键仍需显式删除
+    if keys or names:
+        loop.create_task(_delete_then_bump(keys, names))
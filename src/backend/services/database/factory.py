@@ -3,6 +3,8 @@
 """
 from __future__ import annotations
 
+from .pool import PoolOptions
+from .replicas import ReplicaOptions
 from .service import DatabaseService
 
 
@@ -12,15 +14,24 @@ class DatabaseServiceFactory:
     def __init__(self) -> None:
         self.service_class = DatabaseService
 
-    def create(self, database_url: str) -> DatabaseService:
+    def create(self, database_url: str, config_service=None) -> DatabaseService:
         """创建数据库服务实例
 
         Args:
             database_url: 数据库连接URL
+            config_service: 配置服务实例（可选，读取 db_pool_* 连接池与只读副本配置）
 
         Returns:
             DatabaseService: 数据库服务实例
         """
         if not database_url:
             raise ValueError("Database URL is required")
-        return DatabaseService(database_url)
+        if config_service is None:
+            return DatabaseService(database_url)
+        settings = config_service.get_settings()
+        return DatabaseService(
+            database_url,
+            PoolOptions.from_settings(settings),
+            replica_urls=settings.database_replica_urls,
+            replica_options=ReplicaOptions.from_settings(settings),
+        )
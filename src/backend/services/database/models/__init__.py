@@ -20,7 +20,7 @@ from .activity_subsystem.crud import (
 )
 from .comment.base import Comment, CommentCreate, CommentRead, CommentUpdate, CommentStats
 from .comment.crud import CommentCRUD
-from .daily_post.base import DailyPost, DailyPostCreate, DailyPostRead, DailyPostUpdate
+from .daily_post.base import DailyPost, DailyPostCreate, DailyPostRead, DailyPostSummary, DailyPostUpdate
 from .daily_post.crud import DailyPostCRUD
 from .daily_post_comment.base import (
     DailyPostComment,
@@ -28,6 +28,8 @@ from .daily_post_comment.base import (
     DailyPostCommentRead,
     DailyPostCommentUpdate,
 )
+from .tag_count.base import TagCount, TagCountRead
+from .tag_count.crud import TagCountCRUD
 
 
 __all__ = [
@@ -39,8 +41,9 @@ __all__ = [
     # new activity subsystem tables
     "ActActivity", "ActVoteOption", "ActVoteRecord", "ActThreadPost", "ActAuditLog",
     "Comment", "CommentCreate", "CommentRead", "CommentUpdate", "CommentStats",
-    "DailyPost", "DailyPostCreate", "DailyPostRead", "DailyPostUpdate",
+    "DailyPost", "DailyPostCreate", "DailyPostRead", "DailyPostSummary", "DailyPostUpdate",
     "DailyPostComment", "DailyPostCommentCreate", "DailyPostCommentRead", "DailyPostCommentUpdate",
+    "TagCount", "TagCountRead",
     # CRUD操作类
     "MemberCRUD",
     "UserCRUD",
@@ -50,4 +53,5 @@ __all__ = [
     "ActActivityCRUD", "ActVoteCRUD", "ActThreadCRUD",
     "CommentCRUD",
     "DailyPostCRUD",
+    "TagCountCRUD",
 ]
@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from typing import List, Optional
 from pydantic import ConfigDict, field_validator, model_validator
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 from sqlalchemy.dialects.postgresql import JSONB
 
 from ..base import now_naive, to_naive_beijing
@@ -12,7 +13,12 @@ class Activity(SQLModel, table=True):
     """活动表模型"""
 
     __tablename__ = "activities"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # 标签过滤 tags @> '["x"]'
+        Index("ix_activities_tags_gin", "tags",
+              postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        {"extend_existing": True},
+    )
     model_config = ConfigDict(validate_assignment=True)
 
     id: Optional[int] = Field(default=None, primary_key=True)
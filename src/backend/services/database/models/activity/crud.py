@@ -2,11 +2,11 @@
 Activity表的CRUD操作
 """
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from sqlalchemy import cast, literal
+from sqlalchemy import cast, exists, literal, update
 from sqlalchemy.dialects.postgresql import JSONB
 
 from .base import Activity, ActivityCreate, ActivityRead, ActivityUpdate
@@ -48,9 +48,10 @@ class ActivityCRUD:
         session: AsyncSession,
         page: int = 1,
         page_size: int = 20,
-        order_by: str = "date"
+        order_by: str = "date",
+        tag: Optional[str] = None,
     ) -> Tuple[List[Activity], int]:
-        """分页获取活动列表"""
+        """分页获取活动列表（tag 过滤走 GIN 索引 ix_activities_tags_gin）"""
         # 计算偏移量
         offset = (page - 1) * page_size
 
@@ -66,11 +67,14 @@ class ActivityCRUD:
 
         # 查询活动
         statement = select(Activity).offset(offset).limit(page_size).order_by(order_field)
+        count_statement = select(func.count(Activity.id))
+        if tag:
+            statement = statement.where(Activity.tags.contains([tag]))
+            count_statement = count_statement.where(Activity.tags.contains([tag]))
         result = await session.exec(statement)
         activities = result.all()
 
         # 查询总数
-        count_statement = select(func.count(Activity.id))
         count_result = await session.exec(count_statement)
         total = count_result.one()
 
@@ -190,6 +194,62 @@ class ActivityCRUD:
 
         return activity
 
+    @staticmethod
+    def strip_participants(
+        rows: Iterable[Tuple[int, List[int]]],
+        member_ids: Set[int],
+    ) -> Tuple[List[Dict], Dict[int, int]]:
+        """从 (activity_id, participant_ids) 行中剔除给定成员（纯计算，不访问数据库）。
+
+        返回 (更新参数列表, {member_id: 受影响活动数})，更新参数可直接用于按主键批量 UPDATE。
+        """
+        updates: List[Dict] = []
+        affected: Dict[int, int] = {}
+        for activity_id, participant_ids in rows:
+            current = list(participant_ids or [])
+            removed = {pid for pid in current if pid in member_ids}
+            if not removed:
+                continue
+            kept = [pid for pid in current if pid not in member_ids]
+            updates.append({
+                "id": activity_id,
+                "participant_ids": kept,
+                "participants_total": len(kept),
+            })
+            for pid in removed:
+                affected[pid] = affected.get(pid, 0) + 1
+        return updates, affected
+
+    @staticmethod
+    async def remove_participants_bulk(
+        session: AsyncSession,
+        member_ids: List[int],
+        *,
+        commit: bool = True,
+    ) -> Dict[int, int]:
+        """批量从所有活动中移除多个成员，返回 {member_id: 受影响活动数}。
+
+        只查询命中的活动（EXISTS + jsonb_array_elements_text），
+        再用一次 executemany 按主键回写 participant_ids 与 participants_total。
+        """
+        if not member_ids:
+            return {}
+        wanted = {int(x) for x in member_ids}
+        elems = func.jsonb_array_elements_text(cast(Activity.participant_ids, JSONB)).table_valued("value")
+        statement = select(Activity.id, Activity.participant_ids).where(
+            exists().select_from(elems).where(elems.c.value.in_([str(x) for x in wanted]))
+        )
+        result = await session.exec(statement)
+        updates, affected = ActivityCRUD.strip_participants(result.all(), wanted)
+        if updates:
+            now = now_naive()
+            for params in updates:
+                params["updated_at"] = now
+            await session.execute(update(Activity), updates)
+        if commit:
+            await session.commit()
+        return affected
+
     @staticmethod
     async def add_tag(session: AsyncSession, activity_id: int, tag: str) -> Optional[Activity]:
         """为活动添加标签"""
@@ -198,7 +258,8 @@ class ActivityCRUD:
             return None
 
         if tag not in activity.tags:
-            activity.tags.append(tag)
+            # 重新赋值而非原地 append：普通 JSONB 列不跟踪列表内部的修改
+            activity.tags = [*activity.tags, tag]
             activity.updated_at = now_naive()
 
             session.add(activity)
@@ -214,7 +275,7 @@ class ActivityCRUD:
         if not activity:
             return None
         if tag in activity.tags:
-            activity.tags.remove(tag)
+            activity.tags = [t for t in activity.tags if t != tag]
             activity.updated_at = now_naive()
             session.add(activity)
             await session.commit()
@@ -289,14 +350,7 @@ class ActivityCRUD:
 
     @staticmethod
     async def get_all_tags(session: AsyncSession) -> List[str]:
-        """获取所有使用过的标签"""
-        statement = select(Activity.tags)
-        result = await session.exec(statement)
-        all_tags = result.all()
-
-        # 展平标签列表并去重
-        unique_tags = set()
-        for tags in all_tags:
-            unique_tags.update(tags)
+        """获取所有使用过的标签（读取触发器维护的 tag_counts，不扫描活动表）"""
+        from ..tag_count.crud import TagCountCRUD
 
-        return sorted(list(unique_tags))
+        return await TagCountCRUD.list_tags(session, "activities")
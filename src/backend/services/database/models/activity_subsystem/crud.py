@@ -7,6 +7,8 @@ from typing import List, Optional, Tuple
 from sqlmodel import select, func, delete
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from services.database.events_cache import mark_tables_changed
+
 from .base import ActActivity, ActVoteOption, ActVoteRecord, ActThreadPost, ActAuditLog
 
 
@@ -56,6 +58,14 @@ class ActActivityCRUD:
 
         # Delete the activity itself
         await session.exec(delete(ActActivity).where(ActActivity.id == activity_id))
+        # Core 级删除不经过 ORM 事件，需手动登记以触发提交后的缓存/ETag 失效
+        mark_tables_changed(
+            session,
+            ActActivity.__tablename__,
+            ActVoteOption.__tablename__,
+            ActVoteRecord.__tablename__,
+            ActThreadPost.__tablename__,
+        )
         await session.commit()
         return True
 
@@ -5,6 +5,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, text
 from pydantic import ConfigDict, field_serializer, field_validator, model_validator
 
 from ..base import now_naive, to_naive_beijing
@@ -13,7 +14,15 @@ from ..base import now_naive, to_naive_beijing
 class Comment(SQLModel, table=True):
     """评论模型"""
     __tablename__ = "comments"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # 管理端高点踩队列：WHERE NOT is_deleted AND dislikes >= ? ORDER BY dislikes DESC, id 走索引范围扫描
+        Index("ix_comments_dislikes_active", text("dislikes DESC"), "id",
+              postgresql_where=text("NOT is_deleted")),
+        # 成员评论列表：WHERE member_id = ? AND is_deleted = false ORDER BY created_at DESC, id DESC
+        Index("ix_comments_member_deleted_created", "member_id", "is_deleted",
+              text("created_at DESC"), text("id DESC")),
+        {'extend_existing': True},
+    )
     model_config = ConfigDict(validate_assignment=True)
     
     # 主键
@@ -1,36 +1,112 @@
 """
 评论CRUD操作
 """
+import logging
+from collections import Counter
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import desc, func, and_, delete
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import desc, func, and_, delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from .base import Comment, CommentCreate, CommentUpdate, CommentStats
 from ..base import now_naive
+from ..member.base import Member
+
+logger = logging.getLogger(__name__)
 
 
 class CommentCRUD:
-    """评论CRUD操作类"""
+    """评论CRUD操作类
+
+    成员上的 comment_count / last_comment_at 在评论写入的同一事务中维护：新增时原子自增，
+    删除或恢复时按 ix_comments_member_deleted_created 重新统计该成员（自愈，不会累积误差）。
+    影响成员评论首页内容的写入在提交后删除其缓存。
+    """
 
     @staticmethod
     async def create(db: AsyncSession, comment_data: CommentCreate) -> Comment:
         """创建新评论"""
         comment = Comment(**comment_data.model_dump())
         db.add(comment)
+        await db.flush()
+        await db.execute(
+            update(Member)
+            .where(Member.id == comment.member_id)
+            .values(comment_count=Member.comment_count + 1, last_comment_at=comment.created_at)
+            .execution_options(synchronize_session=False)
+        )
         await db.commit()
         await db.refresh(comment)
+        await CommentCRUD.invalidate_member_first_page(comment.member_id)
         return comment
 
+    @staticmethod
+    async def recount_member(db: AsyncSession, member_id: int) -> None:
+        """按评论表重新计算成员的 comment_count / last_comment_at（不提交）"""
+        active = and_(Comment.member_id == member_id, Comment.is_deleted == False)  # noqa: E712
+        await db.flush()
+        await db.execute(
+            update(Member)
+            .where(Member.id == member_id)
+            .values(
+                comment_count=select(func.count(Comment.id)).where(active).scalar_subquery(),
+                last_comment_at=select(func.max(Comment.created_at)).where(active).scalar_subquery(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def get_member_comment_count(db: AsyncSession, member_id: int) -> Optional[int]:
+        """成员的未删除评论数（读反规范化计数）；成员不存在时返回 None"""
+        result = await db.execute(select(Member.comment_count).where(Member.id == member_id))
+        row = result.first()
+        return int(row[0] or 0) if row is not None else None
+
+    @staticmethod
+    async def invalidate_member_first_page(member_id: int) -> None:
+        """删除成员评论首页缓存（失败只记录日志）"""
+        await CommentCRUD.invalidate_member_first_pages([member_id])
+
+    @staticmethod
+    async def invalidate_member_first_pages(member_ids: Iterable[int]) -> None:
+        from services.deps import get_cache_service
+        from services.cache.keys import member_comments_first_page_key
+
+        try:
+            cache_service = get_cache_service()
+            for member_id in member_ids:
+                await cache_service.delete(member_comments_first_page_key(member_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate comment page cache: {e}")
+
     @staticmethod
     async def delete_by_member_id(db: AsyncSession, member_id: int) -> int:
         """硬删除指定成员的所有评论，返回删除条数"""
         result = await db.execute(delete(Comment).where(Comment.member_id == member_id))
+        await CommentCRUD.recount_member(db, member_id)
         await db.commit()
+        await CommentCRUD.invalidate_member_first_page(member_id)
         # rowcount may be -1 depending on backend; normalize to int
         return int(result.rowcount or 0)
 
+    @staticmethod
+    async def delete_by_member_ids(db: AsyncSession, member_ids: List[int], *, commit: bool = True) -> Dict[int, int]:
+        """批量硬删除多个成员的评论（单条 DELETE ... RETURNING），返回 {member_id: 删除条数}
+
+        用于成员退群清理：成员随后一并删除，因此不维护计数；首页缓存请在提交后调用
+        invalidate_member_first_pages。
+        """
+        if not member_ids:
+            return {}
+        result = await db.execute(
+            delete(Comment).where(Comment.member_id.in_(member_ids)).returning(Comment.member_id)
+        )
+        counts = Counter(result.scalars().all())
+        if commit:
+            await db.commit()
+        return dict(counts)
+
     @staticmethod
     async def get_by_id(db: AsyncSession, comment_id: int) -> Optional[Comment]:
         """根据ID获取评论"""
@@ -55,7 +131,7 @@ class CommentCRUD:
         if not include_deleted:
             query = query.where(Comment.is_deleted == False)
         
-        query = query.order_by(desc(Comment.created_at)).offset(offset).limit(page_size)
+        query = query.order_by(desc(Comment.created_at), desc(Comment.id)).offset(offset).limit(page_size)
         
         result = await db.execute(query)
         return result.scalars().all()
@@ -88,12 +164,16 @@ class CommentCRUD:
         
         update_data = comment_data.model_dump(exclude_unset=True)
         if update_data:
+            was_deleted = comment.is_deleted
             update_data['updated_at'] = now_naive()
             for field, value in update_data.items():
                 setattr(comment, field, value)
+            if comment.is_deleted != was_deleted:
+                await CommentCRUD.recount_member(db, comment.member_id)
             
             await db.commit()
             await db.refresh(comment)
+            await CommentCRUD.invalidate_member_first_page(comment.member_id)
         
         return comment
     
@@ -108,6 +188,7 @@ class CommentCRUD:
         comment.updated_at = now_naive()
         await db.commit()
         await db.refresh(comment)
+        await CommentCRUD.invalidate_member_first_page(comment.member_id)
         return comment
     
     @staticmethod
@@ -121,6 +202,7 @@ class CommentCRUD:
         comment.updated_at = now_naive()
         await db.commit()
         await db.refresh(comment)
+        await CommentCRUD.invalidate_member_first_page(comment.member_id)
         return comment
     
     @staticmethod
@@ -130,40 +212,35 @@ class CommentCRUD:
         if not comment:
             return None
         
+        was_deleted = comment.is_deleted
         comment.is_deleted = True
         comment.updated_at = now_naive()
+        if not was_deleted:
+            await CommentCRUD.recount_member(db, comment.member_id)
         await db.commit()
         await db.refresh(comment)
+        await CommentCRUD.invalidate_member_first_page(comment.member_id)
         return comment
     
     @staticmethod
     async def get_stats(db: AsyncSession) -> CommentStats:
-        """获取评论统计信息"""
-        # 总评论数
-        total_result = await db.execute(select(func.count(Comment.id)))
-        total_comments = total_result.scalar() or 0
-        
-        # 活跃评论数
-        active_result = await db.execute(
-            select(func.count(Comment.id)).where(Comment.is_deleted == False)
-        )
-        active_comments = active_result.scalar() or 0
-        
-        # 已删除评论数
+        """获取评论统计信息（单次扫描：各聚合用 FILTER 子句区分活跃/已删除）"""
+        active = Comment.is_deleted == False  # noqa: E712
+        row = (await db.execute(
+            select(
+                func.count(Comment.id).label("total"),
+                func.count(Comment.id).filter(active).label("active"),
+                func.sum(Comment.likes).filter(active).label("likes"),
+                func.sum(Comment.dislikes).filter(active).label("dislikes"),
+            )
+        )).one()
+
+        total_comments = int(row.total or 0)
+        active_comments = int(row.active or 0)
         deleted_comments = total_comments - active_comments
-        
-        # 总点赞数
-        likes_result = await db.execute(
-            select(func.sum(Comment.likes)).where(Comment.is_deleted == False)
-        )
-        total_likes = likes_result.scalar() or 0
-        
-        # 总点踩数
-        dislikes_result = await db.execute(
-            select(func.sum(Comment.dislikes)).where(Comment.is_deleted == False)
-        )
-        total_dislikes = dislikes_result.scalar() or 0
-        
+        total_likes = int(row.likes or 0)
+        total_dislikes = int(row.dislikes or 0)
+
         return CommentStats(
             total_comments=total_comments,
             total_likes=total_likes,
@@ -179,7 +256,11 @@ class CommentCRUD:
         page: int = 1, 
         page_size: int = 20
     ) -> List[Comment]:
-        """获取高点踩数的评论（用于管理员清理）"""
+        """获取高点踩数的评论（用于管理员清理）
+
+        条件与排序（dislikes DESC, id）与部分索引 ix_comments_dislikes_active 一致，
+        按索引顺序取一页即可，无需扫描并排序全表。
+        """
         offset = (page - 1) * page_size
         
         query = select(Comment).where(
@@ -187,7 +268,20 @@ class CommentCRUD:
                 Comment.dislikes >= threshold,
                 Comment.is_deleted == False
             )
-        ).order_by(desc(Comment.dislikes)).offset(offset).limit(page_size)
+        ).order_by(desc(Comment.dislikes), Comment.id).offset(offset).limit(page_size)
         
         result = await db.execute(query)
         return result.scalars().all()
+
+    @staticmethod
+    async def count_high_dislike_comments(db: AsyncSession, threshold: int = 10) -> int:
+        """高点踩评论总数（同样只访问部分索引覆盖的行）"""
+        result = await db.execute(
+            select(func.count(Comment.id)).where(
+                and_(
+                    Comment.dislikes >= threshold,
+                    Comment.is_deleted == False
+                )
+            )
+        )
+        return int(result.scalar() or 0)
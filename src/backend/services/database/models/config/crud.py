@@ -37,7 +37,7 @@ class ConfigCRUD:
     @staticmethod
     async def get_value_by_key(session: AsyncSession, key: str) -> Optional[str]:
         """根据key获取配置值"""
-        config = await session.get(Config, key)
+        config = await ConfigCRUD.get_by_key(session, key)
         return config.value if config else None
     
     @staticmethod
@@ -136,7 +136,7 @@ class ConfigCRUD:
     @staticmethod
     async def update_value(session: AsyncSession, key: str, value: str) -> Optional[Config]:
         """更新配置值"""
-        config = await session.get(Config, key)
+        config = await ConfigCRUD.get_by_key(session, key)
         if not config:
             return None
         
@@ -151,7 +151,7 @@ class ConfigCRUD:
     @staticmethod
     async def upsert(session: AsyncSession, key: str, value: str, description: Optional[str] = None) -> Config:
         """插入或更新配置（如果key存在则更新，否则创建）"""
-        config = await session.get(Config, key)
+        config = await ConfigCRUD.get_by_key(session, key)
         
         if config:
             # 更新现有配置
@@ -213,8 +213,9 @@ class ConfigCRUD:
     @staticmethod
     async def exists(session: AsyncSession, key: str) -> bool:
         """检查配置是否存在"""
-        config = await session.get(Config, key)
-        return config is not None
+        statement = select(func.count(Config.id)).where(Config.key == key)
+        result = await session.exec(statement)
+        return result.one() > 0
     
     @staticmethod
     async def count_total(session: AsyncSession) -> int:
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 from sqlalchemy.dialects.postgresql import JSONB
 from pydantic import ConfigDict, field_validator, model_validator
 
@@ -11,7 +12,12 @@ from ..base import now_naive, to_naive_beijing
 class DailyPost(SQLModel, table=True):
     """Daily posts table model."""
     __tablename__ = "daily_posts"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # 标签过滤 tags @> '["x"]'（jsonb_path_ops 只支持包含查询，体积更小）
+        Index("ix_daily_posts_tags_gin", "tags",
+              postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        {"extend_existing": True},
+    )
     model_config = ConfigDict(validate_assignment=True)
 
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -102,6 +108,29 @@ class DailyPostRead(SQLModel):
     updated_at: datetime
 
 
+# 列表（summary）投影读取的列：不含 content_jsonb，images 只取第一张（见 DailyPostSummary.first_image）
+DAILY_POST_SUMMARY_COLUMNS = (
+    "id", "author_user_id", "content", "tags",
+    "likes_count", "comments_count", "views_count", "published",
+    "created_at", "updated_at",
+)
+
+
+class DailyPostSummary(SQLModel):
+    """列表投影：不加载 Tiptap 全文 JSON，只带摘要文本与首图"""
+    id: int
+    author_user_id: int
+    content: Optional[str] = None
+    first_image: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)
+    likes_count: int
+    comments_count: int
+    views_count: int
+    published: bool
+    created_at: datetime
+    updated_at: datetime
+
+
 class DailyPostUpdate(SQLModel):
     """Patch-update model for DailyPost.
     Backward compatible: allow updating content_jsonb or legacy fields.
@@ -2,17 +2,36 @@
 CRUD operations for DailyPost
 """
 from __future__ import annotations
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Union
 
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .base import DailyPost, DailyPostCreate, DailyPostUpdate
+from .base import DailyPost, DailyPostCreate, DailyPostUpdate, DailyPostSummary, DAILY_POST_SUMMARY_COLUMNS
 
 from sqlalchemy import delete as sa_delete
 from ..daily_post_comment.base import DailyPostComment
 
 
+DAILY_POST_VIEWS = ("summary", "full")
+
+
+def _list_statement(view: str):
+    """列表查询的 SELECT：full 读取整行；summary 只读摘要列与 images->0，content_jsonb 不出库"""
+    if view == "full":
+        return select(DailyPost)
+    if view != "summary":
+        raise ValueError(f"Unknown daily post view: {view}")
+    columns = [getattr(DailyPost, name) for name in DAILY_POST_SUMMARY_COLUMNS]
+    return select(*columns, DailyPost.images[0].label("first_image"))
+
+
+def _list_rows(view: str, rows) -> List[Union[DailyPost, DailyPostSummary]]:
+    if view == "full":
+        return list(rows)
+    return [DailyPostSummary.model_validate(dict(row._mapping)) for row in rows]
+
+
 class DailyPostCRUD:
     """CRUD utilities for DailyPost."""
 
@@ -131,29 +150,35 @@ class DailyPostCRUD:
         tag: Optional[str] = None,
         author_user_id: Optional[int] = None,
         published_only: bool = True,
-    ) -> Tuple[List[DailyPost], int]:
-        stmt = select(DailyPost)
+        view: str = "full",
+    ) -> Tuple[List[Union[DailyPost, DailyPostSummary]], int]:
+        """分页列表；view="summary" 时返回 DailyPostSummary（不读取 content_jsonb）"""
+        stmt = _list_statement(view)
         if published_only:
             stmt = stmt.where(DailyPost.published == True)
-        # TODO: tag 过滤可在后续使用 JSONB 操作符实现（避免跨数据库不兼容问题）
+        if tag:
+            # tags @> '["tag"]'，走 GIN 索引 ix_daily_posts_tags_gin
+            stmt = stmt.where(DailyPost.tags.contains([tag]))
         if author_user_id:
             stmt = stmt.where(DailyPost.author_user_id == author_user_id)
         from sqlmodel import func as sf
-        total_stmt = stmt.with_only_columns(sf.count())
+        total_stmt = stmt.with_only_columns(sf.count(), maintain_column_froms=True)
         total = (await session.exec(total_stmt)).one()
         stmt = stmt.order_by(DailyPost.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
         results = (await session.exec(stmt)).all()
-        return results, total
+        return _list_rows(view, results), total
 
     @staticmethod
-    async def list_trending(session: AsyncSession, limit: int = 12) -> List[DailyPost]:
+    async def list_trending(
+        session: AsyncSession, limit: int = 12, view: str = "full"
+    ) -> List[Union[DailyPost, DailyPostSummary]]:
         stmt = (
-            select(DailyPost)
+            _list_statement(view)
             .where(DailyPost.published == True)
             .order_by(DailyPost.views_count.desc(), DailyPost.created_at.desc())
             .limit(limit)
         )
-        return (await session.exec(stmt)).all()
+        return _list_rows(view, (await session.exec(stmt)).all())
 
     @staticmethod
     async def increment_views(session: AsyncSession, post_id: int) -> Optional[int]:
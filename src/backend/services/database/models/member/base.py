@@ -4,6 +4,7 @@
 from datetime import datetime
 from typing import Optional
 from sqlmodel import SQLModel, Field
+from sqlalchemy import DDL, Index, event
 from pydantic import ConfigDict, field_validator, model_validator
 
 from ..base import now_naive, to_naive_beijing
@@ -12,7 +13,16 @@ from ..base import now_naive, to_naive_beijing
 class Member(SQLModel, table=True):
     """群成员模型"""
     __tablename__ = "members"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # 昵称模糊搜索（pg_trgm）：支持 ILIKE '%x%' 与相似度排序
+        Index("ix_members_display_name_trgm", "display_name",
+              postgresql_using="gin", postgresql_ops={"display_name": "gin_trgm_ops"}),
+        Index("ix_members_group_nick_trgm", "group_nick",
+              postgresql_using="gin", postgresql_ops={"group_nick": "gin_trgm_ops"}),
+        Index("ix_members_qq_nick_trgm", "qq_nick",
+              postgresql_using="gin", postgresql_ops={"qq_nick": "gin_trgm_ops"}),
+        {'extend_existing': True},
+    )
     model_config = ConfigDict(validate_assignment=True)
     
     # 主键：代理ID（对外公开的安全ID）
@@ -49,8 +59,12 @@ class Member(SQLModel, table=True):
     # Q龄
     q_age: Optional[int] = Field(default=0)
     
-    # 创建时间（无时区北京时间）
-    created_at: datetime = Field(default_factory=now_naive)
+    # 未删除评论数与最近一条评论时间（由 CommentCRUD 在评论增删的同一事务中维护）
+    comment_count: int = Field(default=0)
+    last_comment_at: Optional[datetime] = None
+
+    # 创建时间（无时区北京时间）；可绑定成员目录按此排序
+    created_at: datetime = Field(default_factory=now_naive, index=True)
 
     # 更新时间（无时区北京时间）
     updated_at: datetime = Field(default_factory=now_naive)
@@ -130,3 +144,11 @@ class MemberUpdate(SQLModel):
     level_point: Optional[int] = None
     level_value: Optional[int] = None
     q_age: Optional[int] = None
+
+
+# create_all 建表前确保 pg_trgm 扩展存在（迁移中同样会创建）
+event.listen(
+    Member.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
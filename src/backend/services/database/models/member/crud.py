@@ -1,14 +1,17 @@
 """
 Member表的CRUD操作
 """
+from array import array
 from typing import List, Optional, Tuple, Dict
 from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import delete as sa_delete, or_, case, exists
 
 from .base import Member, MemberCreate, MemberRead, MemberUpdate
 from ..base import now_naive
 
 from services.deps import get_cache_service, get_config_service
+from services.cache.keys import MEMBER_BINDABLE_IDS
 
 
 def _get_member_cache_ttl() -> int:
@@ -184,6 +187,37 @@ class MemberCRUD:
         result = await session.exec(statement)
         return result.all()
 
+    @staticmethod
+    async def search(session: AsyncSession, keyword: str, limit: int = 20) -> List[Tuple[Member, float]]:
+        """模糊搜索成员（显示名/群昵称/QQ昵称），按相关度排序
+
+        依赖 pg_trgm GIN 索引：ILIKE '%x%' 与 % 相似度运算都可走索引。
+        排序：完整匹配 > 前缀匹配 > 三元组相似度。
+        """
+        keyword = (keyword or "").strip()
+        if not keyword:
+            return []
+        escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        columns = (Member.display_name, Member.group_nick, Member.qq_nick)
+        similarity = func.greatest(*[func.similarity(func.coalesce(c, ""), keyword) for c in columns])
+        exact = or_(*[func.lower(c) == keyword.lower() for c in columns])
+        prefix = or_(*[c.ilike(f"{escaped}%", escape="\\") for c in columns])
+        statement = (
+            select(Member, similarity.label("score"))
+            .where(or_(
+                *[c.ilike(f"%{escaped}%", escape="\\") for c in columns],
+                *[c.op("%")(keyword) for c in columns],
+            ))
+            .order_by(
+                case((exact, 0), (prefix, 1), else_=2),
+                similarity.desc(),
+                Member.id,
+            )
+            .limit(limit)
+        )
+        result = await session.exec(statement)
+        return [(member, float(score or 0.0)) for member, score in result.all()]
+
     @staticmethod
     async def update(session: AsyncSession, member_id: int, member_data: MemberUpdate) -> Optional[Member]:
         """更新成员信息"""
@@ -236,6 +270,80 @@ class MemberCRUD:
 
         return True
 
+    @staticmethod
+    async def delete_many(session: AsyncSession, member_ids: List[int], *, commit: bool = True) -> List[int]:
+        """批量删除成员（单条 DELETE ... RETURNING），返回实际删除的成员ID。
+
+        commit=False 时由调用方统一提交；缓存失效请在提交后调用 invalidate_cache_many。
+        """
+        if not member_ids:
+            return []
+        result = await session.execute(
+            sa_delete(Member).where(Member.id.in_(member_ids)).returning(Member.id)
+        )
+        deleted_ids = list(result.scalars().all())
+        if commit:
+            await session.commit()
+            await MemberCRUD.invalidate_cache_many(deleted_ids)
+        return deleted_ids
+
+    @staticmethod
+    async def invalidate_cache_many(member_ids: List[int]) -> None:
+        """批量删除 member:id:{id} 缓存"""
+        if not member_ids:
+            return
+        try:
+            cache_service = get_cache_service()
+            for member_id in member_ids:
+                await cache_service.delete(f"member:id:{member_id}")
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Failed to delete cache for members {member_ids[:10]}...: {e}")
+
+    @staticmethod
+    async def get_bindable_ids(session: AsyncSession) -> array:
+        """获取未被任何用户绑定的成员ID（按 created_at DESC, id DESC 排序）
+
+        NOT EXISTS 反连接（users.member_id 唯一索引 + members.created_at 索引），
+        结果以紧凑的 array('q') 缓存；成员变更由 events_cache 失效，绑定后由调用方失效。
+        """
+        try:
+            cache_service = get_cache_service()
+            cached_ids = await cache_service.get(MEMBER_BINDABLE_IDS)
+            if cached_ids is not None:
+                return cached_ids
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Failed to get bindable member ids from cache: {e}")
+
+        from ..user.base import User
+
+        statement = (
+            select(Member.id)
+            .where(~exists().where(User.member_id == Member.id))
+            .order_by(Member.created_at.desc(), Member.id.desc())
+        )
+        result = await session.exec(statement)
+        ids = array("q", result.all())
+
+        try:
+            cache_service = get_cache_service()
+            await cache_service.set(MEMBER_BINDABLE_IDS, ids, ttl=_get_member_cache_ttl())
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Failed to cache bindable member ids: {e}")
+        return ids
+
+    @staticmethod
+    async def invalidate_bindable_ids() -> None:
+        """绑定关系变化后失效可绑定成员缓存"""
+        try:
+            cache_service = get_cache_service()
+            await cache_service.delete(MEMBER_BINDABLE_IDS)
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Failed to invalidate bindable member ids: {e}")
+
     @staticmethod
     async def count_total(session: AsyncSession) -> int:
         """获取成员总数"""
@@ -0,0 +1,12 @@
+"""
+标签计数模块
+"""
+from .base import TagCount, TagCountRead, TAG_SCOPES
+from .crud import TagCountCRUD
+
+__all__ = [
+    "TagCount",
+    "TagCountRead",
+    "TAG_SCOPES",
+    "TagCountCRUD",
+]
@@ -0,0 +1,89 @@
+"""
+标签计数数据模型
+中文注释：tag_counts 按作用域（daily_posts / activities）保存每个标签的使用次数，
+由数据库触发器在 daily_posts、activities 的 tags（以及动态的 published）变化时于同一事务内增量维护，
+批量 UPDATE/DELETE 等绕过 ORM 的写入同样生效。标签云直接读取该表，无需扫描原表展开 JSONB 数组。
+
+  - 日常动态只统计已发布（published = true）的帖子，与列表接口的可见范围一致；
+  - 同一行中重复的标签只计一次；计数归零的行保留（查询时过滤），避免并发下删除与插入相互竞争。
+"""
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+from sqlalchemy import DDL, event
+
+TAG_SCOPES = ("daily_posts", "activities")
+
+
+class TagCount(SQLModel, table=True):
+    """标签计数表"""
+    __tablename__ = "tag_counts"
+    __table_args__ = {'extend_existing': True}
+
+    # 作用域：来源表名
+    scope: str = Field(primary_key=True, max_length=20)
+    # 标签
+    tag: str = Field(primary_key=True, max_length=100)
+    # 使用该标签的行数
+    count: int = Field(default=0)
+
+
+class TagCountRead(SQLModel):
+    """标签计数读取模型"""
+    tag: str
+    count: int
+
+
+# 触发器函数：TG_ARGV[0] 为作用域；新旧行的 published 通过 to_jsonb 读取，缺少该列的表视为始终计数
+TAG_COUNTS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tag_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    old_tags jsonb := '[]'::jsonb;
+    new_tags jsonb := '[]'::jsonb;
+BEGIN
+    IF TG_OP <> 'INSERT' AND COALESCE((to_jsonb(OLD) ->> 'published')::boolean, true)
+       AND jsonb_typeof(OLD.tags) = 'array' THEN
+        old_tags := OLD.tags;
+    END IF;
+    IF TG_OP <> 'DELETE' AND COALESCE((to_jsonb(NEW) ->> 'published')::boolean, true)
+       AND jsonb_typeof(NEW.tags) = 'array' THEN
+        new_tags := NEW.tags;
+    END IF;
+    IF old_tags = new_tags THEN
+        RETURN NULL;
+    END IF;
+
+    WITH o AS (SELECT DISTINCT value AS tag FROM jsonb_array_elements_text(old_tags)),
+         n AS (SELECT DISTINCT value AS tag FROM jsonb_array_elements_text(new_tags)),
+         d AS (
+             SELECT tag, 1 AS delta FROM n WHERE tag NOT IN (SELECT tag FROM o)
+             UNION ALL
+             SELECT tag, -1 AS delta FROM o WHERE tag NOT IN (SELECT tag FROM n)
+         )
+    INSERT INTO tag_counts (scope, tag, count)
+    SELECT TG_ARGV[0], left(tag, 100), sum(delta) FROM d GROUP BY left(tag, 100)
+    ON CONFLICT (scope, tag) DO UPDATE SET count = tag_counts.count + EXCLUDED.count;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def tag_counts_trigger_sql(table: str, columns: str) -> str:
+    return (
+        f"DROP TRIGGER IF EXISTS {table}_tag_counts ON {table};\n"
+        f"CREATE TRIGGER {table}_tag_counts AFTER INSERT OR DELETE OR UPDATE OF {columns} ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION tag_counts_apply('{table}')"
+    )
+
+
+# create_all（无迁移的开发库）时同样安装函数与触发器；全部表创建完成后执行，语句可重复执行
+event.listen(
+    SQLModel.metadata,
+    "after_create",
+    DDL(TAG_COUNTS_FUNCTION_SQL).execute_if(dialect="postgresql"),
+)
+for _table, _columns in (("daily_posts", "tags, published"), ("activities", "tags")):
+    for _statement in tag_counts_trigger_sql(_table, _columns).split(";\n"):
+        event.listen(SQLModel.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
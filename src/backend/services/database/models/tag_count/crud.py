@@ -0,0 +1,76 @@
+"""
+TagCount表的查询与重建
+"""
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from services.database.events_cache import mark_tables_changed
+
+from .base import TagCount, TAG_SCOPES
+
+# 按源表全量重算某个作用域的计数（修复或初始化时使用；日常动态只统计已发布的帖子）
+_REBUILD_SQL = {
+    "daily_posts": """
+        SELECT left(t.tag, 100) AS tag, count(DISTINCT p.id) AS count
+        FROM daily_posts AS p
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(p.tags) = 'array' THEN p.tags ELSE '[]'::jsonb END
+        ) AS t(tag)
+        WHERE p.published
+        GROUP BY left(t.tag, 100)
+    """,
+    "activities": """
+        SELECT left(t.tag, 100) AS tag, count(DISTINCT a.id) AS count
+        FROM activities AS a
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(a.tags) = 'array' THEN a.tags ELSE '[]'::jsonb END
+        ) AS t(tag)
+        GROUP BY left(t.tag, 100)
+    """,
+}
+
+
+class TagCountCRUD:
+    """TagCount表的操作类"""
+
+    @staticmethod
+    async def list_top(
+        session: AsyncSession,
+        scope: str,
+        limit: int = 50,
+        prefix: Optional[str] = None,
+    ) -> List[TagCount]:
+        """按使用次数倒序返回标签（主键 (scope, tag) 上的范围扫描，表本身只有标签量级的行）"""
+        statement = select(TagCount).where(TagCount.scope == scope, TagCount.count > 0)
+        if prefix:
+            statement = statement.where(TagCount.tag.startswith(prefix, autoescape=True))
+        statement = statement.order_by(TagCount.count.desc(), TagCount.tag).limit(limit)
+        result = await session.exec(statement)
+        return result.all()
+
+    @staticmethod
+    async def list_tags(session: AsyncSession, scope: str) -> List[str]:
+        """作用域内所有在用的标签（按名称排序）"""
+        statement = select(TagCount.tag).where(TagCount.scope == scope, TagCount.count > 0).order_by(TagCount.tag)
+        result = await session.exec(statement)
+        return list(result.all())
+
+    @staticmethod
+    async def rebuild(session: AsyncSession, scope: str) -> int:
+        """按源表重算作用域内的全部计数并提交，返回标签数"""
+        if scope not in TAG_SCOPES:
+            raise ValueError(f"Unknown tag scope: {scope}")
+        # 锁住源表的写入，避免重算期间触发器的增量与全量结果交错
+        await session.execute(text(f"LOCK TABLE {scope} IN SHARE MODE"))
+        await session.execute(text("DELETE FROM tag_counts WHERE scope = :scope"), {"scope": scope})
+        result = await session.execute(
+            text(f"INSERT INTO tag_counts (scope, tag, count) SELECT :scope, tag, count FROM ({_REBUILD_SQL[scope]}) AS s"),
+            {"scope": scope},
+        )
+        # 原生 SQL 不经过 ORM 事件：登记源表变更，使 tags.facet 的 ETag 随重建一起失效
+        mark_tables_changed(session, scope)
+        await session.commit()
+        return int(result.rowcount or 0)
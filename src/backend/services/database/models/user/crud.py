@@ -5,6 +5,7 @@ from datetime import datetime
 from ..base import now_naive
 from typing import Optional, List
 from sqlmodel import Session, select
+from sqlalchemy import update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
 from .base import User, UserCreate, UserUpdate
 
@@ -45,6 +46,22 @@ class UserCRUD:
         result = await session.exec(statement)
         return result.first()
 
+    @staticmethod
+    async def unbind_members(session: AsyncSession, member_ids: List[int], *, commit: bool = True) -> List[str]:
+        """解除与给定成员的绑定（member_id 置空），返回受影响的用户名"""
+        if not member_ids:
+            return []
+        result = await session.execute(
+            sa_update(User)
+            .where(User.member_id.in_(member_ids))
+            .values(member_id=None, updated_at=now_naive())
+            .returning(User.username)
+        )
+        usernames = list(result.scalars().all())
+        if commit:
+            await session.commit()
+        return usernames
+
     @staticmethod
     async def get_all(session: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
         """获取所有用户"""
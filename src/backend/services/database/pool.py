@@ -0,0 +1,278 @@
+"""
+数据库连接池配置与观测
+中文注释：InstrumentedQueuePool 在 AsyncAdaptedQueuePool 的 checkout 路径上计时，统计
+等待时长（含建连）、排队次数（取连接时既无空闲连接也无溢出名额）、超时次数与峰值占用；
+当前请求的等待时长同时累加到 RequestMetrics，随 Server-Timing 的 pool 段返回。
+
+自适应模式（db_pool_adaptive）按窗口评估 checkout 等待 p95：
+  - warn：超过阈值时记录告警（每个窗口最多一次）；
+  - resize：超过阈值时逐步提高 max_overflow（不超过 db_pool_adaptive_max_overflow），
+    连续平稳时逐步回落到配置值。只调整溢出连接数：常驻连接数（pool_size）决定空闲时
+    保留的连接，运行中改动队列容量并不安全，溢出连接在归还时即关闭，收缩无需额外处理。
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+ADAPTIVE_MODES = ("off", "warn", "resize")
+
+# 最近 checkout 等待样本数（用于分位数）
+_RECENT_SAMPLES = 1024
+# 自适应调整记录保留条数
+_EVENT_HISTORY = 20
+
+
+@dataclass(frozen=True)
+class PoolOptions:
+    """连接池参数（来自 Settings 的 db_pool_* 配置）"""
+
+    pool_size: int = 10
+    max_overflow: int = 20
+    timeout: float = 30.0
+    recycle: int = 1800
+    pre_ping: bool = True
+    use_lifo: bool = False
+    wait_threshold_ms: float = 100.0
+    adaptive: str = "off"
+    adaptive_max_overflow: int = 40
+    adaptive_window_seconds: float = 30.0
+
+    @classmethod
+    def from_settings(cls, settings) -> "PoolOptions":
+        adaptive = (settings.db_pool_adaptive or "off").lower()
+        if adaptive not in ADAPTIVE_MODES:
+            logger.warning(f"Unknown db_pool_adaptive={settings.db_pool_adaptive!r}, using 'off'")
+            adaptive = "off"
+        return cls(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            timeout=settings.db_pool_timeout,
+            recycle=settings.db_pool_recycle,
+            pre_ping=settings.db_pool_pre_ping,
+            use_lifo=settings.db_pool_use_lifo,
+            wait_threshold_ms=settings.db_pool_wait_threshold_ms,
+            adaptive=adaptive,
+            adaptive_max_overflow=max(settings.db_max_overflow, settings.db_pool_adaptive_max_overflow),
+            adaptive_window_seconds=settings.db_pool_adaptive_window,
+        )
+
+    def engine_kwargs(self) -> Dict[str, Any]:
+        """create_async_engine 的连接池参数"""
+        return {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.timeout,
+            "pool_recycle": self.recycle,
+            "pool_pre_ping": self.pre_ping,
+            "pool_use_lifo": self.use_lifo,
+        }
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 2)
+
+
+class PoolMonitor:
+    """连接池统计与自适应调整；随 engine.dispose() 重建的连接池共享同一实例"""
+
+    def __init__(self, options: PoolOptions) -> None:
+        self.options = options
+        self.started_at = time.time()
+        self.checkouts = 0
+        self.queued = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waiting = 0
+        self.peak_in_use = 0
+        self.peak_waiting = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self._recent: Deque[float] = deque(maxlen=_RECENT_SAMPLES)
+        self._window: List[float] = []
+        self._window_started = time.monotonic()
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=_EVENT_HISTORY)
+
+    def observe(self, pool: "InstrumentedQueuePool", wait_ms: float, timed_out: bool = False) -> None:
+        self.checkouts += not timed_out
+        self.timeouts += timed_out
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.peak_in_use = max(self.peak_in_use, pool.checkedout())
+        self._recent.append(wait_ms)
+        self._window.append(wait_ms)
+
+        from services.metrics.service import current_request_metrics
+
+        rm = current_request_metrics()
+        if rm is not None:
+            rm.pool_wait_ms += wait_ms
+
+        if time.monotonic() - self._window_started >= self.options.adaptive_window_seconds:
+            self._evaluate(pool)
+
+    def _evaluate(self, pool: "InstrumentedQueuePool") -> None:
+        window = sorted(self._window)
+        self._window = []
+        self._window_started = time.monotonic()
+        mode = self.options.adaptive
+        if mode == "off" or not window:
+            return
+
+        p95 = _percentile(window, 0.95)
+        threshold = self.options.wait_threshold_ms
+        current = pool._max_overflow
+        if p95 > threshold:
+            if mode == "resize" and current != -1 and current < self.options.adaptive_max_overflow:
+                step = max(1, self.options.pool_size // 2)
+                new = min(self.options.adaptive_max_overflow, current + step)
+                pool.set_max_overflow(new)
+                self._record("grow", p95, len(window), current, new)
+                logger.warning(
+                    f"DB pool checkout wait p95={p95}ms > {threshold}ms over {len(window)} checkouts, "
+                    f"max_overflow {current} -> {new}"
+                )
+            else:
+                self._record("warn", p95, len(window), current, current)
+                logger.warning(
+                    f"DB pool checkout wait p95={p95}ms > {threshold}ms over {len(window)} checkouts "
+                    f"(size={pool.size()}, max_overflow={current}, in_use={pool.checkedout()}); "
+                    f"consider raising DB_POOL_SIZE / DB_MAX_OVERFLOW"
+                )
+        elif mode == "resize" and current > self.options.max_overflow and p95 < threshold / 4:
+            step = max(1, self.options.pool_size // 2)
+            new = max(self.options.max_overflow, current - step)
+            pool.set_max_overflow(new)
+            self._record("shrink", p95, len(window), current, new)
+            logger.info(f"DB pool checkout wait back to p95={p95}ms, max_overflow {current} -> {new}")
+
+    def _record(self, action: str, p95: float, samples: int, before: int, after: int) -> None:
+        self.events.append({
+            "at": round(time.time(), 3),
+            "action": action,
+            "wait_p95_ms": p95,
+            "samples": samples,
+            "max_overflow_before": before,
+            "max_overflow_after": after,
+        })
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = sorted(self._recent)
+        attempts = self.checkouts + self.timeouts
+        return {
+            "since": self.started_at,
+            "checkouts": self.checkouts,
+            "queued_checkouts": self.queued,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "peak_in_use": self.peak_in_use,
+            "wait_ms": {
+                "avg": round(self.total_wait_ms / attempts, 2) if attempts else 0.0,
+                "p50": _percentile(recent, 0.50),
+                "p95": _percentile(recent, 0.95),
+                "p99": _percentile(recent, 0.99),
+                "max": round(self.max_wait_ms, 2),
+                "samples": len(recent),
+            },
+            "adaptive": {
+                "mode": self.options.adaptive,
+                "wait_threshold_ms": self.options.wait_threshold_ms,
+                "window_seconds": self.options.adaptive_window_seconds,
+                "max_overflow_ceiling": self.options.adaptive_max_overflow,
+                "events": list(self.events),
+            },
+        }
+
+    def reset(self) -> None:
+        self.__init__(self.options)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """带 checkout 计时的 AsyncAdaptedQueuePool"""
+
+    monitor: Optional[PoolMonitor] = None
+
+    def attach_monitor(self, monitor: PoolMonitor) -> None:
+        self.monitor = monitor
+
+        def on_connect(dbapi_connection, connection_record) -> None:
+            monitor.connects += 1
+
+        def on_invalidate(dbapi_connection, connection_record, exception) -> None:
+            monitor.invalidations += 1
+
+        # 新建连接（含 recycle/pre-ping 失败后的重连）与连接失效计数；重建的连接池继承这些监听
+        event.listen(self, "connect", on_connect)
+        event.listen(self, "invalidate", on_invalidate)
+
+    def set_max_overflow(self, value: int) -> None:
+        with self._overflow_lock:
+            self._max_overflow = value
+
+    def _do_get(self):
+        monitor = self.monitor
+        if monitor is None:
+            return super()._do_get()
+        # 没有空闲连接且溢出名额用尽：这次 checkout 必须排队等待归还
+        if self._pool.empty() and self._max_overflow != -1 and self._overflow >= self._max_overflow:
+            monitor.queued += 1
+        monitor.waiting += 1
+        monitor.peak_waiting = max(monitor.peak_waiting, monitor.waiting)
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except sa_exc.TimeoutError:
+            monitor.waiting -= 1
+            monitor.observe(self, (time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        except BaseException:
+            monitor.waiting -= 1
+            raise
+        monitor.waiting -= 1
+        monitor.observe(self, (time.perf_counter() - started) * 1000)
+        return record
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        # dispose() 后重建的连接池沿用统计与（可能已调整的）max_overflow；事件通过 _dispatch 继承
+        pool.monitor = self.monitor
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        options = self.monitor.options if self.monitor else None
+        data: Dict[str, Any] = {
+            "pool_class": type(self).__name__,
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "configured_max_overflow": options.max_overflow if options else self._max_overflow,
+            "timeout": self._timeout,
+            "recycle": self._recycle,
+            "pre_ping": self._pre_ping,
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+        }
+        if self.monitor is not None:
+            data.update(self.monitor.snapshot())
+        return data
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """连接池状态；非 InstrumentedQueuePool（如测试中的 NullPool）只返回基本信息"""
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"pool_class": type(pool).__name__, "status": pool.status()}
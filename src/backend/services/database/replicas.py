@@ -0,0 +1,223 @@
+"""
+只读副本路由
+中文注释：DatabaseService 可配置若干只读副本（热备 hot standby 或逻辑复制的实例）。
+公开读接口通过 get_read_session 取会话：GET/HEAD 请求轮询选择健康且复制延迟不超过
+db_replica_max_lag_seconds 的副本，没有可用副本时回退主库。
+
+  - 健康检查：后台任务每 db_replica_health_interval 秒在每个副本上查询 pg_is_in_recovery()
+    与回放延迟（已接收的 WAL 全部回放完时视为 0，避免主库空闲时误报延迟）；
+  - 取会话时先在副本上取连接（pre-ping），失败立即标记为不健康并改用主库；
+  - 写后读一致（read-your-writes）：写请求（非 GET/HEAD/OPTIONS）成功后下发 vd_rw Cookie，
+    有效期 db_read_your_writes_seconds 秒，期间该客户端的读请求仍走主库；
+  - 副本引擎以 default_transaction_read_only 连接，误用于写入时直接报错。
+
+  - 带 ETag 的请求（条件请求中间件已读取表版本号）始终走主库：ETag 对应的是最新版本，
+    副本上稍旧的响应体一旦与之配对，客户端会一直拿到 304，直到下一次写入；
+  - 副本会话的结果不写入共享的响应缓存（served_from_replica），缓存只由主库数据填充，
+    写后读一致的客户端也不会从缓存中读到旧数据。
+
+其他用户在复制延迟内仍可能读到稍旧的数据，但只影响本次响应，因此延迟阈值不宜大于几秒。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+READ_YOUR_WRITES_COOKIE = "vd_rw"
+# 副本会话在 session.info 中记录副本名，get_read_session 把它同步到 request.state
+REPLICA_SESSION_KEY = "read_replica"
+READ_METHODS = {"GET", "HEAD"}
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_LAG_SQL = text(
+    """
+    SELECT pg_is_in_recovery() AS in_recovery,
+           CASE
+               WHEN NOT pg_is_in_recovery() THEN 0
+               WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+               ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+           END AS lag_seconds
+    """
+)
+
+
+@dataclass(frozen=True)
+class ReplicaOptions:
+    """只读副本参数（来自 Settings 的 db_replica_* 配置）"""
+
+    max_lag_seconds: float = 5.0
+    health_interval: float = 5.0
+    read_your_writes_seconds: float = 5.0
+
+    @classmethod
+    def from_settings(cls, settings) -> "ReplicaOptions":
+        return cls(
+            max_lag_seconds=settings.db_replica_max_lag_seconds,
+            health_interval=settings.db_replica_health_interval,
+            read_your_writes_seconds=settings.db_read_your_writes_seconds,
+        )
+
+
+class Replica:
+    """单个只读副本及其最近一次健康检查结果"""
+
+    def __init__(self, url: str, engine: AsyncEngine) -> None:
+        self.url = url
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = engine
+        self.healthy = False  # 首次检查通过前不参与路由
+        self.in_recovery: Optional[bool] = None
+        self.lag_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.failures = 0
+        self.sessions = 0
+
+    def mark_down(self, error: BaseException) -> None:
+        if self.healthy:
+            logger.warning(f"Read replica {self.name} marked unhealthy: {error}")
+        self.healthy = False
+        self.failures += 1
+        self.last_error = str(error)[:200]
+
+    def stats(self) -> Dict[str, Any]:
+        from .pool import pool_stats
+
+        return {
+            "url": self.name,
+            "healthy": self.healthy,
+            "in_recovery": self.in_recovery,
+            "lag_seconds": self.lag_seconds,
+            "checked_at": self.checked_at,
+            "last_error": self.last_error,
+            "failures": self.failures,
+            "sessions": self.sessions,
+            "pool": pool_stats(self.engine.sync_engine.pool),
+        }
+
+
+class ReplicaSet:
+    """副本集合：健康检查、按延迟筛选与轮询选择"""
+
+    def __init__(self, replicas: List[Replica], options: ReplicaOptions) -> None:
+        self.replicas = replicas
+        self.options = options
+        self.primary_fallbacks = 0
+        self._next = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        """轮询选出健康且延迟在阈值内的副本；没有时返回 None（使用主库）"""
+        eligible = [
+            r for r in self.replicas
+            if r.healthy and r.lag_seconds is not None and r.lag_seconds <= self.options.max_lag_seconds
+        ]
+        if not eligible:
+            self.primary_fallbacks += 1
+            return None
+        replica = eligible[self._next % len(eligible)]
+        self._next += 1
+        return replica
+
+    async def check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                row = (await conn.execute(_LAG_SQL)).one()
+        except Exception as e:
+            replica.mark_down(e)
+        else:
+            was_healthy = replica.healthy
+            replica.in_recovery = bool(row.in_recovery)
+            replica.lag_seconds = round(float(row.lag_seconds or 0), 3)
+            replica.healthy = True
+            replica.last_error = None
+            if not was_healthy:
+                logger.info(f"Read replica {replica.name} healthy (lag={replica.lag_seconds}s)")
+            elif replica.lag_seconds > self.options.max_lag_seconds:
+                logger.warning(
+                    f"Read replica {replica.name} lag {replica.lag_seconds}s > {self.options.max_lag_seconds}s, "
+                    f"reads fall back to primary"
+                )
+        finally:
+            replica.checked_at = round(time.time(), 3)
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(r) for r in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.options.health_interval)
+            try:
+                await self.check_all()
+            except Exception as e:  # 防御：检查循环不能退出
+                logger.warning(f"Read replica health check failed: {e}")
+
+    async def start(self) -> None:
+        """首次检查完成后再开始路由，随后在后台定期检查"""
+        await self.check_all()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_lag_seconds": self.options.max_lag_seconds,
+            "read_your_writes_seconds": self.options.read_your_writes_seconds,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [r.stats() for r in self.replicas],
+        }
+
+
+def prefers_replica(request) -> bool:
+    """读请求、响应不带 ETag 且不在写后读一致窗口内时可以走副本"""
+    if request.method not in READ_METHODS:
+        return False
+    if getattr(getattr(request, "state", None), "namespace_versions", None):
+        return False
+    sticky_until = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if sticky_until:
+        try:
+            return float(sticky_until) <= time.time()
+        except ValueError:
+            return True
+    return True
+
+
+def served_from_replica(request) -> bool:
+    """本次请求的读会话是否来自副本（是则不应把结果写入共享缓存）"""
+    return bool(getattr(getattr(request, "state", None), REPLICA_SESSION_KEY, None))
+
+
+def read_your_writes_middleware_factory(window_seconds: float):
+    """写请求成功后下发粘滞 Cookie：窗口内该客户端的读请求走主库"""
+
+    async def read_your_writes_middleware(request, call_next):
+        response = await call_next(request)
+        if request.method not in _SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                READ_YOUR_WRITES_COOKIE,
+                str(int(time.time() + window_seconds) + 1),
+                max_age=int(window_seconds) + 1,
+                httponly=True,
+                samesite="lax",
+            )
+        return response
+
+    return read_your_writes_middleware
@@ -6,6 +6,7 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
+from fastapi import Request
 from loguru import logger
 
 from .schema import ServiceType
@@ -18,6 +19,8 @@ if TYPE_CHECKING:
     from .config.service import ConfigService
     from .crypto.service import CryptoService
     from .cache.service import CacheService
+    from .metrics.service import MetricsService
+    from .pics_gc.service import PicsGarbageCollector
 
 # 全局服务实例
 _database_service: DatabaseService | None = None
@@ -25,6 +28,8 @@ _auth_service: AuthService | None = None
 _config_service: ConfigService | None = None
 _crypto_service: CryptoService | None = None
 _cache_service: CacheService | None = None
+_metrics_service: MetricsService | None = None
+_pics_gc: PicsGarbageCollector | None = None
 
 
 def get_service(service_type: ServiceType, default=None):
@@ -47,6 +52,10 @@ def get_service(service_type: ServiceType, default=None):
         return get_crypto_service()
     elif service_type == ServiceType.CACHE_SERVICE:
         return get_cache_service()
+    elif service_type == ServiceType.METRICS_SERVICE:
+        return get_metrics_service()
+    elif service_type == ServiceType.PICS_GC:
+        return get_pics_gc()
 
     if default:
         return default.create()
@@ -114,6 +123,30 @@ def clear_cache_service() -> None:
     _cache_service = None
 
 
+def set_metrics_service(metrics_service: MetricsService) -> None:
+    """设置全局指标服务实例"""
+    global _metrics_service
+    _metrics_service = metrics_service
+
+
+def clear_metrics_service() -> None:
+    """清除全局指标服务实例（主要用于测试）"""
+    global _metrics_service
+    _metrics_service = None
+
+
+def set_pics_gc(pics_gc: PicsGarbageCollector) -> None:
+    """设置全局图片回收任务实例"""
+    global _pics_gc
+    _pics_gc = pics_gc
+
+
+def clear_pics_gc() -> None:
+    """清除全局图片回收任务实例（主要用于测试）"""
+    global _pics_gc
+    _pics_gc = None
+
+
 def get_db_service() -> DatabaseService:
     """获取数据库服务实例
 
@@ -169,6 +202,28 @@ def get_cache_service() -> CacheService:
     return _cache_service
 
 
+def get_metrics_service() -> MetricsService:
+    """获取指标服务实例
+
+    Returns:
+        MetricsService: 指标服务实例
+    """
+    if _metrics_service is None:
+        raise ValueError("Metrics service not initialized. Call set_metrics_service() first.")
+    return _metrics_service
+
+
+def get_pics_gc() -> PicsGarbageCollector:
+    """获取图片回收任务实例
+
+    Returns:
+        PicsGarbageCollector: 图片回收任务实例
+    """
+    if _pics_gc is None:
+        raise ValueError("Pics GC not initialized. Call set_pics_gc() first.")
+    return _pics_gc
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Retrieves an async session from the database service.
 
@@ -180,6 +235,22 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """只读会话：GET/HEAD 请求优先使用只读副本（健康且延迟在阈值内），
+    写请求之后的粘滞窗口内或没有可用副本时使用主库。只用于不写入的接口。
+
+    Yields:
+        AsyncSession: An async session object.
+
+    """
+    from .database.replicas import REPLICA_SESSION_KEY, prefers_replica
+
+    async with get_db_service().with_read_session(prefer_replica=prefers_replica(request)) as session:
+        # 供 cached_json_response 等判断结果是否来自副本
+        setattr(request.state, REPLICA_SESSION_KEY, session.info.get(REPLICA_SESSION_KEY))
+        yield session
+
+
 @asynccontextmanager
 async def session_scope() -> AsyncGenerator[AsyncSession, None]:
     """Context manager for managing an async session scope.
@@ -0,0 +1,20 @@
+"""
+指标服务模块
+"""
+from .service import (
+    MetricsService,
+    RequestMetrics,
+    current_request_metrics,
+    metrics_middleware,
+    record_cache,
+)
+from .factory import MetricsServiceFactory
+
+__all__ = [
+    "MetricsService",
+    "MetricsServiceFactory",
+    "RequestMetrics",
+    "current_request_metrics",
+    "metrics_middleware",
+    "record_cache",
+]
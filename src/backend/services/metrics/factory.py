@@ -0,0 +1,27 @@
+"""
+指标服务工厂
+"""
+from __future__ import annotations
+
+from .service import MetricsService
+
+
+class MetricsServiceFactory:
+    """指标服务工厂类"""
+
+    def __init__(self) -> None:
+        self.service_class = MetricsService
+
+    def create(self, config_service=None) -> MetricsService:
+        """创建指标服务实例
+
+        Args:
+            config_service: 配置服务实例（可选，读取 metrics_server_timing）
+
+        Returns:
+            MetricsService: 指标服务实例
+        """
+        server_timing = True
+        if config_service is not None:
+            server_timing = config_service.get_settings().metrics_server_timing
+        return MetricsService(server_timing=server_timing)
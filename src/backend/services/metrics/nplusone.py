@@ -0,0 +1,193 @@
+"""
+N+1 查询检测
+中文注释：对 SQL 语句做指纹化（去掉字面量、参数占位符与 IN 列表长度差异），
+在一个请求或一个测试范围内统计每个指纹的执行次数；同一指纹超过阈值即视为 N+1，
+报告中包含发出该语句的业务代码位置（跳过 SQLAlchemy/标准库帧）。
+仅用于开发与测试：记录调用位置需要遍历调用栈，生产环境默认关闭（sql_nplusone_threshold=0）。
+"""
+from __future__ import annotations
+
+import re
+import sys
+import sysconfig
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:  # SQLAlchemy asyncio 依赖 greenlet；缺失时只能看到同步调用栈
+    from greenlet import getcurrent
+except ImportError:  # pragma: no cover
+    getcurrent = None
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|%s|:\w+|\?")
+_IN_LIST_RE = re.compile(r"\bin\s*\((?:\s*\?\s*,?)+\)", re.I)
+_POSTCOMPILE_RE = re.compile(r"\(\s*__\[POSTCOMPILE_\w+\]\s*\)")
+_WS_RE = re.compile(r"\s+")
+
+# 这些目录下的帧不是业务调用点
+_LIBRARY_PREFIXES = tuple(
+    p for p in {sysconfig.get_paths().get(k) for k in ("stdlib", "platstdlib", "purelib", "platlib")} if p
+)
+_THIS_FILE = __file__
+# 推导式在 3.11 及以前有独立帧，调用位置取其所在函数
+_COMPREHENSIONS = {"<listcomp>", "<dictcomp>", "<setcomp>", "<genexpr>"}
+
+
+def fingerprint(statement: str) -> str:
+    """SQL 指纹：仅保留语句结构，使同一查询的不同参数/IN 列表长度归为一类"""
+    sql = _COMMENT_RE.sub(" ", statement)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _POSTCOMPILE_RE.sub("(?)", sql)
+    sql = _IN_LIST_RE.sub("IN (?)", sql)
+    return _WS_RE.sub(" ", sql).strip().lower()
+
+
+def _frames():
+    """当前调用栈；AsyncSession 下语句在 SQLAlchemy 派生的 greenlet 中执行，
+    其栈不含业务协程帧，需沿父 greenlet（挂起点位于 greenlet_spawn 内）继续向上"""
+    frame = sys._getframe(2)
+    current = getcurrent() if getcurrent is not None else None
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent if current is not None else None
+        if current is None:
+            return
+        frame = current.gr_frame
+
+
+def _call_site() -> Optional[str]:
+    for frame in _frames():
+        filename = frame.f_code.co_filename
+        if (
+            filename != _THIS_FILE
+            and not filename.startswith(_LIBRARY_PREFIXES)
+            and not filename.startswith("<")
+            and frame.f_code.co_name not in _COMPREHENSIONS
+        ):
+            return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+    return None
+
+
+class NPlusOneError(AssertionError):
+    """同一语句执行次数超过阈值（raise 模式下抛出）"""
+
+
+@dataclass
+class RepeatedQuery:
+    fingerprint: str
+    count: int
+    call_sites: List[Tuple[str, int]] = field(default_factory=list)
+
+    def describe(self) -> str:
+        sites = "; ".join(f"{site} (x{n})" for site, n in self.call_sites) or "unknown"
+        return f"{self.count}x {self.fingerprint[:200]} <- {sites}"
+
+
+class QueryTracker:
+    """记录一个范围内执行的语句、指纹计数与调用位置"""
+
+    def __init__(self, record_call_sites: bool = True) -> None:
+        self.record_call_sites = record_call_sites
+        self.statements: List[str] = []
+        self.counts: Counter = Counter()
+        self.sites: Dict[str, Counter] = {}
+
+    def record(self, statement: str) -> None:
+        fp = fingerprint(statement)
+        self.statements.append(statement)
+        self.counts[fp] += 1
+        if self.record_call_sites:
+            site = _call_site()
+            if site:
+                self.sites.setdefault(fp, Counter())[site] += 1
+
+    @property
+    def total(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int) -> List[RepeatedQuery]:
+        """执行次数超过 threshold 的指纹（按次数降序）"""
+        return [
+            RepeatedQuery(fp, n, self.sites.get(fp, Counter()).most_common(3))
+            for fp, n in self.counts.most_common()
+            if n > threshold
+        ]
+
+    def report(self) -> str:
+        lines = [f"{self.total} statements, {len(self.counts)} distinct:"]
+        lines += [f"  {n}x {fp[:200]}" for fp, n in self.counts.most_common()]
+        return "\n".join(lines)
+
+
+_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("nplusone_tracker", default=None)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    tracker = _tracker.get()
+    if tracker is not None:
+        tracker.record(statement)
+
+
+def install_query_tracking() -> None:
+    """注册语句记录事件（幂等）；未开启跟踪时回调只做一次 ContextVar 读取"""
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(record_call_sites: bool = True) -> Iterator[QueryTracker]:
+    """在 with 块内跟踪所有引擎执行的 SQL"""
+    install_query_tracking()
+    tracker = QueryTracker(record_call_sites=record_call_sites)
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+def check_repeated(tracker: QueryTracker, threshold: int, action: str = "warn", label: str = "") -> List[RepeatedQuery]:
+    """检查 N+1：warn 模式记录警告，raise 模式抛出 NPlusOneError"""
+    repeated = tracker.repeated(threshold)
+    if repeated:
+        message = f"[N+1] {label} repeated statements (threshold={threshold}):\n" + "\n".join(
+            f"  {r.describe()}" for r in repeated
+        )
+        if action == "raise":
+            raise NPlusOneError(message)
+        logger.warning(message)
+    return repeated
+
+
+def nplusone_middleware_factory(threshold: int, action: str = "warn"):
+    """开发模式中间件：按请求检测 N+1，结果写入 X-Query-Count 头与日志"""
+
+    async def nplusone_middleware(request, call_next):
+        with track_queries() as tracker:
+            response = await call_next(request)
+        response.headers["X-Query-Count"] = str(tracker.total)
+        repeated = check_repeated(tracker, threshold, "warn", f"{request.method} {request.url.path}")
+        if repeated:
+            response.headers["X-NPlusOne"] = str(len(repeated))
+            if action == "raise":
+                from fastapi.responses import JSONResponse
+                return JSONResponse(
+                    status_code=500,
+                    content={"detail": "N+1 query detected", "queries": [r.describe() for r in repeated]},
+                )
+        return response
+
+    return nplusone_middleware
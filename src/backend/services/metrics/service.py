@@ -0,0 +1,252 @@
+"""
+请求指标服务
+中文注释：按路由（路径模板）累计请求延迟直方图（p50/p95/p99），并统计每个请求的
+SQL 语句数与数据库耗时（SQLAlchemy before/after_cursor_execute 事件）、等待连接池的时长
+（services/database/pool.py）、缓存各层命中次数。
+单请求数据通过 contextvars 传递：中间件在进入路由前创建 RequestMetrics，
+事件回调与缓存服务只需向当前上下文累加，没有请求上下文时（后台任务、脚本）直接忽略。
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 延迟直方图桶上界（毫秒），最后一个桶为 +inf
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 250, 400, 600, 1000, 2000, 5000, 10000,
+)
+
+# 缓存层级
+CACHE_L1_HIT = "l1_hit"
+CACHE_L2_HIT = "l2_hit"
+CACHE_MISS = "miss"
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestMetrics:
+    """单个请求内累计的指标"""
+
+    __slots__ = ("started", "sql_count", "sql_ms", "pool_wait_ms", "statements", "cache")
+
+    def __init__(self, keep_statements: bool = False) -> None:
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.pool_wait_ms = 0.0
+        # 仅在需要时保留语句文本（如 N+1 检测），默认不保存以免占用内存
+        self.statements: Optional[List[str]] = [] if keep_statements else None
+        self.cache: Dict[str, int] = {}
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_request_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+def begin_request_metrics(keep_statements: bool = False):
+    """开始收集，返回 (RequestMetrics, token)；结束时以 token 调用 end_request_metrics"""
+    rm = RequestMetrics(keep_statements=keep_statements)
+    return rm, _current.set(rm)
+
+
+def end_request_metrics(token) -> None:
+    _current.reset(token)
+
+
+def record_cache(tier: str, n: int = 1) -> None:
+    rm = _current.get()
+    if rm is not None:
+        rm.cache[tier] = rm.cache.get(tier, 0) + n
+
+
+# ---- SQL 计数：挂在 Engine 类上，对所有引擎（包括 AsyncEngine 内部的同步引擎）生效 ----
+
+_SQL_START_KEY = "metrics_query_start"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault(_SQL_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    rm = _current.get()
+    if rm is None:
+        return
+    starts = conn.info.get(_SQL_START_KEY)
+    if not starts:
+        return
+    rm.sql_ms += (time.perf_counter() - starts.pop()) * 1000
+    rm.sql_count += 1
+    if rm.statements is not None:
+        rm.statements.append(statement)
+
+
+def install_sql_instrumentation() -> None:
+    """注册 SQL 计数事件（幂等）"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class _RouteStats:
+    __slots__ = (
+        "count", "errors", "total_ms", "max_ms", "buckets", "sql_count", "sql_ms", "max_sql", "pool_wait_ms", "cache",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.max_sql = 0
+        self.pool_wait_ms = 0.0
+        self.cache: Dict[str, int] = {}
+
+    def observe(self, duration_ms: float, status_code: int, rm: RequestMetrics) -> None:
+        self.count += 1
+        if status_code >= 500:
+            self.errors += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.sql_count += rm.sql_count
+        self.sql_ms += rm.sql_ms
+        self.max_sql = max(self.max_sql, rm.sql_count)
+        self.pool_wait_ms += rm.pool_wait_ms
+        for tier, n in rm.cache.items():
+            self.cache[tier] = self.cache.get(tier, 0) + n
+
+    def quantile(self, q: float) -> float:
+        """由直方图估算分位数（桶内线性插值，上限不超过观测到的最大值）"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = LATENCY_BUCKETS_MS[i - 1] if i > 0 else 0.0
+                upper = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return round(min(lower + (upper - lower) * (rank - seen) / n, self.max_ms), 2)
+            seen += n
+        return round(self.max_ms, 2)
+
+    def snapshot(self) -> Dict[str, Any]:
+        count = self.count or 1
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / count, 2),
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "sql_per_request": round(self.sql_count / count, 2),
+            "sql_ms_per_request": round(self.sql_ms / count, 2),
+            "max_sql_per_request": self.max_sql,
+            "pool_wait_ms_per_request": round(self.pool_wait_ms / count, 2),
+            "cache": dict(self.cache),
+            "buckets": {
+                **{f"le_{b:g}": n for b, n in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                "le_inf": self.buckets[-1],
+            },
+        }
+
+
+class MetricsService:
+    """按路由聚合请求指标"""
+
+    name = "metrics_service"
+
+    def __init__(self, server_timing: bool = True) -> None:
+        self.server_timing = server_timing
+        self.started_at = time.time()
+        self._routes: Dict[str, _RouteStats] = {}
+        install_sql_instrumentation()
+        logger.info(f"MetricsService initialized (server_timing={server_timing})")
+
+    def observe(self, method: str, route: str, status_code: int, duration_ms: float, rm: RequestMetrics) -> None:
+        key = f"{method} {route}"
+        stats = self._routes.get(key)
+        if stats is None:
+            stats = self._routes[key] = _RouteStats()
+        stats.observe(duration_ms, status_code, rm)
+
+    def snapshot(self, sort_by: str = "p95_ms", limit: Optional[int] = None) -> Dict[str, Any]:
+        routes = {key: stats.snapshot() for key, stats in self._routes.items()}
+        ordered = sorted(routes.items(), key=lambda kv: kv[1].get(sort_by, 0), reverse=True)
+        if limit:
+            ordered = ordered[:limit]
+        return {
+            "since": self.started_at,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "routes": dict(ordered),
+        }
+
+    def reset(self) -> None:
+        self._routes.clear()
+        self.started_at = time.time()
+
+
+def server_timing_header(duration_ms: float, rm: RequestMetrics) -> str:
+    """构造 Server-Timing 头：总耗时、数据库耗时/语句数、连接池等待、缓存命中"""
+    parts = [
+        f"app;dur={duration_ms:.1f}",
+        f'db;dur={rm.sql_ms:.1f};desc="{rm.sql_count} queries"',
+    ]
+    if rm.pool_wait_ms >= 0.1:
+        parts.append(f"pool;dur={rm.pool_wait_ms:.1f}")
+    if rm.cache:
+        desc = " ".join(f"{tier}={n}" for tier, n in sorted(rm.cache.items()))
+        parts.append(f'cache;desc="{desc}"')
+    return ", ".join(parts)
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """路由模板（如 /api/v1/members/{member_id}），避免按具体 ID 产生无限多的指标键"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    if scope.get("path", "").startswith("/api/"):
+        return UNMATCHED_ROUTE
+    return "<static>"
+
+
+async def metrics_middleware(request, call_next):
+    """HTTP 中间件：收集单请求指标、写入 Server-Timing 并按路由聚合"""
+    from services.deps import get_metrics_service
+
+    try:
+        service = get_metrics_service()
+    except ValueError:
+        return await call_next(request)
+
+    rm, token = begin_request_metrics()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        duration_ms = rm.elapsed_ms
+        end_request_metrics(token)
+        service.observe(request.method, route_label(request.scope), status_code, duration_ms, rm)
+    if service.server_timing:
+        response.headers["Server-Timing"] = server_timing_header(duration_ms, rm)
+    return response
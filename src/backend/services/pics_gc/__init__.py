@@ -0,0 +1,13 @@
+"""
+日常图片孤儿文件回收模块
+"""
+from .service import MonthUsage, PicsGarbageCollector, PicsGcReport, load_referenced_pics
+from .factory import PicsGcFactory
+
+__all__ = [
+    "MonthUsage",
+    "PicsGarbageCollector",
+    "PicsGcFactory",
+    "PicsGcReport",
+    "load_referenced_pics",
+]
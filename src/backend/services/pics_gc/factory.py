@@ -0,0 +1,40 @@
+"""
+日常图片孤儿文件回收工厂
+"""
+from __future__ import annotations
+
+from .service import PicsGarbageCollector
+
+
+class PicsGcFactory:
+    """日常图片孤儿文件回收工厂类"""
+
+    def __init__(self) -> None:
+        self.service_class = PicsGarbageCollector
+
+    def create(self, db_service, config_service=None, root=None) -> PicsGarbageCollector:
+        """创建回收任务实例
+
+        Args:
+            db_service: 数据库服务实例（始终从主库读取引用，避免副本延迟漏掉新帖子）
+            config_service: 配置服务实例（可选，读取 pics_gc_* 配置）
+            root: 图片根目录（默认 utils.uploads.PICS_ROOT）
+
+        Returns:
+            PicsGarbageCollector: 回收任务实例
+        """
+        if not db_service:
+            raise ValueError("Database service is required")
+        if root is None:
+            from utils.uploads import PICS_ROOT
+            root = PICS_ROOT
+        options = {}
+        if config_service is not None:
+            settings = config_service.get_settings()
+            options = {
+                "interval": settings.pics_gc_interval,
+                "grace_seconds": settings.pics_gc_grace_seconds,
+                "batch_size": settings.pics_gc_batch_size,
+                "dry_run": settings.pics_gc_dry_run,
+            }
+        return PicsGarbageCollector(db_service.with_session, root, **options)
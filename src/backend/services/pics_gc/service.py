@@ -0,0 +1,283 @@
+"""
+日常图片孤儿文件回收
+中文注释：/daily/upload 上传的图片保存在 static/pics/yyyy/mm，帖子未创建、编辑后移除图片、
+帖子被删除时文件会一直留在磁盘上。回收任务定期执行：
+
+  1. 从主库读取全部帖子（含未发布）引用的图片：daily_posts.images 与 content_jsonb 中任意层级的 src；
+  2. 逐个月份目录扫描文件（同一时刻只持有一个目录的列表），统计每月文件数与字节数；
+  3. 未被引用且修改时间早于宽限期的文件按批删除（删除前再次检查 mtime），中断残留的 .upload-*.part 临时文件同样回收。
+
+宽限期保护“已上传、帖子尚未提交”的图片；上传去重命中已有文件时会刷新其 mtime，重新被引用的文件不会被误删。
+引用集合读取失败时整轮中止，不会在引用不完整的情况下删除文件。
+多 worker 部署时通过 Redis 锁保证同一时刻只有一个进程在回收。
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import text
+
+from utils.uploads import TEMP_PREFIX, pic_relpath_from_url
+
+LOCK_KEY = "lock:pics_gc"
+
+# 所有帖子引用的图片 URL：images 数组元素 + 富文本中任意层级的 src 属性（图片节点 attrs.src）
+REFERENCED_URLS_SQL = """
+SELECT jsonb_array_elements_text(images) AS url
+FROM daily_posts
+WHERE jsonb_typeof(images) = 'array'
+UNION
+SELECT jsonb_path_query(content_jsonb, '$.**.src') #>> '{}' AS url
+FROM daily_posts
+WHERE content_jsonb IS NOT NULL
+"""
+
+
+@dataclass
+class MonthUsage:
+    """单个月份目录的存储与回收统计"""
+
+    files: int = 0
+    bytes: int = 0
+    orphaned: int = 0
+    orphaned_bytes: int = 0
+    deleted: int = 0
+    deleted_bytes: int = 0
+
+
+@dataclass
+class PicsGcReport:
+    """一轮回收的结果（dry_run 时 deleted 为 0，orphaned 为将被删除的文件）"""
+
+    dry_run: bool
+    started_at: float
+    duration_ms: float = 0.0
+    referenced: int = 0
+    scanned: int = 0
+    orphaned: int = 0
+    orphaned_bytes: int = 0
+    deleted: int = 0
+    deleted_bytes: int = 0
+    recent_skipped: int = 0
+    months: Dict[str, MonthUsage] = field(default_factory=dict)
+    sample: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+async def load_referenced_pics(session_factory: Callable[[], AsyncContextManager]) -> Set[str]:
+    """读取全部帖子引用的图片，返回 pics 下的相对路径集合（yyyy/mm/name）"""
+    referenced: Set[str] = set()
+    async with session_factory() as session:
+        result = await session.stream(text(REFERENCED_URLS_SQL))
+        async for (url,) in result:
+            path = pic_relpath_from_url(url)
+            if path:
+                referenced.add(path)
+    return referenced
+
+
+def _month_dirs(root: Path) -> List[Tuple[str, Path]]:
+    """pics 下的 (yyyy/mm, 目录) 列表，按时间顺序"""
+    months: List[Tuple[str, Path]] = []
+    if not root.is_dir():
+        return months
+    for year_dir in sorted(root.iterdir()):
+        if not (year_dir.is_dir() and year_dir.name.isdigit()):
+            continue
+        for month_dir in sorted(year_dir.iterdir()):
+            if month_dir.is_dir():
+                months.append((f"{year_dir.name}/{month_dir.name}", month_dir))
+    return months
+
+
+def _scan_month(month_dir: Path) -> List[Tuple[str, int, float]]:
+    """列出目录中的文件：(文件名, 字节数, mtime)"""
+    entries: List[Tuple[str, int, float]] = []
+    with os.scandir(month_dir) as it:
+        for entry in it:
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    entries.append((entry.name, st.st_size, st.st_mtime))
+            except FileNotFoundError:
+                continue
+    return entries
+
+
+def _delete_batch(month_dir: Path, names: Iterable[str], cutoff: float) -> Tuple[int, int]:
+    """删除一批文件；删除前重新检查 mtime（期间被去重上传刷新过的文件跳过）"""
+    deleted = deleted_bytes = 0
+    for name in names:
+        path = month_dir / name
+        try:
+            st = path.stat()
+            if st.st_mtime >= cutoff:
+                continue
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        deleted += 1
+        deleted_bytes += st.st_size
+    return deleted, deleted_bytes
+
+
+class PicsGarbageCollector:
+    """日常图片孤儿文件回收任务"""
+
+    name = "pics_gc"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncContextManager],
+        root: Path,
+        interval: float = 21600.0,
+        grace_seconds: float = 86400.0,
+        batch_size: int = 200,
+        dry_run: bool = False,
+        reference_source: Optional[Callable[[], Awaitable[Set[str]]]] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self.root = Path(root)
+        self.interval = interval
+        self.grace_seconds = grace_seconds
+        self.batch_size = max(1, batch_size)
+        self.dry_run = dry_run
+        self._reference_source = reference_source or (lambda: load_referenced_pics(session_factory))
+        self._task: Optional[asyncio.Task] = None
+        self._running = asyncio.Lock()
+        self.last_report: Optional[PicsGcReport] = None
+
+    # ---------------- 存储统计 ---------------- #
+
+    async def storage_usage(self) -> Dict[str, Any]:
+        """按月份目录统计文件数与字节数（不访问数据库）"""
+
+        def _usage() -> Dict[str, Dict[str, int]]:
+            months: Dict[str, Dict[str, int]] = {}
+            for month, month_dir in _month_dirs(self.root):
+                entries = _scan_month(month_dir)
+                months[month] = {"files": len(entries), "bytes": sum(size for _, size, _ in entries)}
+            return months
+
+        months = await asyncio.to_thread(_usage)
+        return {
+            "root": str(self.root),
+            "total_files": sum(m["files"] for m in months.values()),
+            "total_bytes": sum(m["bytes"] for m in months.values()),
+            "months": months,
+        }
+
+    # ---------------- 回收 ---------------- #
+
+    async def collect(self, dry_run: Optional[bool] = None) -> PicsGcReport:
+        """执行一轮回收；dry_run 时只统计将被删除的文件"""
+        dry_run = self.dry_run if dry_run is None else dry_run
+        async with self._running:
+            report = PicsGcReport(dry_run=dry_run, started_at=time.time())
+            started = time.perf_counter()
+            try:
+                await self._collect(report)
+            except Exception as e:
+                report.error = str(e)[:200]
+                logger.warning(f"[PICS_GC] collection aborted: {e}")
+            report.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.last_report = report
+            logger.info(
+                f"[PICS_GC] dry_run={dry_run} scanned={report.scanned} referenced={report.referenced} "
+                f"orphaned={report.orphaned} ({report.orphaned_bytes} bytes) deleted={report.deleted} "
+                f"in {report.duration_ms}ms"
+            )
+            return report
+
+    async def _collect(self, report: PicsGcReport) -> None:
+        # 先读引用再扫描：扫描期间新上传的文件在宽限期内，不会被误删
+        referenced = await self._reference_source()
+        report.referenced = len(referenced)
+        cutoff = time.time() - self.grace_seconds
+
+        for month, month_dir in await asyncio.to_thread(_month_dirs, self.root):
+            usage = MonthUsage()
+            report.months[month] = usage
+            candidates: List[Tuple[str, int]] = []
+            for name, size, mtime in await asyncio.to_thread(_scan_month, month_dir):
+                usage.files += 1
+                usage.bytes += size
+                is_temp = name.startswith(TEMP_PREFIX)
+                if not is_temp and f"{month}/{name}" in referenced:
+                    continue
+                if mtime >= cutoff:
+                    report.recent_skipped += 1
+                    continue
+                candidates.append((name, size))
+                usage.orphaned += 1
+                usage.orphaned_bytes += size
+                if len(report.sample) < 20:
+                    report.sample.append(f"{month}/{name}")
+
+            report.scanned += usage.files
+            report.orphaned += usage.orphaned
+            report.orphaned_bytes += usage.orphaned_bytes
+            if report.dry_run:
+                continue
+            for i in range(0, len(candidates), self.batch_size):
+                names = [name for name, _ in candidates[i:i + self.batch_size]]
+                deleted, deleted_bytes = await asyncio.to_thread(_delete_batch, month_dir, names, cutoff)
+                usage.deleted += deleted
+                usage.deleted_bytes += deleted_bytes
+                report.deleted += deleted
+                report.deleted_bytes += deleted_bytes
+
+    async def collect_exclusive(self, dry_run: Optional[bool] = None) -> Optional[PicsGcReport]:
+        """跨 worker 互斥执行一轮回收；其他进程正在回收时返回 None"""
+        from cashews import cache as C
+        from cashews.exceptions import LockedError
+
+        try:
+            async with C.lock(LOCK_KEY, expire=max(600.0, self.interval / 2), wait=False):
+                return await self.collect(dry_run=dry_run)
+        except LockedError:
+            logger.debug("[PICS_GC] another worker is collecting, skipped")
+            return None
+
+    async def _run(self) -> None:
+        # 首轮稍后执行，避开启动高峰；频繁重启时也能得到执行机会
+        await asyncio.sleep(min(self.interval, 60.0))
+        while True:
+            try:
+                await self.collect_exclusive()
+            except Exception as e:  # 防御：后台循环不能退出
+                logger.warning(f"[PICS_GC] run failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """启动后台回收（interval <= 0 时关闭，仅可通过管理接口手动触发）"""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "grace_seconds": self.grace_seconds,
+            "batch_size": self.batch_size,
+            "dry_run": self.dry_run,
+            "running": self._running.locked(),
+            "last_report": self.last_report.to_dict() if self.last_report else None,
+        }
@@ -9,3 +9,5 @@ class ServiceType(str, Enum):
     CONFIG_SERVICE = "config_service"
     CRYPTO_SERVICE = "crypto_service"
     CACHE_SERVICE = "cache_service"
+    METRICS_SERVICE = "metrics_service"
+    PICS_GC = "pics_gc"
@@ -0,0 +1,74 @@
+"""
+测试公共夹具
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from services.metrics.nplusone import NPlusOneError, check_repeated, track_queries
+
+
+class RecordingSession:
+    """不连接数据库的假会话：exec / execute 把语句按 PostgreSQL 方言编译后记录下来
+
+    result 为可选的 callable(sql)，其返回值作为 exec / execute 的结果（用于构造 one() / all() 等）。
+    """
+
+    def __init__(self, result=None):
+        self.statements = []  # 编译后的 SQL 文本
+        self.params = []      # 与 statements 一一对应的绑定参数
+        self._result = result
+
+    async def exec(self, statement, params=None):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        self.statements.append(sql)
+        self.params.append(compiled.params)
+        return self._result(sql) if self._result is not None else None
+
+    execute = exec
+
+    async def flush(self):
+        pass
+
+
+@pytest.fixture
+def recording_session():
+    """RecordingSession 工厂：recording_session(result=...) 创建一个新的记录会话"""
+    return RecordingSession
+
+
+@pytest.fixture
+def assert_max_queries():
+    """断言代码块内执行的 SQL 语句数不超过预算
+
+    用法：
+        with assert_max_queries(3):
+            client.get("/api/v1/daily/posts")
+    超出时的失败信息列出每个语句指纹的执行次数。
+    """
+
+    @contextmanager
+    def _assert(budget: int):
+        with track_queries() as tracker:
+            yield tracker
+        assert tracker.total <= budget, f"expected at most {budget} queries\n{tracker.report()}"
+
+    return _assert
+
+
+@pytest.fixture
+def assert_no_nplusone():
+    """断言代码块内同一语句指纹的执行次数不超过 threshold（默认 2），失败信息包含调用位置"""
+
+    @contextmanager
+    def _assert(threshold: int = 2):
+        with track_queries() as tracker:
+            yield tracker
+        try:
+            check_repeated(tracker, threshold, action="raise")
+        except NPlusOneError as e:
+            pytest.fail(str(e), pytrace=False)
+
+    return _assert
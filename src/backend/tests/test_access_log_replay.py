@@ -0,0 +1,71 @@
+"""
+访问日志回放：日志解析、按应用路由表归类、假名化一致性与本地 ID 映射
+"""
+from benchmarks.suite.workload import (
+    STATIC_ROUTE,
+    UNMATCHED_ROUTE,
+    Anonymizer,
+    IdMapper,
+    RouteClassifier,
+    WorkloadEntry,
+    capture,
+    parse_line,
+)
+
+NGINX = (
+    '1.2.3.4 - - [19/Oct/2026:10:00:00 +0800] "GET /api/v1/avatar/17?size=64 HTTP/1.1" 200 512 '
+    '"https://example.com/" "Mozilla/5.0" "-" 0.012'
+)
+NGINX_OLD = '1.2.3.4 - - [19/Oct/2026:10:00:01 +0800] "GET /assets/app.js HTTP/1.1" 304 0 "-" "curl/8"'
+PIPELINE = '2026-10-19 10:00:02,123 - uvicorn.access - INFO - 127.0.0.1:5000 - "POST /api/v1/activities/3/vote HTTP/1.1" 201'
+
+
+def test_parse_line_formats():
+    r = parse_line(NGINX)
+    assert (r.method, r.path, r.query, r.status) == ("GET", "/api/v1/avatar/17", "size=64", 200)
+    assert r.request_time_ms == 12.0
+    r = parse_line(NGINX_OLD)
+    assert r.path == "/assets/app.js" and r.request_time_ms is None
+    r = parse_line(PIPELINE)
+    assert (r.method, r.path, r.status) == ("POST", "/api/v1/activities/3/vote", 201) and r.timestamp
+    r = parse_line('INFO:     127.0.0.1:5000 - "GET /api/v1/members HTTP/1.1" 200 OK')
+    assert r.path == "/api/v1/members" and r.timestamp is None
+    assert parse_line("garbage") is None
+
+
+def test_classifier_uses_app_routes():
+    classifier = RouteClassifier()
+    assert classifier.classify("GET", "/api/v1/members/bindable")[0] == "/api/v1/members/bindable"
+    route, params = classifier.classify("HEAD", "/api/v1/avatar/17")
+    assert route == "/api/v1/avatar/{member_id}" and params == {"member_id": "17"}
+    assert classifier.classify("POST", "/api/v1/activities/3/vote")[0] == "/api/v1/activities/{activity_id}/vote"
+    assert classifier.classify("GET", "/api/v1/nope")[0] == UNMATCHED_ROUTE
+    assert classifier.classify("GET", "/assets/app.js")[0] == STATIC_ROUTE
+
+
+def test_capture_anonymizes_and_maps_ids():
+    lines = [NGINX, NGINX.replace("/avatar/17", "/avatar/99"), NGINX.replace("10:00:00", "10:00:01"),
+             NGINX_OLD, "garbage"]
+    entries, stats = capture(lines, RouteClassifier(), Anonymizer(key=b"k" * 32))
+    assert stats == {"api": 3, STATIC_ROUTE: 1, "unparsed": 1, "total": 4}
+    # 同一秒内的请求被均匀摊开，整体从 0 开始
+    assert [e.t for e in entries] == [0.0, 0.5, 1.0, 1.5]
+    avatars = [e for e in entries if e.route == "/api/v1/avatar/{member_id}"]
+    tokens = [e.params["member_id"] for e in avatars]
+    assert "17" not in tokens and tokens[0] == tokens[2] != tokens[1]
+
+    mapper = IdMapper(entries, {"member_id": 5})
+    # 最热的假名映射为 1，其余依次排开
+    assert mapper.url(avatars[0]) == "/api/v1/avatar/1?size=64"
+    assert mapper.url(avatars[1]).startswith("/api/v1/avatar/2")
+    static = WorkloadEntry(t=0, method="GET", route=STATIC_ROUTE, path="/assets/app.js")
+    assert mapper.url(static) == "/assets/app.js"
+
+
+def test_anonymizer_drops_credentials():
+    anon = Anonymizer(key=b"k" * 32)
+    query = anon.query("page=2&q=alice&token=secret")
+    assert query["page"] == "2" and "token" not in query
+    assert query["q"].startswith("anon_") and "alice" not in query["q"]
+    assert anon.params({"year": "2026", "post_id": "5"})["year"] == "2026"
+    assert anon.params({"post_id": "5"}) == anon.params({"post_id": "5"}) != {"post_id": "5"}
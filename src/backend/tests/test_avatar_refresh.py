@@ -0,0 +1,106 @@
+"""
+头像增量刷新：条件请求、源图摘要比对、缺失优先；源站由 httpx.MockTransport 本地模拟
+"""
+import asyncio
+import hashlib
+import io
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from PIL import Image
+
+from services import deps
+from utils.avatar import AvatarService, AvatarStore
+
+
+def _png(color):
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class AvatarHost:
+    """模拟 QQ 头像源站：支持 ETag，可关闭条件请求支持"""
+
+    def __init__(self):
+        self.images = {}
+        self.conditional = True
+        self.requests = []
+
+    def handler(self, request):
+        uin = int(request.url.params["nk"])
+        self.requests.append((uin, request.headers.get("if-none-match")))
+        data = self.images[uin]
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if self.conditional and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        headers = {"content-type": "image/png"}
+        if self.conditional:
+            headers["etag"] = etag
+        return httpx.Response(200, content=data, headers=headers)
+
+
+@pytest.fixture
+def host(tmp_path, monkeypatch):
+    settings = SimpleNamespace(
+        avatar_root=str(tmp_path), avatar_source_url="http://avatar.test/g?nk={uin}&s={size}",
+        avatar_refresh_concurrency=4, avatar_refresh_timeout=5.0,
+    )
+    deps.set_config_service(SimpleNamespace(get_settings=lambda: settings))
+    encoded = []
+    original = AvatarStore.write_webp
+
+    def counting_write(self, uin, data):
+        encoded.append(uin)
+        original(self, uin, data)
+
+    monkeypatch.setattr(AvatarStore, "write_webp", counting_write)
+    host = AvatarHost()
+    host.images = {1: _png("red"), 2: _png("green"), 3: _png("blue")}
+    host.encoded = encoded
+    yield host
+    deps.clear_config_service()
+
+
+def _refresh(host, uins, **kwargs):
+    transport = httpx.MockTransport(host.handler)
+    return asyncio.run(AvatarService.batch_fetch_and_save_avatars_webp(uins, transport=transport, **kwargs))
+
+
+def test_refresh_only_reencodes_changed_avatars(host, tmp_path):
+    stats = _refresh(host, [1, 2, 3, 3])
+    assert stats["updated"] == 3 and stats["total"] == 3 and sorted(host.encoded) == [1, 2, 3]
+    assert (tmp_path / "1.webp").exists() and AvatarStore(tmp_path).load_meta(1).etag
+
+    # 源站未变化：全部 304，不下载、不编码
+    host.requests.clear()
+    stats = _refresh(host, [1, 2, 3])
+    assert stats["not_modified"] == 3 and len(host.encoded) == 3
+    assert all(etag for _, etag in host.requests)
+
+    # 只有一个成员换了头像
+    host.images[2] = _png("yellow")
+    stats = _refresh(host, [1, 2, 3])
+    assert stats["updated"] == 1 and stats["not_modified"] == 2 and host.encoded[-1] == 2
+
+    # 源站不支持条件请求：按源图摘要判断，未变化的跳过编码
+    host.conditional = False
+    stats = _refresh(host, [1, 2, 3])
+    assert stats["unchanged"] == 3 and len(host.encoded) == 4
+
+    stats = _refresh(host, [1], force=True)
+    assert stats["updated"] == 1 and len(host.encoded) == 5
+
+
+def test_missing_avatars_refreshed_first(host, tmp_path):
+    _refresh(host, [1, 2])
+    (tmp_path / "2.webp").unlink()
+    host.requests.clear()
+
+    stats = _refresh(host, [1, 2, 3], limit=2)
+    assert stats["skipped"] == 1 and stats["updated"] == 2
+    assert sorted(uin for uin, _ in host.requests) == [2, 3]
+
+    assert AvatarService.delete_avatar_file_by_uin(3) is True
+    assert AvatarStore(tmp_path).load_meta(3) is None
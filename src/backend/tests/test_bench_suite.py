@@ -0,0 +1,62 @@
+"""
+基准套件：数据集生成的确定性/引用完整性，以及结果对比的阈值判定
+"""
+from benchmarks.suite.dataset import SCALES, generate, scale_config
+from benchmarks.suite.report import ScenarioStats, compare, sql_count_from_server_timing
+
+
+def test_dataset_is_deterministic_and_consistent():
+    config = scale_config("small", seed=7)
+    a, b = generate(config), generate(config)
+    assert a.counts() == b.counts()
+    assert a.members == b.members and a.daily_comments == b.daily_comments
+    assert generate(scale_config("small", seed=8)).members != a.members
+    assert config.fingerprint() != SCALES["small"].fingerprint()
+
+    member_ids = {m["id"] for m in a.members}
+    assert len({m["uin"] for m in a.members}) == len(a.members)
+    assert all(set(act["participant_ids"]) <= member_ids for act in a.activities)
+    assert all(act["participants_total"] == len(act["participant_ids"]) for act in a.activities)
+
+    comments = {c["id"]: c for c in a.daily_comments}
+    for c in a.daily_comments:
+        if c["parent_id"] is not None:
+            parent = comments[c["parent_id"]]
+            assert parent["post_id"] == c["post_id"] and parent["id"] < c["id"]
+    assert any(c["parent_id"] for c in a.daily_comments)
+    for post in a.daily_posts:
+        assert post["content_jsonb"]["type"] == "doc"
+        assert post["comments_count"] == sum(1 for c in a.daily_comments if c["post_id"] == post["id"])
+
+    options = {o["id"]: o["activity_id"] for o in a.vote_options}
+    voters = set()
+    for r in a.vote_records:
+        assert options[r["option_id"]] == r["activity_id"]
+        assert (r["activity_id"], r["voter_id"]) not in voters
+        voters.add((r["activity_id"], r["voter_id"]))
+
+
+def _result(p95, rps, sql):
+    stats = ScenarioStats(latencies_ms=[p95] * 100, sql_counts=[sql] * 100, wall_seconds=100 / rps)
+    return {"scenarios": {"trending": stats.summary()}}
+
+
+def test_compare_flags_regressions_beyond_thresholds():
+    thresholds = {"defaults": {
+        "p95_regression_pct": 25, "min_delta_ms": 2, "rps_regression_pct": 20,
+        "sql_per_op_increase": 0.5, "max_error_rate": 0.0,
+    }}
+    baseline = _result(10.0, 1000, 2)
+
+    assert not any(f.regression for f in compare(_result(11.0, 950, 2), baseline, thresholds))
+    flagged = {f.metric for f in compare(_result(20.0, 500, 3), baseline, thresholds) if f.regression}
+    assert flagged == {"p95_ms", "rps", "sql_per_op"}
+    # 相对增幅超标但绝对值不足 min_delta_ms 时不判定回退
+    small = compare(_result(0.5, 1000, 2), _result(0.2, 1000, 2), thresholds)
+    assert not any(f.regression for f in small)
+
+
+def test_sql_count_from_server_timing():
+    header = 'app;dur=3.2, db;dur=1.1;desc="4 queries", cache;desc="l1_hit=1"'
+    assert sql_count_from_server_timing(header) == 4
+    assert sql_count_from_server_timing(None) is None
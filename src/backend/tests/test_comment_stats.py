@@ -0,0 +1,28 @@
+"""
+评论统计：单条 FILTER 聚合查询；高点踩队列的部分索引
+"""
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from services.database.models.comment.base import Comment
+from services.database.models.comment.crud import CommentCRUD
+
+
+def test_get_stats_is_one_query(recording_session):
+    db = recording_session(
+        lambda sql: SimpleNamespace(one=lambda: SimpleNamespace(total=5, active=3, likes=None, dislikes=7))
+    )
+    stats = asyncio.run(CommentCRUD.get_stats(db))
+    assert len(db.statements) == 1
+    assert db.statements[0].count("FILTER (WHERE") == 3
+    assert (stats.total_comments, stats.active_comments, stats.deleted_comments) == (5, 3, 2)
+    assert (stats.total_likes, stats.total_dislikes) == (0, 7)
+
+
+def test_moderation_partial_index_ddl():
+    index = next(ix for ix in Comment.__table__.indexes if ix.name == "ix_comments_dislikes_active")
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert ddl == "CREATE INDEX ix_comments_dislikes_active ON comments (dislikes DESC, id) WHERE NOT is_deleted"
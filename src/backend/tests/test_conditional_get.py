@@ -0,0 +1,121 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+from cashews import cache as C
+from fastapi import FastAPI, Request
+
+from services.cache.conditional import (
+    bump_namespace_version,
+    compute_etag,
+    conditional_get_middleware,
+    encoded_etag,
+    etag_matches,
+    match_policy,
+)
+
+
+def test_policy_matching():
+    assert match_policy("/api/v1/members").name == "members.list"
+    assert match_policy("/api/v1/members/stats").name == "members.stats"
+    assert match_policy("/api/v1/members/42").name == "members.detail"
+    assert match_policy("/api/v1/activities/7/ranking").name == "activities.ranking"
+    # 会自增浏览量的详情页不参与条件请求
+    assert match_policy("/api/v1/daily/posts/1") is None
+
+
+def test_etag_depends_on_versions_and_normalized_query():
+    policy = match_policy("/api/v1/members")
+    a = compute_etag(policy, "h", "/api/v1/members", "page=1&page_size=20", [5])
+    b = compute_etag(policy, "h", "/api/v1/members", "page_size=20&page=1", [5])
+    c = compute_etag(policy, "h", "/api/v1/members", "page=1&page_size=20", [6])
+    assert a == b != c
+    assert a.startswith('"') and a.endswith('"')
+
+
+def test_etag_matching_rules():
+    etag = '"abc"'
+    assert etag_matches('"x", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert etag_matches('"abc-gzip"', etag, "gzip, br")
+    assert not etag_matches('"abc-gzip"', etag, "identity")
+    assert encoded_etag(etag, "br") == '"abc-br"'
+
+
+def test_middleware_answers_304_until_table_changes():
+    C.setup("mem://")
+    calls = {"n": 0}
+    app = FastAPI()
+    app.middleware("http")(conditional_get_middleware)
+
+    @app.get("/api/v1/members/stats")
+    async def stats():
+        calls["n"] += 1
+        return {"total_members": calls["n"]}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            # 首次请求仅初始化版本号，不带 ETag
+            await client.get("/api/v1/members/stats")
+            first = await client.get("/api/v1/members/stats")
+            etag = first.headers["etag"]
+            assert "max-age=60" in first.headers["cache-control"]
+
+            hit = await client.get("/api/v1/members/stats", headers={"If-None-Match": etag})
+            assert hit.status_code == 304
+            assert calls["n"] == 2  # 304 未进入路由
+
+            await bump_namespace_version("members")
+            miss = await client.get("/api/v1/members/stats", headers={"If-None-Match": etag})
+            assert miss.status_code == 200
+            assert miss.headers["etag"] != etag
+
+    asyncio.run(run())
+
+
+def test_cached_body_follows_namespace_version():
+    """响应缓存键带上 ETag 所用的版本号：表变更后不会出现新 ETag 配旧响应体"""
+    from services import deps
+    from services.cache.response_cache import cached_json_response
+
+    C.setup("mem://")
+    store = {}
+
+    class _Cache:
+        async def get(self, key):
+            return store.get(key)
+
+        async def set(self, key, value, ttl=None):
+            store[key] = value
+
+    deps.set_cache_service(_Cache())
+    deps.set_config_service(SimpleNamespace(get_settings=lambda: SimpleNamespace(
+        etag_enabled=True, http_cache_control={}, response_cache_compress_min_bytes=1024,
+    )))
+    calls = {"n": 0}
+    app = FastAPI()
+    app.middleware("http")(conditional_get_middleware)
+
+    @app.get("/api/v1/members/stats")
+    async def stats(request: Request):
+        async def build():
+            calls["n"] += 1
+            return {"total_members": calls["n"]}
+        return await cached_json_response(request, "member:stats:all", 60, build)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            await client.get("/api/v1/members/stats")
+            first = await client.get("/api/v1/members/stats")
+            await bump_namespace_version("members")
+            second = await client.get("/api/v1/members/stats")
+            assert second.headers["etag"] != first.headers["etag"]
+            assert second.json() != first.json()  # 新版本号对应新的缓存键，不复用旧响应体
+
+    try:
+        asyncio.run(run())
+    finally:
+        deps.clear_cache_service()
+        deps.clear_config_service()
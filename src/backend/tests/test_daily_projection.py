@@ -0,0 +1,79 @@
+"""
+日常动态列表投影：summary 视图不读取 content_jsonb，fields= 只返回请求的字段
+"""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.v1 import daily as daily_api
+from services import deps
+from services.database.models.daily_post.crud import DailyPostCRUD
+
+
+ROW = {
+    "id": 1, "author_user_id": 3, "content": "摘要", "tags": ["夏日"],
+    "likes_count": 2, "comments_count": 1, "views_count": 9, "published": True,
+    "created_at": datetime(2025, 1, 1), "updated_at": datetime(2025, 1, 1),
+    "first_image": "/static/pics/2025/01/a.webp",
+}
+
+
+def _result(sql):
+    if "count(*)" in sql:
+        return SimpleNamespace(one=lambda: 1)
+    return SimpleNamespace(all=lambda: [SimpleNamespace(_mapping=ROW)])
+
+
+@pytest.fixture
+def session(monkeypatch, recording_session):
+    recording = recording_session(_result)
+
+    async def read_session():
+        yield recording
+
+    async def author(session_, author_user_id):
+        recording.statements.append("author lookup")
+        return "作者", None
+
+    monkeypatch.setattr(daily_api, "_get_author_info", author)
+    app = FastAPI()
+    app.include_router(daily_api.router)
+    app.dependency_overrides[deps.get_read_session] = read_session
+    return app, recording
+
+
+def _get(app, path):
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(go())
+
+
+def test_summary_view_skips_content_jsonb(session, recording_session):
+    app, recording = session
+    body = _get(app, "/daily/posts").json()
+    page_sql = recording.statements[1]
+    assert "content_jsonb" not in page_sql and "AS first_image" in page_sql
+    (post,) = body["posts"]
+    assert post["content_jsonb"] is None and post["author_display_name"] == "作者"
+    assert post["images"] == ["/api/v1/daily/pics/2025/01/a.webp"]
+
+    full = recording_session(_result)
+    asyncio.run(DailyPostCRUD.list_trending(full, view="full"))
+    assert "daily_posts.content_jsonb" in full.statements[0]
+
+
+def test_fields_selects_subset_and_skips_author_lookup(session):
+    app, recording = session
+    body = _get(app, "/daily/posts?fields=content,images")
+    assert body.status_code == 200
+    assert body.json()["posts"] == [{"id": 1, "content": "摘要", "images": ["/api/v1/daily/pics/2025/01/a.webp"]}]
+    assert "author lookup" not in recording.statements
+
+    assert _get(app, "/daily/posts?fields=content,secret").status_code == 400
@@ -0,0 +1,71 @@
+"""
+连接池观测：checkout 计时、排队/超时计数、请求级等待累计与 resize 模式的 max_overflow 调整
+"""
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from services.database.pool import InstrumentedQueuePool, PoolMonitor, PoolOptions
+from services.metrics.service import begin_request_metrics, end_request_metrics
+
+
+def _pool(options: PoolOptions) -> InstrumentedQueuePool:
+    pool = InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        pool_size=options.pool_size,
+        max_overflow=options.max_overflow,
+        timeout=options.timeout,
+    )
+    pool.attach_monitor(PoolMonitor(options))
+    return pool
+
+
+def test_checkout_wait_queue_and_timeout_accounting():
+    pool = _pool(PoolOptions(pool_size=1, max_overflow=0, timeout=0.05))
+
+    def scenario():
+        rm, token = begin_request_metrics()
+        try:
+            first = pool.connect()
+            with pytest.raises(exc.TimeoutError):
+                pool.connect()
+        finally:
+            end_request_metrics(token)
+        first.close()
+        pool.connect().close()
+        return rm
+
+    rm = asyncio.run(greenlet_spawn(scenario))
+    stats = pool.stats()
+    assert stats["checkouts"] == 2 and stats["timeouts"] == 1 and stats["queued_checkouts"] == 1
+    assert stats["connects"] == 1 and stats["peak_in_use"] == 1 and stats["waiting"] == 0
+    assert stats["wait_ms"]["max"] >= 50 and stats["in_use"] == 0 and stats["idle"] == 1
+    # 超时的那次等待计入当前请求
+    assert rm.pool_wait_ms >= 50
+
+
+def test_resize_mode_grows_and_shrinks_max_overflow():
+    options = PoolOptions(
+        pool_size=2, max_overflow=1, adaptive="resize", wait_threshold_ms=-1,
+        adaptive_max_overflow=3, adaptive_window_seconds=0,
+    )
+    pool = _pool(options)
+
+    def checkout():
+        pool.connect().close()
+
+    for _ in range(3):
+        asyncio.run(greenlet_spawn(checkout))
+    assert pool.stats()["max_overflow"] == 3
+    # 到达上限后只告警
+    assert [e["action"] for e in pool.stats()["adaptive"]["events"]] == ["grow", "grow", "warn"]
+
+    # 等待回落到阈值的 1/4 以下后逐步收缩回配置值
+    pool.monitor.options = PoolOptions(**{**options.__dict__, "wait_threshold_ms": 10_000})
+    for _ in range(3):
+        asyncio.run(greenlet_spawn(checkout))
+    assert pool.stats()["max_overflow"] == 1
+    assert pool.recreate().monitor is pool.monitor
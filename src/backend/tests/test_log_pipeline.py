@@ -0,0 +1,47 @@
+import logging
+
+from utils.log_pipeline import SamplingFilter, get_logging_stats, setup_queue_logging, stop_queue_logging
+
+
+def _record(name: str, level: int = logging.DEBUG) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "msg", None, None)
+
+
+def test_sampling_and_rate_limits_by_prefix():
+    f = SamplingFilter(sampling={"api.v1.avatars": 0.25}, rate_limits={"services.crypto": 3})
+
+    kept = sum(f.filter(_record("api.v1.avatars")) for _ in range(100))
+    assert kept == 25
+    # 限速：1 秒内最多放行 rate 条
+    kept = sum(f.filter(_record("services.crypto.service")) for _ in range(100))
+    assert kept == 3
+    # WARNING 及以上与未配置的模块不受影响
+    assert all(f.filter(_record("services.crypto.service", logging.ERROR)) for _ in range(10))
+    assert all(f.filter(_record("api.v1.members")) for _ in range(10))
+    assert f.stats()["api.v1.avatars"] == {"seen": 100, "suppressed": 75}
+
+
+def test_queue_pipeline_writes_and_rotates(tmp_path):
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        setup_queue_logging(tmp_path, logging.INFO, max_bytes=2048, backup_count=2, console=False)
+        log = logging.getLogger("tests.pipeline")
+        for i in range(200):
+            log.info("line %d %s", i, "x" * 40)
+        log.error("boom")
+        stop_queue_logging()
+        # 写线程停止后 QueueHandler 已摘下，之后的记录不会堆在无人消费的队列里
+        assert root.handlers == []
+
+        assert (tmp_path / "app.log.1").exists()
+        assert "boom" in (tmp_path / "error.log").read_text(encoding="utf-8")
+        assert "line 199" in (tmp_path / "app.log").read_text(encoding="utf-8")
+        assert get_logging_stats()["dropped"] == 0
+    finally:
+        stop_queue_logging()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
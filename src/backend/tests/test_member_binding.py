@@ -0,0 +1,27 @@
+"""
+成员绑定：可绑定成员 ID 缓存随 users 表变更失效
+"""
+import asyncio
+from types import SimpleNamespace
+
+from cashews import cache as C
+
+from services.cache.keys import L1_PREFIX, MEMBER_BINDABLE_IDS
+from services.database import events_cache
+
+
+def test_user_changes_invalidate_bindable_members():
+    C.setup("mem://")
+
+    async def run():
+        await C.set(MEMBER_BINDABLE_IDS, [1, 2])
+        await C.set(f"{L1_PREFIX}{MEMBER_BINDABLE_IDS}", [1, 2])
+        # 删除用户只改动 users 表，但会释放其绑定的成员
+        session = SimpleNamespace(info={"__changed_tablenames__": {"users"}})
+        events_cache._after_commit_invalidate(session)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert await C.get(MEMBER_BINDABLE_IDS) is None
+        assert await C.get(f"{L1_PREFIX}{MEMBER_BINDABLE_IDS}") is None
+
+    asyncio.run(run())
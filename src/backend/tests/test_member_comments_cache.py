@@ -0,0 +1,113 @@
+"""
+成员评论首页：缓存命中不打开数据库会话，评论写入后失效；计数维护语句
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.v1 import comments as comments_api
+from services import deps
+from services.database.models.comment.crud import CommentCRUD
+
+
+class FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+        return True
+
+
+class FakeDBService:
+    def __init__(self, session_factory):
+        self.sessions = []
+        self._session_factory = session_factory
+
+    @asynccontextmanager
+    async def with_session(self):
+        self.sessions.append("primary")
+        yield self._session_factory()
+
+    @asynccontextmanager
+    async def with_read_session(self, prefer_replica=True):
+        self.sessions.append("read")
+        yield self._session_factory()
+
+
+@pytest.fixture
+def services(monkeypatch, recording_session):
+    cache, db = FakeCache(), FakeDBService(recording_session)
+    settings = SimpleNamespace(cache_comment_page_ttl=60, response_cache_compress_min_bytes=1024)
+    deps.set_cache_service(cache)
+    deps.set_database_service(db)
+    deps.set_config_service(SimpleNamespace(get_settings=lambda: settings))
+
+    comment = SimpleNamespace(
+        id=1, member_id=7, content="hi", likes=0, dislikes=0, is_anonymous=True,
+        created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1),
+    )
+
+    async def count(db_, member_id):
+        return 1 if member_id == 7 else None
+
+    async def page(db_, member_id, page, page_size):
+        return [comment]
+
+    monkeypatch.setattr(CommentCRUD, "get_member_comment_count", staticmethod(count))
+    monkeypatch.setattr(CommentCRUD, "get_by_member_id", staticmethod(page))
+    yield cache, db
+    deps.clear_cache_service()
+    deps.clear_database_service()
+    deps.clear_config_service()
+
+
+def _get(path):
+    app = FastAPI()
+    app.include_router(comments_api.router)
+
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(go())
+
+
+def test_first_page_cached_and_invalidated(services):
+    cache, db = services
+    first = _get("/comments/members/7/comments")
+    assert first.status_code == 200 and first.json()["total"] == 1
+    assert db.sessions == ["primary"]
+
+    again = _get("/comments/members/7/comments?page=1&page_size=20")
+    assert again.json() == first.json()
+    assert db.sessions == ["primary"]  # 命中缓存，未打开会话
+
+    _get("/comments/members/7/comments?page=2")
+    assert db.sessions == ["primary", "read"]  # 非首页走只读会话
+
+    assert _get("/comments/members/8/comments").status_code == 404
+
+    asyncio.run(CommentCRUD.invalidate_member_first_page(7))
+    _get("/comments/members/7/comments")
+    assert db.sessions == ["primary", "read", "primary", "primary"]
+
+
+def test_recount_member_uses_scalar_subqueries(recording_session):
+    session = recording_session()
+    asyncio.run(CommentCRUD.recount_member(session, 7))
+    (sql,) = session.statements
+    assert sql.startswith("UPDATE members SET comment_count=(SELECT count(comments.id)")
+    assert "last_comment_at=(SELECT max(comments.created_at)" in sql
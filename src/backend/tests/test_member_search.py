@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pytest
+
+from domain.member_search import MemberSearchIndex, MemberSearchRecord, normalize_text, pinyin_available
+
+
+def _rec(member_id, display_name, group_nick=None, qq_nick=None):
+    return MemberSearchRecord(
+        id=member_id,
+        display_name=display_name,
+        group_nick=group_nick,
+        qq_nick=qq_nick,
+        role=2,
+        join_time=datetime(2024, 1, 1),
+    )
+
+
+def test_normalize_text_folds_width_and_case():
+    assert normalize_text("  ＡＢＣ Def ") == "abcdef"
+
+
+def test_prefix_search_ranks_exact_before_longer_names():
+    index = MemberSearchIndex.build([
+        _rec(1, "Kuma_Bear"),
+        _rec(2, "kuma"),
+        _rec(3, "Neko", qq_nick="kumaneko"),
+    ])
+
+    ids = [rec.id for rec, _ in index.search("KUMA", 10)]
+    assert ids[0] == 2
+    assert set(ids) == {1, 2, 3}
+    assert index.search("zzz") == []
+
+
+def test_token_prefix_matches_inner_words():
+    index = MemberSearchIndex.build([_rec(1, "VRC-Division 小明")])
+    assert [rec.id for rec, _ in index.search("division")] == [1]
+
+
+@pytest.mark.skipif(not pinyin_available(), reason="pypinyin 未安装")
+def test_pinyin_full_and_initials():
+    index = MemberSearchIndex.build([_rec(1, "张三"), _rec(2, "李四")])
+    assert [rec.id for rec, _ in index.search("zhangs")] == [1]
+    assert [rec.id for rec, _ in index.search("ls")] == [2]
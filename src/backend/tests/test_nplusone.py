@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from services.metrics.nplusone import fingerprint, track_queries
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("create table users (id integer primary key, name text)"))
+        conn.execute(text("create table posts (id integer primary key, author_id integer)"))
+        conn.execute(text("insert into users values (1, 'a'), (2, 'b'), (3, 'c')"))
+        conn.execute(text("insert into posts values (1, 1), (2, 2), (3, 3), (4, 1)"))
+    return engine
+
+
+def _authors_one_by_one(conn):
+    posts = conn.execute(text("select id, author_id from posts")).all()
+    return [conn.execute(text("select name from users where id = :id"), {"id": p.author_id}).scalar() for p in posts]
+
+
+def _authors_batched(conn):
+    return conn.execute(text("select u.name from posts p join users u on u.id = p.author_id")).scalars().all()
+
+
+def test_fingerprint_ignores_literals_and_in_list_length():
+    assert fingerprint("SELECT * FROM t WHERE id = $1") == fingerprint("select *  from t where id = 42")
+    assert fingerprint("select 1 from t where id IN (?, ?, ?)") == fingerprint("select 1 from t where id in (?)")
+    assert fingerprint("select 'x' from t") != fingerprint("select 1 from u")
+
+
+def test_detects_repeated_statement_with_call_site(engine):
+    with engine.connect() as conn, track_queries() as tracker:
+        _authors_one_by_one(conn)
+    (repeated,) = tracker.repeated(threshold=2)
+    assert repeated.count == 4
+    site, n = repeated.call_sites[0]
+    assert "_authors_one_by_one" in site and n == 4
+
+
+def test_query_budget_fixtures(engine, assert_max_queries, assert_no_nplusone):
+    with engine.connect() as conn:
+        with assert_max_queries(1), assert_no_nplusone():
+            _authors_batched(conn)
+        with pytest.raises(AssertionError, match="expected at most 2 queries"):
+            with assert_max_queries(2):
+                _authors_one_by_one(conn)
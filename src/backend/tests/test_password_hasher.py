@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from services.auth.hashing import HashingSaturatedError, PasswordHasher
+
+
+def _context(rounds: int) -> CryptContext:
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+async def test_hash_verify_and_rehash_on_cost_change():
+    """哈希在线程池中执行；rounds 变化后 verify_and_update 返回新哈希"""
+    old = PasswordHasher(_context(4), max_workers=1)
+    hashed = await old.hash("secret-pw")
+    assert await old.verify("secret-pw", hashed)
+    assert not await old.verify("wrong-pw", hashed)
+
+    new = PasswordHasher(_context(5), max_workers=1)
+    ok, new_hash = await new.verify_and_update("secret-pw", hashed)
+    assert ok and new_hash and new_hash.startswith("$2b$05$")
+    assert await new.verify_and_update("secret-pw", new_hash) == (True, None)
+
+    stats = new.stats()
+    assert stats["operations"]["verify"]["count"] == 2
+    old.shutdown()
+    new.shutdown()
+
+
+async def test_saturated_executor_rejects_fast():
+    hasher = PasswordHasher(_context(4), max_workers=1, queue_size=0)
+    hashed = await hasher.hash("pw-123456")
+    first = asyncio.create_task(hasher.verify("pw-123456", hashed))
+    await asyncio.sleep(0)
+    with pytest.raises(HashingSaturatedError):
+        await hasher.verify("pw-123456", hashed)
+    assert await first
+    assert hasher.stats()["rejected"] == 1
+    hasher.shutdown()
@@ -0,0 +1,96 @@
+"""
+孤儿图片回收：引用集合、宽限期、dry-run 报告与按月存储统计
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+
+from services.pics_gc.service import PicsGarbageCollector, load_referenced_pics
+
+OLD = 1_000_000_000  # 2001 年，远早于宽限期
+
+
+def _write(path, size, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "pics"
+    _write(root / "2024" / "12" / "kept.webp", 10, OLD)           # 被 images 引用
+    _write(root / "2024" / "12" / "orphan.webp", 20, OLD)         # 孤儿
+    _write(root / "2025" / "01" / "inline.png", 30, OLD)          # 被正文引用
+    _write(root / "2025" / "01" / "fresh.png", 40)                # 孤儿但仍在宽限期内
+    _write(root / "2025" / "01" / ".upload-abc.part", 50, OLD)    # 中断上传的残留
+    return root
+
+
+def test_dry_run_then_collect(tree):
+    async def references():
+        return {"2024/12/kept.webp", "2025/01/inline.png"}
+
+    gc = PicsGarbageCollector(None, tree, grace_seconds=3600, batch_size=1, reference_source=references)
+
+    report = asyncio.run(gc.collect(dry_run=True))
+    assert report.scanned == 5 and report.referenced == 2
+    assert report.orphaned == 2 and report.orphaned_bytes == 70 and report.deleted == 0
+    assert report.recent_skipped == 1
+    assert sorted(report.sample) == ["2024/12/orphan.webp", "2025/01/.upload-abc.part"]
+    assert len(list(tree.rglob("*.*"))) == 5
+
+    report = asyncio.run(gc.collect(dry_run=False))
+    assert report.deleted == 2 and report.deleted_bytes == 70
+    assert report.months["2024/12"].deleted == 1 and report.months["2025/01"].files == 3
+    assert sorted(p.name for p in tree.rglob("*") if p.is_file()) == ["fresh.png", "inline.png", "kept.webp"]
+
+    usage = asyncio.run(gc.storage_usage())
+    assert usage["total_files"] == 3 and usage["total_bytes"] == 80
+    assert usage["months"] == {"2024/12": {"files": 1, "bytes": 10}, "2025/01": {"files": 2, "bytes": 70}}
+
+
+def test_reference_failure_aborts_without_deleting(tree):
+    async def broken():
+        raise ConnectionError("db down")
+
+    gc = PicsGarbageCollector(None, tree, grace_seconds=0, reference_source=broken)
+    report = asyncio.run(gc.collect(dry_run=False))
+    assert report.error == "db down" and report.deleted == 0
+    assert len([p for p in tree.rglob("*") if p.is_file()]) == 5
+
+
+def test_load_referenced_pics_normalizes_urls():
+    urls = [
+        "/api/v1/daily/pics/2025/01/a.webp",
+        "/static/pics/2024/12/b.jpg",
+        "https://cdn.example.com/api/v1/daily/pics/2025/02/c.png?v=1",
+        "https://example.com/elsewhere.png",
+    ]
+
+    class FakeStream:
+        def __aiter__(self):
+            self._rows = iter([(u,) for u in urls])
+            return self
+
+        async def __anext__(self):
+            try:
+                return next(self._rows)
+            except StopIteration:
+                raise StopAsyncIteration
+
+    class FakeSession:
+        async def stream(self, statement):
+            assert "jsonb_path_query(content_jsonb" in str(statement)
+            return FakeStream()
+
+    @asynccontextmanager
+    async def session_factory():
+        yield FakeSession()
+
+    assert asyncio.run(load_referenced_pics(session_factory)) == {
+        "2025/01/a.webp", "2024/12/b.jpg", "2025/02/c.png",
+    }
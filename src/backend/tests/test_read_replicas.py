@@ -0,0 +1,112 @@
+"""
+只读副本路由：按健康与延迟选择副本、写后读粘滞 Cookie
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI, Request
+
+from services.database.replicas import (
+    READ_YOUR_WRITES_COOKIE,
+    REPLICA_SESSION_KEY,
+    Replica,
+    ReplicaOptions,
+    ReplicaSet,
+    prefers_replica,
+    read_your_writes_middleware_factory,
+)
+
+
+def _replica(url, healthy, lag):
+    replica = Replica(url, engine=None)
+    replica.healthy, replica.lag_seconds = healthy, lag
+    return replica
+
+
+def test_choose_skips_unhealthy_and_lagging_replicas():
+    a = _replica("postgresql+asyncpg://u:secret@a/db", True, 0.0)
+    b = _replica("postgresql+asyncpg://u:secret@b/db", True, 12.0)
+    c = _replica("postgresql+asyncpg://u:secret@c/db", False, 0.0)
+    d = _replica("postgresql+asyncpg://u:secret@d/db", True, 1.0)
+    replicas = ReplicaSet([a, b, c, d], ReplicaOptions(max_lag_seconds=5))
+    assert [replicas.choose() for _ in range(4)] == [a, d, a, d]
+    assert "secret" not in a.name
+
+    a.mark_down(OSError("connection refused"))
+    d.lag_seconds = 30
+    assert replicas.choose() is None and replicas.primary_fallbacks == 1
+
+
+def test_read_your_writes_cookie_routes_reads_to_primary():
+    def request(method, cookie=None):
+        return SimpleNamespace(method=method, cookies={READ_YOUR_WRITES_COOKIE: cookie} if cookie else {})
+
+    assert prefers_replica(request("GET"))
+    assert not prefers_replica(request("POST"))
+    assert not prefers_replica(request("GET", str(time.time() + 5)))
+    assert prefers_replica(request("GET", str(time.time() - 1)))
+
+    app = FastAPI()
+    app.middleware("http")(read_your_writes_middleware_factory(5))
+    seen = []
+
+    @app.get("/items")
+    def list_items(req: Request):
+        seen.append(prefers_replica(req))
+        return []
+
+    @app.post("/items")
+    def create_item():
+        return {}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            first = await client.get("/items")
+            write = await client.post("/items")
+            await client.get("/items")
+            return first, write
+
+    first, write = asyncio.run(run())
+    assert READ_YOUR_WRITES_COOKIE not in first.headers.get("set-cookie", "")
+    assert READ_YOUR_WRITES_COOKIE in write.headers["set-cookie"]
+    assert seen == [True, False]
+
+
+def test_etag_requests_and_cache_fills_stay_off_replicas():
+    from services import deps
+    from services.cache.response_cache import cached_json_response
+
+    # 条件请求中间件已读取版本号（响应会带 ETag）时不走副本
+    etag_request = SimpleNamespace(method="GET", cookies={}, state=SimpleNamespace(namespace_versions=[3]))
+    assert not prefers_replica(etag_request)
+
+    store = {}
+
+    class _Cache:
+        async def get(self, key):
+            return store.get(key)
+
+        async def set(self, key, value, ttl=None):
+            store[key] = value
+
+    deps.set_cache_service(_Cache())
+    deps.set_config_service(SimpleNamespace(get_settings=lambda: SimpleNamespace(response_cache_compress_min_bytes=1024)))
+
+    async def build():
+        return {"n": 1}
+
+    def request(replica):
+        state = SimpleNamespace(**{REPLICA_SESSION_KEY: replica})
+        return SimpleNamespace(state=state, headers={})
+
+    try:
+        served = asyncio.run(cached_json_response(request("replica-a"), "k", 60, build))
+        assert served.body == b'{"n":1}' and store == {}  # 副本结果只返回，不写入缓存
+        asyncio.run(cached_json_response(request(None), "k", 60, build))
+        assert "k" in store
+    finally:
+        deps.clear_cache_service()
+        deps.clear_config_service()
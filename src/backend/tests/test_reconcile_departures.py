@@ -0,0 +1,25 @@
+from services.database.models.activity.crud import ActivityCRUD
+
+
+def test_strip_participants_counts_per_member():
+    """批量剔除参与者：保持剩余顺序，并按成员统计受影响活动数"""
+    rows = [
+        (1, [10, 20, 30]),
+        (2, [20]),
+        (3, [40, 50]),
+        (4, []),
+        (5, None),
+    ]
+    updates, affected = ActivityCRUD.strip_participants(rows, {20, 30, 99})
+
+    assert updates == [
+        {"id": 1, "participant_ids": [10], "participants_total": 1},
+        {"id": 2, "participant_ids": [], "participants_total": 0},
+    ]
+    assert affected == {20: 2, 30: 1}
+
+
+def test_strip_participants_noop_when_no_overlap():
+    updates, affected = ActivityCRUD.strip_participants([(1, [1, 2])], {3})
+    assert updates == []
+    assert affected == {}
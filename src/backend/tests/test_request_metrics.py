@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from services.deps import clear_metrics_service, set_metrics_service
+from services.metrics.service import (
+    CACHE_L1_HIT,
+    CACHE_MISS,
+    MetricsService,
+    metrics_middleware,
+    record_cache,
+)
+
+
+def test_route_histogram_sql_and_cache_accounting():
+    service = MetricsService(server_timing=True)
+    set_metrics_service(service)
+    engine = create_engine("sqlite://")
+
+    app = FastAPI()
+    app.middleware("http")(metrics_middleware)
+
+    @app.get("/api/v1/items/{item_id}")
+    def get_item(item_id: int):
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("select 1"))
+        record_cache(CACHE_L1_HIT)
+        record_cache(CACHE_MISS)
+        return {"id": item_id}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            resp = None
+            for i in range(10):
+                resp = await client.get(f"/api/v1/items/{i}")
+            return resp
+
+    try:
+        resp = asyncio.run(run())
+        timing = resp.headers["server-timing"]
+        assert 'desc="3 queries"' in timing
+        assert "l1_hit=1" in timing and "miss=1" in timing
+
+        stats = service.snapshot()["routes"]["GET /api/v1/items/{item_id}"]
+        assert stats["count"] == 10
+        assert stats["sql_per_request"] == 3
+        assert stats["cache"] == {CACHE_L1_HIT: 10, CACHE_MISS: 10}
+        assert 0 < stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    finally:
+        clear_metrics_service()
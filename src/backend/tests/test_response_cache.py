@@ -0,0 +1,35 @@
+import gzip
+
+import orjson
+from starlette.requests import Request
+
+from services.cache.response_cache import encode_payload, payload_response
+
+
+def _request(accept_encoding: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    })
+
+
+def test_small_payload_is_not_compressed():
+    body, gz, br = encode_payload({"a": 1, 2: "b"}, compress_min_bytes=1024)
+    assert orjson.loads(body) == {"a": 1, "2": "b"}
+    assert gz is None and br is None
+
+
+def test_gzip_variant_selected_by_accept_encoding():
+    data = {"items": ["日常动态" * 20 for _ in range(20)]}
+    payload = encode_payload(data, compress_min_bytes=0)
+
+    resp = payload_response(payload, _request("gzip;q=1.0, identity"))
+    assert resp.headers["content-encoding"] == "gzip"
+    assert orjson.loads(gzip.decompress(resp.body)) == data
+
+    plain = payload_response(payload, _request("gzip;q=0"))
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert orjson.loads(plain.body) == data
@@ -0,0 +1,60 @@
+"""
+启动就绪：后台预热任务完成前不就绪、预热失败标记 failed、加密密钥只派生一次
+"""
+import asyncio
+import threading
+
+from services.crypto.service import CryptoService
+from utils.startup import StartupTracker
+
+
+def test_ready_only_after_lifespan_and_background_tasks():
+    async def scenario():
+        tracker = StartupTracker()
+        gate = asyncio.Event()
+        tracker.background("warm", gate.wait())
+        tracker.complete()
+        await asyncio.sleep(0)
+        assert not tracker.ready
+        assert tracker.report()["status"] == "starting"
+        assert tracker.report()["pending"] == ["warm"]
+
+        gate.set()
+        await tracker.wait_background()
+        report = tracker.report()
+        assert tracker.ready and report["status"] == "ready"
+        assert report["ready_after_ms"] is not None and "warm" in report["steps_ms"]
+
+        async def boom():
+            raise RuntimeError("no key")
+
+        failing = StartupTracker()
+        failing.background("crypto_key", boom())
+        failing.complete()
+        await failing.wait_background()
+        assert not failing.ready
+        assert failing.report()["status"] == "failed"
+        assert failing.report()["errors"] == {"crypto_key": "no key"}
+
+    asyncio.run(scenario())
+
+
+def test_crypto_warm_up_derives_key_once():
+    class FakeConfig:
+        calls = 0
+
+        def get_or_create_aes_key(self):
+            FakeConfig.calls += 1
+            return "k" * 32
+
+    crypto = CryptoService(FakeConfig())
+    assert not crypto.is_warm
+    threads = [threading.Thread(target=crypto.warm_up) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert crypto.is_warm and FakeConfig.calls == 1
+    salt = "0123456789abcdef"
+    assert crypto.decrypt_uin(crypto.encrypt_uin(12345, salt), salt) == 12345
+    assert FakeConfig.calls == 1
@@ -0,0 +1,76 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from utils.static_files import IMMUTABLE_CACHE_CONTROL, PrecompressedStaticFiles, is_hashed_asset
+
+_spec = importlib.util.spec_from_file_location(
+    "precompress_static", Path(__file__).resolve().parents[1] / "scripts" / "precompress_static.py"
+)
+precompress_static = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(precompress_static)
+
+
+def test_hashed_asset_detection():
+    assert is_hashed_asset("assets/index-BXk3a9Zc.js")
+    assert is_hashed_asset("assets/vendor.4f1c2d9e.css")
+    assert not is_hashed_asset("index.html")
+    assert not is_hashed_asset("assets/logo.svg")
+    # 构建目录之外即使形似哈希也不视为不可变
+    assert not is_hashed_asset("my-component.js")
+
+
+def test_serves_precompressed_variant(tmp_path):
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    source = "console.log('日常动态');\n" * 200
+    (assets / "index-BXk3a9Zc.js").write_text(source, encoding="utf-8")
+    (tmp_path / "index.html").write_text("<html></html>" * 100)
+
+    written, _, _ = precompress_static.precompress(tmp_path, min_bytes=512)
+    assert written >= 2
+    assert (assets / "index-BXk3a9Zc.js.gz").exists()
+
+    app = Starlette(routes=[Mount("/", PrecompressedStaticFiles(directory=str(tmp_path), html=True))])
+    client = TestClient(app)
+
+    resp = client.get("/assets/index-BXk3a9Zc.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-type"].startswith("text/javascript")
+    assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert resp.text == source  # httpx 透明解压
+
+    plain = client.get("/assets/index-BXk3a9Zc.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.text == source
+
+    index = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert index.headers["cache-control"] == "no-cache"
+
+
+def test_x_accel_redirect_maps_into_internal_location(tmp_path, monkeypatch):
+    from fastapi import HTTPException
+
+    from utils import x_accel
+
+    pic = tmp_path / "2025" / "09" / "a1b2.webp"
+    pic.parent.mkdir(parents=True)
+    pic.write_bytes(b"RIFF")
+
+    monkeypatch.setattr(x_accel, "x_accel_enabled", lambda: True)
+    resp = x_accel.file_or_accel_response(
+        pic, root=tmp_path, location="/_accel/pics/", media_type="image/webp",
+        headers={"Cache-Control": "public, max-age=31536000"},
+    )
+    assert resp.headers["x-accel-redirect"] == "/_accel/pics/2025/09/a1b2.webp"
+    assert resp.headers["content-type"] == "image/webp"
+    assert resp.body == b""
+
+    with pytest.raises(HTTPException) as exc:
+        x_accel.accel_path(tmp_path.parent / "secret", tmp_path, "/_accel/pics/")
+    assert exc.value.status_code == 404
@@ -0,0 +1,61 @@
+"""
+标签过滤与标签计数：GIN 索引、@> 包含查询、标签云读取 tag_counts
+"""
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from services.database.models.activity.crud import ActivityCRUD
+from services.database.models.daily_post.base import DailyPost
+from services.database.models.daily_post.crud import DailyPostCRUD
+from services.database.models.tag_count.crud import TagCountCRUD
+
+
+def _rows(rows=()):
+    return lambda sql: SimpleNamespace(one=lambda: 0, all=lambda: list(rows))
+
+
+def test_daily_tag_filter_uses_containment_and_gin_index(recording_session):
+    (index,) = [ix for ix in DailyPost.__table__.indexes if ix.name == "ix_daily_posts_tags_gin"]
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert "USING gin (tags jsonb_path_ops)" in ddl
+
+    session = recording_session(_rows())
+    asyncio.run(DailyPostCRUD.list_paginated(session, tag="夏日"))
+    (count_sql, page_sql), (count_params, page_params) = session.statements, session.params
+    assert "daily_posts.tags @> %(tags_1)s" in count_sql and "daily_posts.tags @> %(tags_1)s" in page_sql
+    assert count_params["tags_1"] == ["夏日"] and page_params["tags_1"] == ["夏日"]
+
+
+def test_tag_facets_read_counts_table(recording_session):
+    session = recording_session(_rows(["a", "b"]))
+    asyncio.run(TagCountCRUD.list_top(session, "activities", limit=10, prefix="夏_"))
+    assert asyncio.run(ActivityCRUD.get_all_tags(session)) == ["a", "b"]
+
+    (top_sql, tags_sql), (top_params, _) = session.statements, session.params
+    assert "FROM tag_counts" in top_sql and "tag_counts.count > %(count_1)s" in top_sql
+    assert "ORDER BY tag_counts.count DESC, tag_counts.tag" in top_sql
+    # 前缀中的通配符按字面匹配
+    assert top_params["tag_1"] == "夏/_" and top_params["param_1"] == 10
+    # 活动标签列表不再展开 activities.tags
+    assert "FROM tag_counts" in tags_sql and "jsonb" not in tags_sql
+
+
+def test_rebuild_registers_source_table_change():
+    class TextSession:
+        def __init__(self):
+            self.info = {}
+            self.committed_with = None
+
+        async def execute(self, statement, params=None):
+            return SimpleNamespace(rowcount=3)
+
+        async def commit(self):
+            self.committed_with = set(self.info.get("__changed_tablenames__", ()))
+
+    session = TextSession()
+    assert asyncio.run(TagCountCRUD.rebuild(session, "daily_posts")) == 3
+    # 提交时已登记 daily_posts：tags.facet 的 ETag 随之变化
+    assert session.committed_with == {"daily_posts"}
@@ -0,0 +1,75 @@
+"""
+图片上传：魔数识别、分块落盘与大小上限、按内容摘要去重
+"""
+import asyncio
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from utils import uploads
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 200_000  # 跨越多个读取块
+
+
+class CountingStream(io.BytesIO):
+    """记录单次读取的最大字节数"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.max_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.max_read = max(self.max_read, len(chunk))
+        return chunk
+
+
+def _upload(data, filename="a.png", content_type="image/png"):
+    return UploadFile(file=io.BytesIO(data), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+@pytest.fixture
+def pics(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "PICS_ROOT", tmp_path / "pics")
+    return tmp_path / "pics"
+
+
+def test_sniff_image_type():
+    assert uploads.sniff_image_type(b"\xff\xd8\xff\xe0") == "jpg"
+    assert uploads.sniff_image_type(b"GIF89a...") == "gif"
+    assert uploads.sniff_image_type(b"RIFF\x10\0\0\0WEBPVP8 ") == "webp"
+    assert uploads.sniff_image_type(b"<svg xmlns=") is None
+
+
+def test_duplicate_upload_reuses_existing_file(pics):
+    old_month = pics / "2024" / "01"
+    old_month.mkdir(parents=True)
+    (first,) = asyncio.run(uploads.save_upload_images([_upload(PNG)]))
+    name, url, _, _ = first
+    assert name.endswith(".png") and len(name) == 32 + 4
+    # 把文件挪到更早的月份并设为很久以前修改：重复上传应直接复用，并刷新 mtime
+    current = next(pics.glob(f"*/*/{name}"))
+    os.replace(current, old_month / name)
+    os.utime(old_month / name, (0, 0))
+
+    saved = asyncio.run(uploads.save_upload_images([
+        _upload(PNG, filename="copy.jpg"),
+        _upload(b"not an image", filename="x.png"),
+        _upload(PNG, content_type="text/plain"),
+    ]))
+    assert saved == [(name, f"/api/v1/daily/pics/2024/01/{name}", None, None)]
+    assert (old_month / name).stat().st_mtime > 0
+    assert sorted(p.name for p in pics.rglob("*") if p.is_file()) == [name]  # 无重复文件、无临时文件残留
+
+
+def test_oversized_upload_rejected_with_bounded_reads(pics):
+    target = pics / "2025" / "01"
+    target.mkdir(parents=True)
+    stream = CountingStream(PNG)
+    with pytest.raises(uploads.UploadTooLarge):
+        uploads.store_image_stream(stream, "big.png", target, max_bytes=100_000)
+    assert stream.max_read <= uploads.UPLOAD_CHUNK_SIZE
+    assert list(target.iterdir()) == []
@@ -1,19 +1,193 @@
 """
 Avatar utilities
 中文注释：头像相关的工具方法，原 domain.avatar_service 迁移至此，避免放在领域服务层。
+
+增量刷新：每个 UIN 在 {avatar_root}/.meta/{uin}.json 中记录源站 ETag、Last-Modified、源图内容摘要与最近检查时间。
+  - 已有头像时带 If-None-Match / If-Modified-Since 条件请求，304 直接跳过；
+  - 源站不支持条件请求时比较源图 BLAKE2b 摘要，未变化则不重新编码 WebP；
+  - 缺失头像的成员优先，其余按最近检查时间从旧到新，配合 limit 可分批刷新；
+  - 同一批次共享一个 httpx 客户端（连接复用），并发受 avatar_refresh_concurrency 限制，WebP 编码在线程中执行。
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, List, Dict
-import os
-
-import httpx
-from PIL import Image
+from typing import Any, Dict, List, Optional
 
 from services.deps import get_config_service
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_AVATAR_SOURCE_URL = "https://q.qlogo.cn/g?b=qq&nk={uin}&s={size}"
+AVATAR_USER_AGENT = "Apifox/1.0.0 (https://apifox.com)"
+AVATAR_META_DIR = ".meta"
+
+# 单个头像的刷新结果
+UPDATED = "updated"              # 源图变化（或首次下载），已重新编码
+NOT_MODIFIED = "not_modified"    # 源站返回 304
+UNCHANGED = "unchanged"          # 源站返回 200 但内容摘要未变，跳过编码
+FAILED = "failed"
+
+
+@dataclass
+class AvatarMeta:
+    """单个 UIN 的头像源信息"""
+
+    uin: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    source_hash: Optional[str] = None
+    size: Optional[str] = None
+    checked_at: Optional[float] = None  # 最近一次成功检查（含 304）
+    changed_at: Optional[float] = None  # 最近一次重新编码
+
+
+class AvatarStore:
+    """头像文件与元数据的读写（同步阻塞，批量调用时放在线程中执行）"""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.meta_root = self.root / AVATAR_META_DIR
+
+    def avatar_path(self, uin: int) -> Path:
+        return self.root / f"{uin}.webp"
+
+    def meta_path(self, uin: int) -> Path:
+        return self.meta_root / f"{uin}.json"
+
+    def load_meta(self, uin: int) -> Optional[AvatarMeta]:
+        try:
+            data = json.loads(self.meta_path(uin).read_text(encoding="utf-8"))
+            return AvatarMeta(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save_meta(self, meta: AvatarMeta) -> None:
+        self.meta_root.mkdir(parents=True, exist_ok=True)
+        path = self.meta_path(meta.uin)
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(asdict(meta)), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def write_webp(self, uin: int, data: bytes) -> None:
+        """源图转 WebP（临时文件 + 原子替换，确保覆盖并更新修改时间）"""
+        from PIL import Image  # 按需导入：Pillow 只在导入与刷新头像时用到
+
+        out_path = self.avatar_path(uin)
+        tmp_path = self.root / f"{uin}.webp.tmp"
+        try:
+            with Image.open(BytesIO(data)) as img:
+                if img.mode in ("P", "RGBA", "LA"):
+                    img = img.convert("RGB")
+                img.save(tmp_path, format="WEBP", quality=80, method=6)
+            os.replace(tmp_path, out_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def delete(self, uin: int) -> bool:
+        existed = self.avatar_path(uin).exists()
+        self.avatar_path(uin).unlink(missing_ok=True)
+        self.meta_path(uin).unlink(missing_ok=True)
+        return existed
+
+    def prioritize(self, uins: List[int]) -> List[tuple[int, Optional[AvatarMeta]]]:
+        """去重并排序：缺失头像（或无元数据）优先，其余按最近检查时间从旧到新"""
+        entries = []
+        seen = set()
+        for uin in uins:
+            if not uin or uin in seen:
+                continue
+            seen.add(uin)
+            meta = self.load_meta(uin) if self.avatar_path(uin).exists() else None
+            entries.append((uin, meta))
+        entries.sort(key=lambda e: (e[1] is not None, (e[1].checked_at or 0.0) if e[1] else 0.0))
+        return entries
+
+
+class AvatarRefresher:
+    """按条件请求与内容摘要增量刷新头像"""
+
+    def __init__(
+        self,
+        store: AvatarStore,
+        client,
+        size: str = "640",
+        source_url: str = DEFAULT_AVATAR_SOURCE_URL,
+        concurrency: int = 8,
+    ) -> None:
+        self.store = store
+        self.client = client
+        self.size = size
+        self.source_url = source_url
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def refresh(self, uin: int, meta: Optional[AvatarMeta] = None, force: bool = False) -> str:
+        """刷新单个头像；meta 为已加载的元数据（头像文件存在时才有意义）"""
+        # 尺寸变化或强制刷新时不使用缓存验证器
+        usable = meta if (meta is not None and not force and meta.size == self.size) else None
+        headers = {}
+        if usable is not None:
+            if usable.etag:
+                headers["If-None-Match"] = usable.etag
+            if usable.last_modified:
+                headers["If-Modified-Since"] = usable.last_modified
+
+        async with self._semaphore:
+            try:
+                resp = await self.client.get(self.source_url.format(uin=uin, size=self.size), headers=headers)
+                now = time.time()
+                if resp.status_code == 304 and usable is not None:
+                    usable.checked_at = now
+                    await asyncio.to_thread(self.store.save_meta, usable)
+                    return NOT_MODIFIED
+                resp.raise_for_status()
+                if "image" not in (resp.headers.get("content-type") or "").lower():
+                    return FAILED
+
+                data = resp.content
+                digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                new_meta = AvatarMeta(
+                    uin=uin,
+                    etag=resp.headers.get("etag"),
+                    last_modified=resp.headers.get("last-modified"),
+                    source_hash=digest,
+                    size=self.size,
+                    checked_at=now,
+                    changed_at=usable.changed_at if usable is not None else None,
+                )
+                if usable is not None and usable.source_hash == digest:
+                    await asyncio.to_thread(self.store.save_meta, new_meta)
+                    return UNCHANGED
+
+                await asyncio.to_thread(self.store.write_webp, uin, data)
+                new_meta.changed_at = now
+                await asyncio.to_thread(self.store.save_meta, new_meta)
+                return UPDATED
+            except Exception as e:
+                logger.debug(f"refresh avatar {uin} failed: {e}")
+                return FAILED
+
+    async def refresh_many(self, uins: List[int], force: bool = False, limit: Optional[int] = None) -> Dict[str, Any]:
+        """按优先级刷新一批头像，返回统计；limit 之外的成员计入 skipped"""
+        started = time.perf_counter()
+        entries = await asyncio.to_thread(self.store.prioritize, uins)
+        selected = entries if limit is None else entries[:limit]
+        results = await asyncio.gather(*(self.refresh(uin, meta, force) for uin, meta in selected))
+
+        stats: Dict[str, Any] = {status: results.count(status) for status in (UPDATED, NOT_MODIFIED, UNCHANGED, FAILED)}
+        stats["success"] = len(results) - stats[FAILED]
+        stats["total"] = len(entries)
+        stats["skipped"] = len(entries) - len(selected)
+        stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return stats
+
 
 class AvatarService:
     """Avatar utility service"""
@@ -44,71 +218,46 @@ class AvatarService:
 
     @staticmethod
     async def fetch_and_save_avatar_webp(uin: int, size: str = "640", timeout_s: float = 20.0) -> bool:
-        """Download QQ avatar and save as WebP {avatar_root}/{uin}.webp"""
-        avatar_dir = AvatarService.ensure_avatar_directory()
-        url = f"https://q.qlogo.cn/g?b=qq&nk={uin}&s={size}"
-        try:
-            async with httpx.AsyncClient(timeout=timeout_s, headers={"User-Agent": "Apifox/1.0.0 (https://apifox.com)"}) as client:
-                resp = await client.get(url)
-                resp.raise_for_status()
-                content_type = (resp.headers.get("content-type") or "").lower()
-                if "image" not in content_type:
-                    return False
-                data = resp.content
-            # Convert to WebP using Pillow（使用临时文件并原子替换，确保覆盖并更新修改时间）
-            with Image.open(BytesIO(data)) as img:
-                if img.mode in ("P", "RGBA", "LA"):
-                    img = img.convert("RGB")
-                out_path = avatar_dir / f"{uin}.webp"
-                tmp_path = avatar_dir / f"{uin}.webp.tmp"
-                try:
-                    # 先写入临时文件
-                    img.save(tmp_path, format="WEBP", quality=80, method=6)
-                    # 原子替换为目标文件，保证覆盖
-                    os.replace(tmp_path, out_path)
-                    # 触碰修改时间，避免某些平台显示未更新
-                    try:
-                        os.utime(out_path, None)
-                    except Exception:
-                        pass
-                finally:
-                    # 清理可能残留的临时文件
-                    try:
-                        if tmp_path.exists():
-                            tmp_path.unlink(missing_ok=True)
-                    except Exception:
-                        pass
-            return True
-        except Exception:
-            return False
+        """Download QQ avatar and save as WebP {avatar_root}/{uin}.webp（源图未变化时不重新编码）"""
+        stats = await AvatarService.batch_fetch_and_save_avatars_webp([uin], size=size, timeout_s=timeout_s)
+        return stats["total"] > 0 and stats[FAILED] == 0
 
     @staticmethod
-    async def batch_fetch_and_save_avatars_webp(uins: List[int], size: str = "640") -> Dict[str, int]:
-        """Batch download and save avatars as WebP. Return stats."""
-        success = failed = 0
-        seen = set()
-        for u in uins:
-            if not u or u in seen:
-                continue
-            seen.add(u)
-            ok = await AvatarService.fetch_and_save_avatar_webp(u, size=size)
-            if ok:
-                success += 1
-            else:
-                failed += 1
-        return {"success": success, "failed": failed, "total": len(seen)}
+    async def batch_fetch_and_save_avatars_webp(
+        uins: List[int],
+        size: str = "640",
+        force: bool = False,
+        limit: Optional[int] = None,
+        timeout_s: Optional[float] = None,
+        transport=None,
+    ) -> Dict[str, Any]:
+        """Batch refresh avatars incrementally. Return stats.
+
+        force=True 忽略 ETag/摘要强制重新下载与编码；limit 限制本次刷新的成员数（按优先级选取）。
+        """
+        # httpx 只在导入与刷新头像时用到，按需导入以缩短应用启动时间
+        import httpx
+
+        settings = get_config_service().get_settings()
+        store = AvatarStore(AvatarService.ensure_avatar_directory())
+        concurrency = settings.avatar_refresh_concurrency
+        async with httpx.AsyncClient(
+            timeout=timeout_s or settings.avatar_refresh_timeout,
+            headers={"User-Agent": AVATAR_USER_AGENT},
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            transport=transport,
+        ) as client:
+            refresher = AvatarRefresher(
+                store, client, size=size, source_url=settings.avatar_source_url, concurrency=concurrency,
+            )
+            return await refresher.refresh_many(uins, force=force, limit=limit)
 
     @staticmethod
     def delete_avatar_file_by_uin(uin: int) -> bool:
-        """Delete {avatar_root}/{uin}.webp if exists"""
+        """Delete {avatar_root}/{uin}.webp (and its metadata) if exists"""
         settings = get_config_service().get_settings()
-        p = Path(settings.avatar_root) / f"{uin}.webp"
         try:
-            if p.exists():
-                p.unlink(missing_ok=True)
-                return True
-            return False
+            return AvatarStore(Path(settings.avatar_root)).delete(uin)
         except Exception:
             # Do not block main flow on delete failure
             return False
-
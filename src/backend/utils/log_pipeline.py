@@ -0,0 +1,201 @@
+"""
+Queue-based logging pipeline
+中文注释：请求路径上的日志调用只做格式化并放入内存队列（QueueHandler），
+由独立的写线程（QueueListener）负责控制台与文件输出，事件循环不再执行阻塞的磁盘写入。
+- 文件按大小滚动（RotatingFileHandler），error.log 只收 ERROR 及以上；
+- 队列有界，写线程跟不上时丢弃新记录并计数，而不是阻塞请求；
+- 热点模块（如头像、UIN 解密）可按前缀配置采样比例或每秒上限，WARNING 及以上永不丢弃。
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class _Rule:
+    __slots__ = ("prefix", "every", "rate", "tokens", "updated", "seen", "suppressed")
+
+    def __init__(self, prefix: str, sample: Optional[float], rate: Optional[float]) -> None:
+        self.prefix = prefix
+        # 采样比例转换为「每 N 条保留 1 条」，确定性且无需随机数
+        self.every = max(1, round(1 / sample)) if sample else 1
+        self.rate = rate
+        self.tokens = float(rate or 0)
+        self.updated = time.monotonic()
+        self.seen = 0
+        self.suppressed = 0
+
+
+class SamplingFilter(logging.Filter):
+    """按 logger 名称前缀对 WARNING 以下的记录做采样/限速
+
+    sampling: {"api.v1.avatars": 0.1} 表示保留约 10%
+    rate_limits: {"services.crypto": 20} 表示每秒最多 20 条（令牌桶，允许 1 秒突发）
+    同一前缀可同时配置，两者都通过才保留；多个前缀匹配时取最长者。
+    """
+
+    def __init__(
+        self,
+        sampling: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+    ) -> None:
+        super().__init__()
+        prefixes = set(sampling or {}) | set(rate_limits or {})
+        self._rules = sorted(
+            (_Rule(p, (sampling or {}).get(p), (rate_limits or {}).get(p)) for p in prefixes),
+            key=lambda r: len(r.prefix),
+            reverse=True,
+        )
+        self._by_name: Dict[str, Optional[_Rule]] = {}
+        self._lock = threading.Lock()
+
+    def _rule_for(self, name: str) -> Optional[_Rule]:
+        try:
+            return self._by_name[name]
+        except KeyError:
+            rule = next(
+                (r for r in self._rules if name == r.prefix or name.startswith(r.prefix + ".")),
+                None,
+            )
+            self._by_name[name] = rule
+            return rule
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self._rules:
+            return True
+        rule = self._rule_for(record.name)
+        if rule is None:
+            return True
+        with self._lock:
+            rule.seen += 1
+            keep = (rule.seen - 1) % rule.every == 0
+            if keep and rule.rate:
+                now = time.monotonic()
+                rule.tokens = min(rule.rate, rule.tokens + (now - rule.updated) * rule.rate)
+                rule.updated = now
+                if rule.tokens >= 1:
+                    rule.tokens -= 1
+                else:
+                    keep = False
+            if not keep:
+                rule.suppressed += 1
+        return keep
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {r.prefix: {"seen": r.seen, "suppressed": r.suppressed} for r in self._rules}
+
+
+class BoundedQueueHandler(QueueHandler):
+    """队列满时丢弃记录并计数，保证日志调用永不阻塞"""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
+_sampling_filter: Optional[SamplingFilter] = None
+
+
+def _build_handlers(
+    log_dir: Optional[Path], level: int, max_bytes: int, backup_count: int, console: bool
+) -> List[logging.Handler]:
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+    specs: List[Tuple[logging.Handler, int]] = []
+    if console:
+        specs.append((logging.StreamHandler(sys.stdout), level))
+    if log_dir is not None:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        specs.append((
+            RotatingFileHandler(log_dir / "app.log", maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"),
+            level,
+        ))
+        specs.append((
+            RotatingFileHandler(log_dir / "error.log", maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"),
+            logging.ERROR,
+        ))
+    handlers = []
+    for handler, handler_level in specs:
+        handler.setLevel(handler_level)
+        handler.setFormatter(formatter)
+        handlers.append(handler)
+    return handlers
+
+
+def setup_queue_logging(
+    log_dir: Optional[Path],
+    level: int,
+    *,
+    max_bytes: int = 20 * 1024 * 1024,
+    backup_count: int = 5,
+    queue_size: int = 10000,
+    sampling: Optional[Dict[str, float]] = None,
+    rate_limits: Optional[Dict[str, float]] = None,
+    console: bool = True,
+) -> QueueListener:
+    """替换根 logger 的处理器为 QueueHandler，并启动写线程；重复调用会先停止旧的写线程"""
+    global _listener, _queue_handler, _sampling_filter
+    stop_queue_logging()
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=max(0, queue_size))
+    _queue_handler = BoundedQueueHandler(log_queue)
+    _sampling_filter = SamplingFilter(sampling, rate_limits)
+    _queue_handler.addFilter(_sampling_filter)
+    root_logger.addHandler(_queue_handler)
+
+    handlers = _build_handlers(log_dir, level, max_bytes, backup_count, console)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_queue_logging() -> None:
+    """停止写线程（会先写完队列中剩余的记录）并关闭文件
+
+    先从根 logger 摘下 QueueHandler：之后的记录不再进入无人消费的队列，
+    而是由 logging 的 lastResort 输出到 stderr。进程退出时经 atexit 调用。
+    """
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def get_logging_stats() -> Dict[str, object]:
+    """队列积压、丢弃数与各采样规则的计数"""
+    return {
+        "queue_size": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "sampling": _sampling_filter.stats() if _sampling_filter else {},
+    }
+
+
+atexit.register(stop_queue_logging)
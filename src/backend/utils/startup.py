@@ -0,0 +1,92 @@
+"""
+Startup tracking
+中文注释：记录 lifespan 中各启动步骤的耗时，并跟踪后台预热任务（如加密密钥派生）。
+/health 只表示进程存活；/ready 在 lifespan 完成且所有预热任务结束后才返回 200，
+负载均衡/编排据此决定何时开始转发流量，避免首批请求承担冷启动开销。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTracker:
+    """启动步骤耗时与就绪状态"""
+
+    def __init__(self, started: Optional[float] = None) -> None:
+        # 传入进程开始导入 main 的时间，使 ready_after_ms 覆盖导入耗时
+        self.started = started if started is not None else time.perf_counter()
+        self.steps: Dict[str, float] = {}
+        self.pending: Set[str] = set()
+        self.errors: Dict[str, str] = {}
+        self.lifespan_done = False
+        self.ready_after_ms: Optional[float] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _elapsed_ms(self, since: float) -> float:
+        return round((time.perf_counter() - since) * 1000, 1)
+
+    @contextmanager
+    def step(self, name: str):
+        """同步或 async 函数中包裹一个启动步骤：with tracker.step("database"): await ..."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = self._elapsed_ms(started)
+
+    def background(self, name: str, awaitable: Awaitable[Any]) -> None:
+        """启动后台预热任务；完成前 /ready 返回 503"""
+        self.pending.add(name)
+        started = time.perf_counter()
+
+        async def _run() -> None:
+            try:
+                await awaitable
+            except Exception as e:
+                self.errors[name] = str(e)
+                logger.error(f"Startup task {name} failed: {e}")
+            else:
+                self.steps[name] = self._elapsed_ms(started)
+            finally:
+                self.pending.discard(name)
+                self._check_ready()
+
+        task = asyncio.create_task(_run())
+        # 保留引用，避免任务在完成前被回收
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def complete(self) -> None:
+        """lifespan 启动阶段结束"""
+        self.lifespan_done = True
+        self.steps["lifespan"] = self._elapsed_ms(self.started)
+        self._check_ready()
+
+    def _check_ready(self) -> None:
+        if self.ready and self.ready_after_ms is None:
+            self.ready_after_ms = self._elapsed_ms(self.started)
+            logger.info(f"Ready after {self.ready_after_ms}ms: {self.steps}")
+
+    @property
+    def ready(self) -> bool:
+        return self.lifespan_done and not self.pending and not self.errors
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else ("failed" if self.errors else "starting"),
+            "ready_after_ms": self.ready_after_ms,
+            "pending": sorted(self.pending),
+            "errors": dict(self.errors),
+            "steps_ms": dict(self.steps),
+        }
+
+    async def wait_background(self) -> None:
+        """关闭前等待仍在运行的预热任务（测试与关闭流程使用）"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,127 @@
+"""
+Precompressed static files for the production SPA mount
+中文注释：替代 StaticFiles 挂载前端构建产物：
+- 构建时生成的 .br / .gz 同名文件按 Accept-Encoding 直接返回，运行时不做任何压缩；
+- 带内容哈希的资源（Vite 输出的 assets/index-XXXXXXXX.js 等）返回一年期 immutable 缓存头，
+  index.html 等入口文件返回 no-cache，保证发版后立即生效；
+- 文件发送沿用 starlette FileResponse：服务器支持 http.response.pathsend 扩展时
+  （如 granian/hypercorn）由服务器以 sendfile 零拷贝发送，否则按块读取。
+压缩文件由 scripts/precompress_static.py 在部署时生成。
+"""
+from __future__ import annotations
+
+import os
+import re
+import stat
+from mimetypes import guess_type
+from typing import Dict, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from services.cache.response_cache import accepts_encoding
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Vite 文件名哈希：name-<8位以上 base64url>.ext（如 index-BXk3a9Zc.js）
+HASHED_NAME_RE = re.compile(r"[-.][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+# 值得压缩的文本类资源；图片/字体(woff2) 本身已压缩，不生成变体
+COMPRESSIBLE_SUFFIXES = (
+    ".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".xml", ".map", ".wasm", ".ttf", ".eot", ".ico",
+)
+
+# (编码名, 同名文件后缀)，按优先级排列
+ENCODINGS: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+
+
+def is_hashed_asset(path: str, immutable_prefixes: Sequence[str] = ("assets/",)) -> bool:
+    """是否为带内容哈希的不可变资源（仅限构建输出目录，避免误判普通的 my-component.js）"""
+    path = path.lstrip("/")
+    if not any(path.startswith(prefix) for prefix in immutable_prefixes):
+        return False
+    return HASHED_NAME_RE.search(os.path.basename(path)) is not None
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """优先返回预压缩变体、并按文件名设置缓存策略的 StaticFiles"""
+
+    def __init__(self, *args, immutable_prefixes: Sequence[str] = ("assets/",), **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.immutable_prefixes = tuple(immutable_prefixes)
+        # 原文件路径 -> (原文件 mtime, {编码: (变体路径, 变体 stat)})；重新部署后 mtime 变化自动失效
+        self._variants: Dict[str, Tuple[float, Dict[str, Tuple[str, os.stat_result]]]] = {}
+
+    def _find_variants(self, full_path: str, stat_result: os.stat_result) -> Dict[str, Tuple[str, os.stat_result]]:
+        cached = self._variants.get(full_path)
+        if cached is not None and cached[0] == stat_result.st_mtime:
+            return cached[1]
+        found: Dict[str, Tuple[str, os.stat_result]] = {}
+        if full_path.endswith(COMPRESSIBLE_SUFFIXES):
+            for coding, suffix in ENCODINGS:
+                try:
+                    variant_stat = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                # 变体比原文件旧说明是上次构建遗留，不能使用
+                if stat.S_ISREG(variant_stat.st_mode) and variant_stat.st_mtime >= stat_result.st_mtime:
+                    found[coding] = (full_path + suffix, variant_stat)
+        self._variants[full_path] = (stat_result.st_mtime, found)
+        return found
+
+    def _select_variant(
+        self, full_path: str, stat_result: os.stat_result, request_headers: Headers
+    ) -> Optional[Tuple[str, str, os.stat_result]]:
+        # Range 请求针对原始表示，直接返回未压缩文件
+        if "range" in request_headers:
+            return None
+        accept = request_headers.get("accept-encoding", "")
+        if not accept:
+            return None
+        variants = self._find_variants(full_path, stat_result)
+        for coding, _ in ENCODINGS:
+            if coding in variants and accepts_encoding(accept, coding):
+                path, variant_stat = variants[coding]
+                return coding, path, variant_stat
+        return None
+
+    def cache_control_for(self, path: str) -> str:
+        """path 为挂载点内的相对路径"""
+        if is_hashed_asset(path.replace(os.sep, "/"), self.immutable_prefixes):
+            return IMMUTABLE_CACHE_CONTROL
+        return REVALIDATE_CACHE_CONTROL
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        headers = {"Cache-Control": self.cache_control_for(self.get_path(scope))}
+        if full_path.endswith(COMPRESSIBLE_SUFFIXES):
+            headers["Vary"] = "Accept-Encoding"
+
+        selected = self._select_variant(full_path, stat_result, request_headers)
+        if selected is not None:
+            coding, variant_path, variant_stat = selected
+            headers["Content-Encoding"] = coding
+            # media_type 取自原文件名，否则 .br/.gz 会被识别为二进制
+            response = FileResponse(
+                variant_path,
+                status_code=status_code,
+                stat_result=variant_stat,
+                headers=headers,
+                media_type=guess_type(full_path)[0] or "text/plain",
+            )
+        else:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -1,20 +1,27 @@
 """
 Generic upload utilities for static pics
 中文注释：通用图片上传保存工具，保存到 ./static/pics/yyyy/mm 目录，并返回相对URL。
+
+保存流程（每个文件内存占用与文件大小无关）：
+  1. 读取首块数据，按魔数识别真实图片类型（jpg / png / gif / webp），不是图片则跳过；
+  2. 分块写入目标目录下的临时文件，同时计算 BLAKE2b 摘要并检查大小上限，超限立即中止；
+  3. 文件名取内容摘要（内容寻址）：任意月份目录下已有同名文件即视为重复上传，
+     删除临时文件并直接返回已有文件的 URL；否则原子重命名为正式文件。
 """
 from __future__ import annotations
 
-import imghdr
-import secrets
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import BinaryIO, List, Tuple, Optional
 
 from fastapi import UploadFile
-from io import BytesIO
-from PIL import Image
 
-# 允许的MIME前缀（粗略校验）；更严格可结合 Pillow
+# 允许的MIME前缀（粗略校验，最终以内容魔数为准）
 ALLOWED_IMAGE_MIME_PREFIXES = ("image/",)
 
 # 根静态目录与图片子目录（相对项目根 src/backend/static）
@@ -22,6 +29,27 @@ ALLOWED_IMAGE_MIME_PREFIXES = ("image/",)
 STATIC_ROOT = Path(__file__).resolve().parents[1] / "static"
 PICS_ROOT = STATIC_ROOT / "pics"
 
+# 单次读取/写入的块大小
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# 默认单文件大小上限（可由 settings.upload_max_image_bytes 覆盖）
+DEFAULT_MAX_IMAGE_BYTES = 10 * 1024 * 1024
+# 内容摘要长度（字节）：16 字节 -> 32 位十六进制文件名
+DIGEST_SIZE = 16
+# 写入中的临时文件前缀（清理任务据此识别中断的上传）
+TEMP_PREFIX = ".upload-"
+
+# 帖子中引用图片的 URL（新旧两种前缀，允许带域名或查询串），捕获 pics 下的相对路径 yyyy/mm/name
+PIC_URL_RE = re.compile(r"(?:/api/v1/daily/pics/|/static/pics/)(\d{4}/\d{2}/[A-Za-z0-9._-]+)")
+
+
+class UploadTooLarge(Exception):
+    """上传文件超过大小上限"""
+
+    def __init__(self, filename: str, max_bytes: int) -> None:
+        super().__init__(f"{filename or 'file'} exceeds {max_bytes} bytes")
+        self.filename = filename
+        self.max_bytes = max_bytes
+
 
 def ensure_pics_dir() -> Path:
     """确保 pics 根目录存在"""
@@ -29,65 +57,138 @@ def ensure_pics_dir() -> Path:
     return PICS_ROOT
 
 
-def _safe_ext_from_filename(name: str) -> str:
-    """根据原始文件名提取安全扩展名（默认 jpg）"""
-    ext = name.rsplit(".", 1)[-1].lower() if "." in name else "jpg"
-    if ext not in {"jpg", "jpeg", "png", "webp", "gif"}:
-        ext = "jpg"
-    return ext
-
-
 def _date_subdir(now: Optional[datetime] = None) -> Path:
     d = now or datetime.utcnow()
     return Path(str(d.year)) / f"{d.month:02d}"
 
 
-def _gen_filename(ext: str) -> str:
-    return f"{secrets.token_hex(8)}.{ext}"
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """按文件头魔数识别图片类型，返回扩展名；无法识别返回 None"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def find_existing_pic(name: str, preferred: Optional[Path] = None) -> Optional[Path]:
+    """在 pics/yyyy/mm 各月份目录中查找同名（同内容）文件，优先当前月份，其余按时间倒序"""
+    if preferred is not None and (preferred / name).is_file():
+        return preferred / name
+    if not PICS_ROOT.is_dir():
+        return None
+    for year_dir in sorted(PICS_ROOT.iterdir(), reverse=True):
+        if not (year_dir.is_dir() and year_dir.name.isdigit()):
+            continue
+        for month_dir in sorted(year_dir.iterdir(), reverse=True):
+            candidate = month_dir / name
+            if candidate.is_file():
+                return candidate
+    return None
 
 
-def _guess_image_type(data: bytes) -> Optional[str]:
-    """通过 imghdr 简单判断图片类型，返回扩展名（可能返回 None）"""
-    kind = imghdr.what(None, h=data)
-    if kind == "jpeg":
-        return "jpg"
-    return kind
+def _image_size(path: Path) -> Tuple[Optional[int], Optional[int]]:
+    """读取尺寸（Pillow 只解析文件头；失败则为 None）"""
+    try:
+        from PIL import Image  # 按需导入：Pillow 只在上传时用到
+
+        with Image.open(path) as img:
+            return img.size
+    except Exception:
+        return None, None
 
 
-async def save_upload_images(images: List[UploadFile]) -> List[Tuple[str, str, Optional[int], Optional[int]]]:
+def store_image_stream(
+    stream: BinaryIO,
+    filename: str,
+    target_dir: Path,
+    max_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+) -> Optional[Tuple[Path, bool]]:
+    """把图片流分块落盘到 target_dir（同步阻塞，需在线程中调用）
+
+    返回 (最终文件路径, 是否命中已有文件)；内容不是受支持的图片时返回 None；超过 max_bytes 抛出 UploadTooLarge。
+    """
+    head = stream.read(UPLOAD_CHUNK_SIZE)
+    ext = sniff_image_type(head)
+    if ext is None:
+        return None
+
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    size = 0
+    # 临时文件与目标位于同一目录（同一文件系统），保证 os.replace 原子
+    fd, tmp_name = tempfile.mkstemp(dir=target_dir, prefix=TEMP_PREFIX, suffix=".part")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(filename, max_bytes)
+                hasher.update(chunk)
+                out.write(chunk)
+                chunk = stream.read(UPLOAD_CHUNK_SIZE)
+
+        name = f"{hasher.hexdigest()}.{ext}"
+        existing = find_existing_pic(name, preferred=target_dir)
+        if existing is not None:
+            tmp_path.unlink(missing_ok=True)
+            # 刷新修改时间：孤儿图片清理按 mtime 计算宽限期，重新被引用的文件不应被回收
+            os.utime(existing)
+            return existing, True
+        final_path = target_dir / name
+        os.replace(tmp_path, final_path)
+        return final_path, False
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def pic_url(path: Path) -> str:
+    """由 pics 下的文件路径构建 URL：统一通过 API 字节流端点返回，避免生产环境静态挂载差异"""
+    return f"/api/v1/daily/pics/{path.relative_to(PICS_ROOT).as_posix()}"
+
+
+def pic_relpath_from_url(url: str) -> Optional[str]:
+    """从图片 URL 中提取 pics 下的相对路径（yyyy/mm/name）；不是本站图片返回 None"""
+    match = PIC_URL_RE.search(url) if isinstance(url, str) else None
+    return match.group(1) if match else None
+
+
+def _save_one(f: UploadFile, target_dir: Path, max_bytes: int) -> Optional[Tuple[str, str, Optional[int], Optional[int]]]:
+    stored = store_image_stream(f.file, f.filename or "", target_dir, max_bytes)
+    if stored is None:
+        return None
+    path, _ = stored
+    width, height = _image_size(path)
+    return path.name, pic_url(path), width, height
+
+
+async def save_upload_images(
+    images: List[UploadFile],
+    max_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+) -> List[Tuple[str, str, Optional[int], Optional[int]]]:
     """保存上传的图片文件到 /static/pics/yyyy/mm
-    返回 [(name, url, width, height)] 列表，其中 url 形如 "/static/pics/yyyy/mm/xxxx.jpg"。
+    返回 [(name, url, width, height)] 列表，其中 url 形如 "/api/v1/daily/pics/yyyy/mm/<blake2b>.jpg"。
+    非图片文件被跳过；任一文件超过 max_bytes 时抛出 UploadTooLarge。
     """
     ensure_pics_dir()
     results: List[Tuple[str, str, Optional[int], Optional[int]]] = []
-    subdir = _date_subdir()
-    target_dir = PICS_ROOT / subdir
+    target_dir = PICS_ROOT / _date_subdir()
     target_dir.mkdir(parents=True, exist_ok=True)
 
     for f in images:
         # 基础MIME检查（仅作为防御，最终以内容判断为准）
         ctype = (f.content_type or "").lower()
         if not any(ctype.startswith(p) for p in ALLOWED_IMAGE_MIME_PREFIXES):
-            # 跳过非图片
-            await f.read()  # 消费输入流避免资源泄露
             continue
-        data = await f.read()
-        # 读取尺寸（若失败则为 None）
-        width = height = None
-        try:
-            with Image.open(BytesIO(data)) as img:
-                width, height = img.size
-        except Exception:
-            pass
-        # 基于内容或文件名推断扩展名
-        ext = _guess_image_type(data) or _safe_ext_from_filename(f.filename or "")
-        name = _gen_filename(ext)
-        out_path = target_dir / name
-        # 写入磁盘
-        out_path.write_bytes(data)
-        # 构建 URL：统一通过 API 字节流端点返回，避免生产环境静态挂载差异
-        url = f"/api/v1/daily/pics/{subdir.as_posix()}/{name}"
-        results.append((name, url, width, height))
+        # 分块读写与摘要计算都是阻塞 I/O，放到线程中执行
+        saved = await asyncio.to_thread(_save_one, f, target_dir, max_bytes)
+        if saved is not None:
+            results.append(saved)
 
     return results
-
@@ -0,0 +1,52 @@
+"""
+X-Accel-Redirect file responses
+中文注释：开启 x_accel_redirect_enabled 后，处理器只负责解析/校验文件路径，
+返回一个空响应体 + X-Accel-Redirect 头，由 nginx 的 internal location 以 sendfile 发送字节；
+Content-Type、Cache-Control 等头由 nginx 保留并转发给客户端。
+未开启（如直连 uvicorn 的开发环境）时回退为普通 FileResponse。
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote
+
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, Response
+
+
+def _settings():
+    from services.deps import get_config_service
+    return get_config_service().get_settings()
+
+
+def x_accel_enabled() -> bool:
+    try:
+        return bool(_settings().x_accel_redirect_enabled)
+    except Exception:
+        return False
+
+
+def accel_path(file_path: Path, root: Path, location: str) -> str:
+    """文件在 root 下的相对路径映射到 internal location；越出 root 视为不存在"""
+    try:
+        relative = file_path.resolve().relative_to(root.resolve())
+    except ValueError:
+        raise HTTPException(status_code=404, detail="File not found")
+    return location.rstrip("/") + "/" + quote(relative.as_posix())
+
+
+def file_or_accel_response(
+    file_path: Path,
+    *,
+    root: Path,
+    location: Optional[str],
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """按配置返回 X-Accel-Redirect 响应或 FileResponse"""
+    headers = dict(headers or {})
+    if location and x_accel_enabled():
+        headers["X-Accel-Redirect"] = accel_path(file_path, root, location)
+        return Response(status_code=200, media_type=media_type, headers=headers)
+    return FileResponse(path=str(file_path), media_type=media_type, headers=headers)